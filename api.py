@@ -0,0 +1,276 @@
+"""Read-only JSON API for resist.py
+
+Serves member search, policy alignment scores, voting records and donor/vote
+correlations from the same analysis functions and caches as the Streamlit app,
+without going through script reruns. Responses are cached in memory per dataset
+version, carry an ETag for conditional requests and are gzip-compressed for
+clients that accept it. Connections are kept alive between requests.
+
+    python api.py [--host 127.0.0.1] [--port 8503]
+
+    GET /members?name=&state=&party=         member search
+    GET /members/<bioguide_id>/alignment     policy alignment scores
+    GET /members/<bioguide_id>/votes         voting record and pattern
+    GET /members/<bioguide_id>/correlation   donor interests matched to votes
+    GET /delegations?group=&area=            alignment and donations by state/party
+    GET /version                             dataset version
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+import warnings
+from collections import OrderedDict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qsl
+
+warnings.filterwarnings("ignore")
+from streamlit import config, logger
+config.set_option("logger.level", "error")  # Bare-mode cache warnings are expected outside Streamlit
+logger.set_log_level("error")
+
+import resist
+
+API_HOST = os.environ.get("API_HOST", "127.0.0.1")
+API_PORT = int(os.environ.get("API_PORT", "8503"))
+API_RESPONSE_TTL = 60  # Seconds a cached response is served before it is rebuilt
+API_CACHE_MAX_ENTRIES = 10000  # Responses kept, least recently used dropped first
+API_GZIP_MIN_BYTES = 1024  # Smaller bodies are sent uncompressed
+
+class APIError(Exception):
+    """A request that maps to an error response"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def json_default(value):
+    """Encode the NumPy scalars the analysis functions may return"""
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+def member_or_404(member_id):
+    member = resist.member_directory().get(member_id)
+    if member is None:
+        raise APIError(404, f"Member {member_id} not found")
+    return member
+
+def checked(result):
+    """An analysis result, or a 503 when its upstream data could not be fetched"""
+    if result.get("status") != "success":
+        raise APIError(503, result.get("message", "Upstream data unavailable"))
+    return result
+
+# Endpoints, each returning a JSON-serializable payload
+def search_members(dataset, params, member_id=None):
+    data = resist.fetch_candidate_data(params.get("name"), params.get("state"), params.get("party"))
+    return {"status": "success", "count": len(data["results"]), "results": data["results"]}
+
+def member_alignment(dataset, params, member_id):
+    member = member_or_404(member_id)
+    result = checked(resist.calculate_policy_alignment(member_id, dataset))
+    return {"status": "success", "member": member, **result}
+
+def member_votes(dataset, params, member_id):
+    member = member_or_404(member_id)
+    votes = checked(resist.fetch_member_votes(member_id))["votes"]
+    bill_index = dataset.bill_index
+    records = [
+        {
+            "bill_id": bill_id,
+            "title": dataset.bills[bill_index[bill_id]]["title"],
+            "vote_date": dataset.bills[bill_index[bill_id]].get("vote_date"),
+            "policy_alignment": dataset.bills[bill_index[bill_id]]["policy_alignment"],
+            "vote": vote
+        }
+        for bill_id, vote in votes.items() if bill_id in bill_index
+    ]
+    pattern = checked(resist.analyze_voting_pattern(member_id, dataset))
+    return {"status": "success", "member": member, "votes": records, "pattern": pattern}
+
+def member_correlation(dataset, params, member_id):
+    member = member_or_404(member_id)
+    if not member.get("fec_candidate_id"):
+        raise APIError(404, f"Member {member_id} has no FEC candidate")
+    result = checked(resist.match_contributions_to_votes(member["fec_candidate_id"], member_id, dataset))
+    return {"status": "success", "member": member, **result}
+
+def delegations(dataset, params, member_id=None):
+    grouping = params.get("group", "State")
+    area = params.get("area", "overall")
+    if grouping not in resist.DELEGATION_GROUPINGS:
+        raise APIError(400, f"group must be one of: {', '.join(resist.DELEGATION_GROUPINGS)}")
+    if area not in ["overall"] + resist.POLICY_AREA_KEYS:
+        raise APIError(400, f"Unknown policy area {area}")
+    aggregates = resist.get_delegation_aggregates(dataset.congress_number)
+    return {"status": "success", "group": grouping, "area": area, "results": aggregates.table(grouping, area),
+            "missing_donations": aggregates.missing}
+
+def dataset_info(dataset, params, member_id=None):
+    return {"status": "success", "congress_number": dataset.congress_number,
+            "version": dataset.version, "bills": len(dataset)}
+
+COLLECTION_ROUTES = {"/members": search_members, "/delegations": delegations, "/version": dataset_info}
+MEMBER_ROUTES = {"alignment": member_alignment, "votes": member_votes, "correlation": member_correlation}
+
+def resolve(path):
+    """Endpoint function and member id for a request path, or None"""
+    if path in COLLECTION_ROUTES:
+        return COLLECTION_ROUTES[path], None
+    parts = path.strip("/").split("/")
+    if len(parts) == 3 and parts[0] == "members" and parts[2] in MEMBER_ROUTES:
+        return MEMBER_ROUTES[parts[2]], parts[1]
+    return None
+
+def build_response(status, payload, version):
+    """Encode a payload once, with its compressed body and ETag"""
+    body = json.dumps(payload, default=json_default, separators=(",", ":")).encode("utf-8")
+    return {
+        "status": status,
+        "body": body,
+        "gzip": gzip.compress(body, compresslevel=6) if len(body) >= API_GZIP_MIN_BYTES else None,
+        "etag": f'"{version}-{hashlib.blake2b(body, digest_size=8).hexdigest()}"',
+        "expires": time.monotonic() + API_RESPONSE_TTL
+    }
+
+def etag_matches(if_none_match, etag):
+    """Whether an If-None-Match header value lists the ETag or is "*"
+
+    Uses the weak comparison RFC 9110 requires for If-None-Match, so W/"x" matches "x".
+    """
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or (candidate[2:] if candidate.startswith("W/") else candidate) == etag:
+            return True
+    return False
+
+def accepts_gzip(accept_encoding):
+    """Whether an Accept-Encoding header value allows gzip, honouring q-values (q=0 refuses)"""
+    qualities = {}
+    for item in accept_encoding.split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            qualities[coding.lower()] = quality
+    # An explicit gzip entry wins over the * wildcard
+    return qualities.get("gzip", qualities.get("x-gzip", qualities.get("*", 0.0))) > 0
+
+class ResponseCache:
+    """Encoded responses keyed by dataset version and request, built once per key"""
+
+    def __init__(self, max_entries=API_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.flight = resist.SingleFlight()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, build):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry["expires"] > time.monotonic():
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        def build_and_store():
+            entry = build()
+            if entry["status"] < 500:
+                with self.lock:
+                    self.entries[key] = entry
+                    self.entries.move_to_end(key)
+                    while len(self.entries) > self.max_entries:
+                        self.entries.popitem(last=False)
+            return entry
+
+        # Concurrent misses on the same key share one build
+        return self.flight.do(("api_response",) + key, build_and_store)
+
+class APIRequestHandler(BaseHTTPRequestHandler):
+    """Routes GET requests to the endpoints through the response cache"""
+    protocol_version = "HTTP/1.1"  # Keep-alive
+    disable_nagle_algorithm = True  # Headers and body go out in separate writes
+    server_version = "resist-api"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        route = resolve(url.path.rstrip("/") or "/")
+        if route is None:
+            self.send_entry(build_response(404, {"status": "error", "message": "Not found"}, ""))
+            return
+
+        dataset = resist.fetch_dataset()
+        params = dict(parse_qsl(url.query))
+        key = (dataset.version, url.path, tuple(sorted(params.items())))
+        entry = self.server.responses.get(key, lambda: self.run_endpoint(route, dataset, params))
+
+        if entry["etag"] and etag_matches(self.headers.get("If-None-Match", ""), entry["etag"]):
+            self.send_response(304)
+            self.send_header("ETag", entry["etag"])
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        else:
+            self.send_entry(entry)
+
+    def run_endpoint(self, route, dataset, params):
+        endpoint, member_id = route
+        try:
+            return build_response(200, endpoint(dataset, params, member_id), dataset.version)
+        except APIError as e:
+            return build_response(e.status, {"status": "error", "message": str(e)}, dataset.version)
+        except Exception as e:
+            return build_response(500, {"status": "error", "message": f"{type(e).__name__}: {e}"}, dataset.version)
+
+    def send_entry(self, entry):
+        compressed = entry["gzip"] is not None and accepts_gzip(self.headers.get("Accept-Encoding", ""))
+        body = entry["gzip"] if compressed else entry["body"]
+        self.send_response(entry["status"])
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-cache")  # Revalidate with If-None-Match
+        self.send_header("Vary", "Accept-Encoding")
+        if entry["etag"]:
+            self.send_header("ETag", entry["etag"])
+        if compressed:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def make_server(host=API_HOST, port=API_PORT):
+    """API server with its response cache; call serve_forever() to run it"""
+    server = ThreadingHTTPServer((host, port), APIRequestHandler)
+    server.daemon_threads = True
+    server.responses = ResponseCache()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT)
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port)
+    print(f"Serving on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Startup benchmark for resist.py
+
+Measures, in fresh interpreters, how long `import resist` takes and how long
+the first script run takes to render (time-to-first-render). Exits non-zero
+when the median of either exceeds its budget.
+
+    python bench_startup.py [--runs 5] [--import-budget 1.5] [--render-budget 4.0]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(APP_DIR, "resist.py")
+
+# Budgets in seconds for the median of each measurement
+IMPORT_TIME_BUDGET = 1.5
+FIRST_RENDER_BUDGET = 4.0
+
+IMPORT_PROBE = """
+import json, sys, time, warnings
+warnings.filterwarnings("ignore")
+start = time.perf_counter()
+import resist
+elapsed = time.perf_counter() - start
+# resist binds heavy modules to LazyModule stand-ins, unless a dependency (streamlit)
+# imported them first; a stand-in that has been loaded was touched during import
+heavy = {"np": "numpy", "pd": "pandas", "px": "plotly.express", "go": "plotly.graph_objects",
+         "genai": "google.generativeai"}
+modules = {name: getattr(resist, attr) for attr, name in heavy.items()}
+loaded = [name for name, module in modules.items()
+          if isinstance(module, resist.LazyModule) and "__loaded__" in vars(module)]
+preloaded = [name for name, module in modules.items() if not isinstance(module, resist.LazyModule)]
+print(json.dumps({"seconds": elapsed, "loaded": loaded, "preloaded": preloaded}))
+"""
+
+RENDER_PROBE = """
+import json, sys, time, warnings
+warnings.filterwarnings("ignore")
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file(sys.argv[1], default_timeout=60)
+app.run()
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "exceptions": [str(e.value) for e in app.exception]}))
+"""
+
+def run_probe(probe, *args):
+    """Run a probe in a fresh interpreter and return its JSON result"""
+    env = dict(os.environ, HEALTH_PORT="0")  # Keep the readiness server off during probes
+    result = subprocess.run(
+        [sys.executable, "-c", probe, *args],
+        cwd=APP_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def summarize(label, samples, budget):
+    """Print median and max for a measurement and report whether it fits the budget"""
+    median = statistics.median(samples)
+    within = median <= budget
+    print(f"{label:<22} median {median:6.3f}s  max {max(samples):6.3f}s  "
+          f"budget {budget:.3f}s  {'ok' if within else 'OVER BUDGET'}")
+    return within
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget", type=float, default=IMPORT_TIME_BUDGET)
+    parser.add_argument("--render-budget", type=float, default=FIRST_RENDER_BUDGET)
+    args = parser.parse_args()
+
+    import_times, render_times = [], []
+    eager, preloaded = set(), set()
+    errors = []
+    for _ in range(args.runs):
+        result = run_probe(IMPORT_PROBE)
+        import_times.append(result["seconds"])
+        eager.update(result["loaded"])
+        preloaded.update(result["preloaded"])
+
+        result = run_probe(RENDER_PROBE, APP_PATH)
+        render_times.append(result["seconds"])
+        errors.extend(result["exceptions"])
+
+    ok = summarize("import resist", import_times, args.import_budget)
+    ok = summarize("time-to-first-render", render_times, args.render_budget) and ok
+    if eager:
+        print(f"Loaded eagerly at import: {', '.join(sorted(eager))}")
+    if preloaded:
+        print(f"Already imported by dependencies: {', '.join(sorted(preloaded))}")
+    if errors:
+        print(f"First render raised: {errors[0]}")
+        ok = False
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""Load test for resist.py
+
+Drives concurrent headless sessions through Streamlit's AppTest against a local
+stub of the FEC API serving synthetic contributions. Each session searches,
+selects candidates and switches views. Reports throughput, p50/p95/p99 latency
+per interaction and resident memory per session.
+
+AppTest swaps process-global runtime state on every run, so script runs are
+serialized: sessions queue for the runner much as script threads queue for the
+GIL in one server process. Latency includes that queueing, service time does not.
+
+    python loadtest.py [--sessions 20] [--iterations 3] [--contributions 500] [--json]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+import warnings
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resist.py")
+
+# Synthetic contributor vocabulary, chosen to hit every donor interest keyword
+EMPLOYERS = [
+    "Gulf Petroleum", "First National Bank", "Capital Investments", "Defense Systems Inc",
+    "Regional Hospital", "State University", "Border Patrol Union", "Smith Law Group",
+    "Campaign Strategies LLC", "Acme Widgets", "Self-Employed", "Retired"
+]
+SURNAMES = ["SMITH", "JOHNSON", "WILLIAMS", "BROWN", "JONES", "GARCIA", "MILLER", "DAVIS"]
+ADDRESSES = [("TX", "75701"), ("TX", "77002-1234"), ("CA", "94612"), ("ME", "04401"), ("AZ", "85251"),
+             ("DC", "20001"), ("VA", "22201"), ("NY", "10010"), ("", "")]
+
+class StubFECHandler(BaseHTTPRequestHandler):
+    """Serves the FEC endpoints resist.py calls in live mode with synthetic data"""
+    protocol_version = "HTTP/1.1"
+    contributions_per_candidate = 500
+    page_size = 100
+    latency = 0.0
+
+    def log_message(self, format, *args):
+        pass  # Keep the report readable
+
+    def send_json(self, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-RateLimit-Remaining", "1000")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        if url.path.endswith("/committees/"):
+            candidate_id = url.path.split("/")[-3]
+            self.send_json({"results": [{"committee_id": f"C{candidate_id}"}]})
+        elif url.path.endswith("/schedules/schedule_a/"):
+            self.send_json(self.schedule_a_page(query))
+        else:
+            self.send_error(404)
+
+    def schedule_a_page(self, query):
+        """One keyset-paginated page of deterministic synthetic receipts"""
+        committee_id = query.get("committee_id", ["C"])[0]
+        offset = int(query.get("last_index", ["0"])[0])
+        count = max(0, min(self.page_size, self.contributions_per_candidate - offset))
+        rng = random.Random(f"{committee_id}:{offset}")
+        results = []
+        for i in range(count):
+            state, zip_code = rng.choice(ADDRESSES)
+            # A few memo entries and refunds, as in real filings
+            memo = rng.random() < 0.03
+            amount = round(rng.uniform(25, 3300), 2) * (-1 if rng.random() < 0.02 else 1)
+            results.append({
+                "contributor_name": f"{rng.choice(SURNAMES)}, DONOR {offset + i}",
+                "contributor_employer": rng.choice(EMPLOYERS),
+                "contribution_receipt_amount": amount,
+                "contribution_receipt_date": f"2023-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                "contributor_state": state,
+                "contributor_zip": zip_code,
+                "committee_id": committee_id,
+                "memo_code": "X" if memo else None,
+                "sub_id": f"{committee_id}{offset + i:012d}"
+            })
+        pagination = {}
+        if offset + count < self.contributions_per_candidate:
+            pagination["last_indexes"] = {"last_index": str(offset + count)}
+        return {"results": results, "pagination": pagination}
+
+def start_stub(contributions, latency):
+    """Start the stub FEC API on a free local port and return its server"""
+    StubFECHandler.contributions_per_candidate = contributions
+    StubFECHandler.latency = latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubFECHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+# Session interactions
+
+def interaction_load(app, rng):
+    app.run()
+
+def interaction_search(app, rng):
+    app.sidebar.radio(key="view_mode").set_value("Search").run()
+    app.sidebar.button[0].click().run()
+
+def interaction_select_candidate(app, rng):
+    boxes = [box for box in app.selectbox if box.label.startswith("Select a candidate")]
+    if boxes:
+        boxes[0].select(rng.choice(boxes[0].options)).run()
+
+def interaction_vote_filter(app, rng):
+    boxes = [box for box in app.selectbox if box.key == "vote_policy_filter"]
+    if boxes:
+        boxes[0].select(rng.choice(boxes[0].options)).run()
+
+def interaction_date_window(app, rng):
+    radios = [radio for radio in app.radio if radio.key == "date_window"]
+    if radios:
+        radios[0].set_value(rng.choice(["Full record", "Last 90 days"])).run()
+
+def interaction_leaderboard(app, rng):
+    app.sidebar.radio(key="view_mode").set_value("Leaderboard").run()
+
+def interaction_delegations(app, rng):
+    app.sidebar.radio(key="view_mode").set_value("Delegations").run()
+    app.selectbox(key="delegation_grouping").select(rng.choice(["State", "Party", "State and party"])).run()
+
+def interaction_compare(app, rng):
+    app.sidebar.radio(key="view_mode").set_value("Compare Members").run()
+    members = app.multiselect(key="comparison_members")
+    members.set_value(rng.sample(members.options, min(4, len(members.options)))).run()
+
+SESSION_SCRIPT = [
+    ("load", interaction_load),
+    ("search", interaction_search),
+    ("select_candidate", interaction_select_candidate),
+    ("vote_filter", interaction_vote_filter),
+    ("date_window", interaction_date_window),
+    ("leaderboard", interaction_leaderboard),
+    ("delegations", interaction_delegations),
+    ("compare", interaction_compare)
+]
+
+def resident_memory():
+    """Current resident set size of this process in bytes"""
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+class LoadTest:
+    """Runs sessions concurrently and collects per-interaction latencies"""
+
+    def __init__(self, sessions, iterations, timeout, seed=0):
+        self.sessions = sessions
+        self.iterations = iterations
+        self.timeout = timeout
+        self.seed = seed
+        self.latencies = defaultdict(list)
+        self.service_times = defaultdict(list)
+        self.errors = defaultdict(list)
+        self.apps = []
+        self.lock = threading.Lock()
+        self.run_lock = threading.Lock()
+
+    def run_session(self, index):
+        from streamlit.testing.v1 import AppTest
+
+        rng = random.Random(self.seed + index)
+        app = AppTest.from_file(APP_PATH, default_timeout=self.timeout)
+        with self.lock:
+            self.apps.append(app)  # Keep sessions alive until memory is measured
+        for _ in range(self.iterations):
+            for name, interaction in SESSION_SCRIPT:
+                queued = time.perf_counter()
+                with self.run_lock:
+                    start = time.perf_counter()
+                    try:
+                        interaction(app, rng)
+                        failures = [e.message for e in app.exception]
+                    except Exception as e:
+                        failures = [f"{type(e).__name__}: {e}"]
+                    finished = time.perf_counter()
+                with self.lock:
+                    self.latencies[name].append(finished - queued)
+                    self.service_times[name].append(finished - start)
+                    self.errors[name].extend(failures)
+
+    def run(self):
+        """Run all sessions and return the report"""
+        baseline = resident_memory()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.sessions) as pool:
+            list(pool.map(self.run_session, range(self.sessions)))
+        wall = time.perf_counter() - start
+        loaded = resident_memory()
+
+        interactions = {}
+        for name, _ in SESSION_SCRIPT:
+            samples = self.latencies[name]
+            if not samples:
+                continue
+            interactions[name] = {
+                "count": len(samples),
+                "errors": len(self.errors[name]),
+                "mean": statistics.fmean(samples),
+                "service_mean": statistics.fmean(self.service_times[name]),
+                "p50": percentile(samples, 50),
+                "p95": percentile(samples, 95),
+                "p99": percentile(samples, 99),
+                "max": max(samples)
+            }
+        total = sum(len(samples) for samples in self.latencies.values())
+        return {
+            "sessions": self.sessions,
+            "iterations": self.iterations,
+            "wall_seconds": wall,
+            "interactions_total": total,
+            "throughput_per_second": total / wall if wall else 0.0,
+            "rss_baseline_bytes": baseline,
+            "rss_loaded_bytes": loaded,
+            "rss_per_session_bytes": max(0, loaded - baseline) / self.sessions,
+            "interactions": interactions,
+            "first_errors": {name: errors[0] for name, errors in self.errors.items() if errors}
+        }
+
+def print_report(report):
+    """Human-readable summary of a load test report"""
+    print(f"{report['sessions']} sessions x {report['iterations']} iterations: "
+          f"{report['interactions_total']} interactions in {report['wall_seconds']:.2f}s "
+          f"({report['throughput_per_second']:.1f}/s)")
+    print(f"{'interaction':<18}{'count':>7}{'errors':>8}{'service':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+    for name, stats in report["interactions"].items():
+        print(f"{name:<18}{stats['count']:>7}{stats['errors']:>8}{stats['service_mean'] * 1000:>7.0f}ms"
+              f"{stats['p50'] * 1000:>7.0f}ms{stats['p95'] * 1000:>7.0f}ms"
+              f"{stats['p99'] * 1000:>7.0f}ms{stats['max'] * 1000:>7.0f}ms")
+    print(f"Resident memory: {report['rss_baseline_bytes'] / 2**20:.1f} MiB baseline, "
+          f"{report['rss_loaded_bytes'] / 2**20:.1f} MiB under load, "
+          f"{report['rss_per_session_bytes'] / 2**20:.2f} MiB per session")
+    for name, error in report["first_errors"].items():
+        print(f"First error in {name}: {error}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=20, help="Concurrent app sessions")
+    parser.add_argument("--iterations", type=int, default=3, help="Passes through the session script")
+    parser.add_argument("--contributions", type=int, default=500, help="Synthetic receipts per candidate")
+    parser.add_argument("--stub-latency", type=float, default=0.05, help="Seconds added to each stub response")
+    parser.add_argument("--timeout", type=float, default=120, help="Seconds allowed per script run")
+    parser.add_argument("--no-warmup", action="store_true", help="Include cold caches in the measurements")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    server = start_stub(args.contributions, args.stub_latency)
+    os.environ.update({
+        "DATA_SOURCE": "live",
+        "FEC_API_BASE": f"http://127.0.0.1:{server.server_port}",
+        "FEC_API_KEY": "LOADTEST",
+        "FEC_RATE_LIMIT": "3600000",  # The stub has no quota; measure the app, not the limiter
+        "FEC_MAX_PAGES": str(args.contributions // StubFECHandler.page_size + 1),
+        "HEALTH_PORT": "0",
+        "SNAPSHOT_PATH": ""
+    })
+    warnings.filterwarnings("ignore")
+    from streamlit import config, logger
+    config.set_option("logger.level", "error")  # Deprecation notices would drown out the report
+    logger.set_log_level("error")
+
+    if not args.no_warmup:
+        # One untimed session fills process-wide caches, as on a replica that has been serving
+        LoadTest(1, 1, args.timeout).run()
+
+    report = LoadTest(args.sessions, args.iterations, args.timeout).run()
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    sys.exit(1 if report["first_errors"] else 0)
+
+if __name__ == "__main__":
+    main()
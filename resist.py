@@ -1,16 +1,66 @@
 import streamlit as st
-import requests
-import pandas as pd
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+import importlib
 import json
 import os
-from datetime import datetime
-import google.generativeai as genai
-import plotly.express as px
-import plotly.graph_objects as go
+import hashlib
+import threading
+import bisect
+import warnings
+import asyncio
+import atexit
+import struct
+import sys
+import types
+import heapq
+import itertools
+import math
+import operator
+import contextvars
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from collections import OrderedDict, Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, date, timedelta
 import re
 from io import StringIO
 import time
-import numpy as np
+import zlib
+
+
+class LazyModule(types.ModuleType):
+    """Stand-in for a module that is imported on first attribute access
+
+    The import goes through importlib, whose per-module lock makes threads that touch
+    the module first at the same time wait for one import (importlib.util.LazyLoader
+    is not thread-safe). The module's attributes are then copied in, so later lookups
+    don't come back through __getattr__.
+    """
+
+    def __getattr__(self, attr):
+        module = importlib.import_module(self.__name__)
+        if "__loaded__" not in self.__dict__:
+            self.__dict__.update(module.__dict__)
+            self.__dict__["__loaded__"] = True
+        return getattr(module, attr)
+
+
+def lazy_import(name):
+    """Return a module whose import runs on first attribute access"""
+    if name in sys.modules:
+        return sys.modules[name]
+    return LazyModule(name)
+
+
+# Heavy dependencies are loaded on first use to keep cold start fast
+requests = lazy_import("requests")
+pd = lazy_import("pandas")
+np = lazy_import("numpy")
+px = lazy_import("plotly.express")
+rollcall = lazy_import("rollcall")
+go = lazy_import("plotly.graph_objects")
+genai = lazy_import("google.generativeai")
 
 # Set page configuration
 st.set_page_config(
@@ -20,27 +70,119 @@ st.set_page_config(
 )
 
 # API keys setup - in production, use Streamlit secrets
-if 'FEC_API_KEY' in st.secrets:
-    FEC_API_KEY = st.secrets["FEC_API_KEY"]
-else:
-    FEC_API_KEY = os.environ.get("FEC_API_KEY", "DEMO_KEY")  # Use DEMO_KEY for testing
-
-if 'CONGRESS_API_KEY' in st.secrets:
-    CONGRESS_API_KEY = st.secrets["CONGRESS_API_KEY"]
-else:
-    CONGRESS_API_KEY = os.environ.get("CONGRESS_API_KEY", "")  # You'll need to get this
-
-if 'GEMINI_API_KEY' in st.secrets:
-    GEMINI_API_KEY = st.secrets["GEMINI_API_KEY"]
-else:
-    GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY", "")  # You'll need to get this
-
-# Configure Gemini AI if key is available
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
+def get_secret(name, default=""):
+    """Read a key from Streamlit secrets, falling back to the environment"""
+    try:
+        if name in st.secrets:
+            return st.secrets[name]
+    except FileNotFoundError:
+        pass  # No secrets file, e.g. under a benchmark or load test
+    return os.environ.get(name, default)
+
+
+FEC_API_KEY = get_secret("FEC_API_KEY", "DEMO_KEY")  # Use DEMO_KEY for testing
+CONGRESS_API_KEY = get_secret("CONGRESS_API_KEY")  # You'll need to get this
+GEMINI_API_KEY = get_secret("GEMINI_API_KEY")  # You'll need to get this
+
+GEMINI_MODEL = os.environ.get("GEMINI_MODEL", "gemini-1.5-flash")
+NARRATIVE_TIMEOUT = 15  # Seconds without new narrative text before showing the template
+NARRATIVE_GENERATION_LIMIT = 120  # Seconds before an unfinished generation is abandoned
+
+# Upstream data source: "sample" uses the bundled demo data, "live" calls the APIs
+DATA_SOURCE = os.environ.get("DATA_SOURCE", "sample")
+FEC_API_BASE = os.environ.get("FEC_API_BASE", "https://api.open.fec.gov/v1")
+CONGRESS_API_BASE = os.environ.get("CONGRESS_API_BASE", "https://api.congress.gov/v3")
+FEC_CYCLE = int(os.environ.get("FEC_CYCLE", "2024"))
+FEC_MAX_PAGES = int(os.environ.get("FEC_MAX_PAGES", "20"))  # Schedule A pages of 100 contributions fetched per candidate
+REQUEST_TIMEOUT = 30  # Seconds per upstream HTTP request
+
+# Rate limits per API as (requests per hour, burst size); DEMO_KEY allows far fewer calls
+FEC_RATE_LIMIT = int(os.environ.get("FEC_RATE_LIMIT", 30 if FEC_API_KEY == "DEMO_KEY" else 1000))
+API_RATE_LIMITS = {
+    "fec": (FEC_RATE_LIMIT, 5),
+    "congress": (5000, 10)
+}
+RATE_LIMIT_COOLDOWN = 60  # Seconds to back off when an API reports no remaining quota
+
+# Request priorities, lower runs first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_PREFETCH = 1
+PRIORITY_BATCH = 2
+# Seconds a request may wait for a rate limit token before giving up (None waits as long as it takes),
+# so an interactive rerun shows stale data or an error instead of queueing behind a spent quota
+RATE_LIMIT_WAIT = {PRIORITY_INTERACTIVE: 10, PRIORITY_PREFETCH: 300, PRIORITY_BATCH: None}
 
 # Cache configuration
 CACHE_TTL = 3600  # Cache time-to-live in seconds (1 hour)
+CACHE_REFRESH_WORKERS = 4  # Background threads refreshing stale fetch results
+CIRCUIT_FAILURE_THRESHOLD = 5  # Consecutive upstream failures before the circuit opens
+CIRCUIT_RESET_TIMEOUT = 30  # Seconds an open circuit waits before letting a trial request through
+CACHE_MEMORY_BUDGET = int(os.environ.get("CACHE_MEMORY_BUDGET_MB", "512")) * 2**20  # Bytes of fetch results kept
+CACHE_PAYLOAD_COMPRESSION = os.environ.get("CACHE_PAYLOAD_COMPRESSION", "")  # "zlib" compresses cached contribution columns
+CACHE_EVICTION_SAMPLE = 8  # Least recently used entries compared by hit count on eviction
+SESSION_IDLE_TIMEOUT = 3600  # Seconds before an inactive session drops out of memory accounting
+
+# Offline snapshot bundle; when set, the fetch layer serves from it without API calls
+SNAPSHOT_PATH = os.environ.get("SNAPSHOT_PATH", "")
+
+# Per-Congress snapshot bundles (congress-<n>.snap plus manifest.json) for career-long queries
+SHARD_DIR = os.environ.get("SHARD_DIR", "")
+SHARD_MANIFEST = "manifest.json"
+SHARD_LOAD_WORKERS = 8  # Shards opened concurrently when a query spans several Congresses
+# Bills of other Congresses as congress-<n>.json files in the SAMPLE_BILLS shape; with
+# votes from ROLLCALL_DIR they are what export-shard builds an earlier Congress's shard from
+BILLS_DIR = os.environ.get("BILLS_DIR", "")
+
+# House Clerk / Senate roll-call XML files; when set, member votes are parsed from them
+ROLLCALL_DIR = os.environ.get("ROLLCALL_DIR", "")
+LEGISLATORS_PATH = os.environ.get("LEGISLATORS_PATH", "")  # congress-legislators JSON mapping Senate LIS ids
+ROLLCALL_PARSE_WORKERS = os.cpu_count() or 1
+
+# Startup cache warming and readiness reporting
+WARMUP_TOP_N = int(os.environ.get("WARMUP_TOP_N", "20"))
+WARMUP_STATS_PATH = os.environ.get("WARMUP_STATS_PATH", os.path.join(".cache", "popular_members.json"))
+WARMUP_FLUSH_INTERVAL = 60  # Seconds between writes of member view counts
+# Share of warmup targets that may fail before /readyz reports the instance as not ready
+WARMUP_MAX_FAILURE_RATIO = float(os.environ.get("WARMUP_MAX_FAILURE_RATIO", "0.5"))
+HEALTH_PORT = int(os.environ.get("HEALTH_PORT", "8502"))  # Serves /healthz and /readyz; 0 disables
+NARRATIVE_CACHE_DIR = os.environ.get("NARRATIVE_CACHE_DIR", os.path.join(".cache", "narratives"))
+FIGURE_CACHE_MAX_ENTRIES = 512  # Built charts kept across sessions
+FIGURE_CACHE_MAX_BYTES = 64 * 2**20  # Total size of those charts' trace and layout data
+
+# Switch scatter charts to WebGL traces above this many points
+WEBGL_POINT_THRESHOLD = 1000
+
+# Bootstrap settings for alignment uncertainty bands
+BOOTSTRAP_REPLICATES = 1000
+BOOTSTRAP_CONFIDENCE = 0.95
+
+# Per-member analyses kept in memory, keyed by dataset version
+ANALYSIS_CACHE_MAX_ENTRIES = 4096
+
+# Streaming donor sketches
+HLL_PRECISION = 11  # 2^11 registers per distinct-donor sketch, about 2.3% standard error
+KLL_K = 200  # Quantile sketch size; rank error shrinks roughly as 1/k
+OUTLIER_IQR_MULTIPLIER = 3  # Contributions above Q3 + 3 * IQR are flagged as unusually large
+
+# ZIP -> county/congressional district crosswalk, a CSV with columns zip, state, county_fips,
+# county_name, district and optionally ratio (share of the ZIP's addresses in that district)
+ZIP_LOOKUP_PATH = os.environ.get("ZIP_LOOKUP_PATH", "")
+
+# Full-text bill search
+BM25_K1 = 1.2  # Term frequency saturation
+BM25_B = 0.75  # Document length normalization
+BM25_TITLE_WEIGHT = 2  # Title terms count this many times a description term
+BILL_INDEX_DIR = os.environ.get("BILL_INDEX_DIR", os.path.join(".cache", "bill_index"))
+SEARCH_STOP_WORDS = {"a", "an", "and", "act", "as", "at", "by", "for", "from", "in", "is", "of",
+                     "on", "or", "the", "to", "with"}
+
+# Search results are scored in batches on worker threads and shown as each batch completes
+SEARCH_BATCH_SIZE = 20
+SEARCH_SCORE_WORKERS = 8
+
+# Comparison mode limits
+COMPARISON_MAX_MEMBERS = 50
+COMPARISON_FETCH_WORKERS = 16  # Threads for concurrent vote/contribution fetches
 
 # Define key policy areas
 POLICY_AREAS = {
@@ -110,6 +252,25 @@ POLICY_AREAS = {
     ]
 }
 
+# Fixed column order for policy areas in score arrays
+POLICY_AREA_KEYS = list(POLICY_AREAS.keys())
+
+# Keywords in a contributor's name or employer that signal a policy interest
+DONOR_INTEREST_KEYWORDS = {
+    "energy": ["oil", "gas", "coal", "energy", "petroleum"],
+    "economy": ["bank", "invest", "financ", "capital", "fund"],
+    "defense": ["defense", "military", "security", "weapon"],
+    "healthcare": ["health", "pharma", "medical", "hospital"],
+    "education": ["school", "education", "teacher", "university"],
+    "immigration": ["immigration", "border", "patrol"],
+    "judiciary": ["court", "judicial", "legal", "law", "attorney"],
+    "elections": ["election", "vote", "ballot", "campaign"]
+}
+DONOR_INTEREST_PATTERNS = {
+    area: re.compile("|".join(re.escape(word) for word in words))
+    for area, words in DONOR_INTEREST_KEYWORDS.items()
+}
+
 # Policy details with specific proposals
 POLICY_DETAILS = {
     "economy": {
@@ -235,9 +396,11 @@ POLICY_DETAILS = {
 }
 
 # Sample bill data for demonstration purposes
+SAMPLE_CONGRESS = 118  # Congress the sample bills and votes belong to
 SAMPLE_BILLS = [
     {
         "bill_id": "hr1",
+        "vote_date": "2023-02-15",
         "title": "For the People Act",
         "description": "Expands voting rights, changes campaign finance laws to reduce the influence of money in politics, limits partisan gerrymandering, and creates new ethics rules for federal officeholders.",
         "categories": ["elections"],
@@ -249,6 +412,7 @@ SAMPLE_BILLS = [
     },
     {
         "bill_id": "hr2",
+        "vote_date": "2023-03-30",
         "title": "American Energy Independence Act",
         "description": "Expands oil and gas drilling on federal lands, fast-tracks pipeline approvals, and reduces environmental regulations.",
         "categories": ["energy"],
@@ -260,6 +424,7 @@ SAMPLE_BILLS = [
     },
     {
         "bill_id": "hr3",
+        "vote_date": "2023-05-11",
         "title": "Border Security Enhancement Act",
         "description": "Provides funding for border wall construction, restricts asylum claims, and increases immigration enforcement.",
         "categories": ["immigration"],
@@ -271,6 +436,7 @@ SAMPLE_BILLS = [
     },
     {
         "bill_id": "hr4",
+        "vote_date": "2023-06-21",
         "title": "Affordable Care Act Enhancement",
         "description": "Expands ACA subsidies, adds new coverage requirements, and increases funding for Medicaid.",
         "categories": ["healthcare"],
@@ -282,6 +448,7 @@ SAMPLE_BILLS = [
     },
     {
         "bill_id": "hr5",
+        "vote_date": "2023-07-19",
         "title": "Educational Freedom and Choice Act",
         "description": "Creates a federal school voucher program, reduces Department of Education authority, and bans certain curriculum topics.",
         "categories": ["education"],
@@ -293,6 +460,7 @@ SAMPLE_BILLS = [
     },
     {
         "bill_id": "hr6",
+        "vote_date": "2023-09-14",
         "title": "Tax Cuts Extension Act",
         "description": "Makes the 2017 tax cuts permanent and adds new tax reductions for businesses.",
         "categories": ["economy"],
@@ -304,6 +472,7 @@ SAMPLE_BILLS = [
     },
     {
         "bill_id": "hr7",
+        "vote_date": "2023-07-14",
         "title": "National Defense Authorization Act",
         "description": "Increases military spending by 5%, expands Space Force, and adds new provisions for confronting China.",
         "categories": ["defense"],
@@ -315,6 +484,7 @@ SAMPLE_BILLS = [
     },
     {
         "bill_id": "hr8",
+        "vote_date": "2023-10-04",
         "title": "Judicial Reform Act",
         "description": "Limits federal agency rulemaking authority, expands religious liberty protections, and restricts court jurisdiction on certain issues.",
         "categories": ["judiciary"],
@@ -326,6 +496,7 @@ SAMPLE_BILLS = [
     },
     {
         "bill_id": "hr9",
+        "vote_date": "2023-11-08",
         "title": "Climate Action Now Act",
         "description": "Requires the U.S. to remain in the Paris Agreement and develop a plan to meet emissions targets.",
         "categories": ["energy"],
@@ -337,6 +508,7 @@ SAMPLE_BILLS = [
     },
     {
         "bill_id": "hr10",
+        "vote_date": "2023-12-06",
         "title": "Secure Elections Act",
         "description": "Requires voter ID, restricts mail-in voting, and gives state legislatures more control over elections.",
         "categories": ["elections"],
@@ -439,61 +611,678 @@ SAMPLE_MEMBERS = {
 # Sample contribution data for demonstration
 SAMPLE_CONTRIBUTIONS = {
     "H0TX01123": [
-        {"contributor_name": "Oil Industry PAC", "contribution_receipt_amount": 50000, "contribution_receipt_date": "2023-05-15", "contributor_employer": "Big Oil Corp"},
-        {"contributor_name": "Defense Contractors Association", "contribution_receipt_amount": 35000, "contribution_receipt_date": "2023-06-22", "contributor_employer": "Defense Inc"},
-        {"contributor_name": "Conservative Values PAC", "contribution_receipt_amount": 25000, "contribution_receipt_date": "2023-07-10", "contributor_employer": "Conservative Alliance"},
-        {"contributor_name": "National Rifle Association", "contribution_receipt_amount": 20000, "contribution_receipt_date": "2023-08-05", "contributor_employer": "NRA"},
-        {"contributor_name": "Small Business Coalition", "contribution_receipt_amount": 15000, "contribution_receipt_date": "2023-09-12", "contributor_employer": "Various Small Businesses"}
+        {"contributor_name": "Oil Industry PAC", "contribution_receipt_amount": 50000, "contribution_receipt_date": "2023-05-15", "contributor_employer": "Big Oil Corp", "contributor_state": "TX", "contributor_zip": "77002"},
+        {"contributor_name": "Defense Contractors Association", "contribution_receipt_amount": 35000, "contribution_receipt_date": "2023-06-22", "contributor_employer": "Defense Inc", "contributor_state": "VA", "contributor_zip": "22201"},
+        {"contributor_name": "Conservative Values PAC", "contribution_receipt_amount": 25000, "contribution_receipt_date": "2023-07-10", "contributor_employer": "Conservative Alliance", "contributor_state": "TX", "contributor_zip": "75701"},
+        {"contributor_name": "National Rifle Association", "contribution_receipt_amount": 20000, "contribution_receipt_date": "2023-08-05", "contributor_employer": "NRA", "contributor_state": "VA", "contributor_zip": "22030"},
+        {"contributor_name": "Small Business Coalition", "contribution_receipt_amount": 15000, "contribution_receipt_date": "2023-09-12", "contributor_employer": "Various Small Businesses", "contributor_state": "TX", "contributor_zip": "75601"}
     ],
     "H0CA12456": [
-        {"contributor_name": "Progressive Action Fund", "contribution_receipt_amount": 45000, "contribution_receipt_date": "2023-05-20", "contributor_employer": "Progressive Alliance"},
-        {"contributor_name": "Teachers Union PAC", "contribution_receipt_amount": 30000, "contribution_receipt_date": "2023-06-15", "contributor_employer": "National Education Association"},
-        {"contributor_name": "Environmental Defense Fund", "contribution_receipt_amount": 25000, "contribution_receipt_date": "2023-07-22", "contributor_employer": "Environmental Defense"},
-        {"contributor_name": "Healthcare Workers Union", "contribution_receipt_amount": 20000, "contribution_receipt_date": "2023-08-10", "contributor_employer": "Healthcare United"},
-        {"contributor_name": "Tech Industry Coalition", "contribution_receipt_amount": 15000, "contribution_receipt_date": "2023-09-05", "contributor_employer": "Various Tech Companies"}
+        {"contributor_name": "Progressive Action Fund", "contribution_receipt_amount": 45000, "contribution_receipt_date": "2023-05-20", "contributor_employer": "Progressive Alliance", "contributor_state": "DC", "contributor_zip": "20001"},
+        {"contributor_name": "Teachers Union PAC", "contribution_receipt_amount": 30000, "contribution_receipt_date": "2023-06-15", "contributor_employer": "National Education Association", "contributor_state": "DC", "contributor_zip": "20036"},
+        {"contributor_name": "Environmental Defense Fund", "contribution_receipt_amount": 25000, "contribution_receipt_date": "2023-07-22", "contributor_employer": "Environmental Defense", "contributor_state": "NY", "contributor_zip": "10010"},
+        {"contributor_name": "Healthcare Workers Union", "contribution_receipt_amount": 20000, "contribution_receipt_date": "2023-08-10", "contributor_employer": "Healthcare United", "contributor_state": "CA", "contributor_zip": "94612"},
+        {"contributor_name": "Tech Industry Coalition", "contribution_receipt_amount": 15000, "contribution_receipt_date": "2023-09-05", "contributor_employer": "Various Tech Companies", "contributor_state": "CA", "contributor_zip": "94105"}
     ],
     "H0ME02789": [
-        {"contributor_name": "Moderate Republican PAC", "contribution_receipt_amount": 40000, "contribution_receipt_date": "2023-05-10", "contributor_employer": "Bipartisan Solutions"},
-        {"contributor_name": "Healthcare Industry Group", "contribution_receipt_amount": 30000, "contribution_receipt_date": "2023-06-20", "contributor_employer": "Various Healthcare Companies"},
-        {"contributor_name": "Energy Innovation Fund", "contribution_receipt_amount": 25000, "contribution_receipt_date": "2023-07-15", "contributor_employer": "Clean Energy Corp"},
-        {"contributor_name": "Business Roundtable", "contribution_receipt_amount": 20000, "contribution_receipt_date": "2023-08-22", "contributor_employer": "Various Corporations"},
-        {"contributor_name": "National Security Alliance", "contribution_receipt_amount": 15000, "contribution_receipt_date": "2023-09-10", "contributor_employer": "Defense Contractors"}
+        {"contributor_name": "Moderate Republican PAC", "contribution_receipt_amount": 40000, "contribution_receipt_date": "2023-05-10", "contributor_employer": "Bipartisan Solutions", "contributor_state": "DC", "contributor_zip": "20003"},
+        {"contributor_name": "Healthcare Industry Group", "contribution_receipt_amount": 30000, "contribution_receipt_date": "2023-06-20", "contributor_employer": "Various Healthcare Companies", "contributor_state": "ME", "contributor_zip": "04101"},
+        {"contributor_name": "Energy Innovation Fund", "contribution_receipt_amount": 25000, "contribution_receipt_date": "2023-07-15", "contributor_employer": "Clean Energy Corp", "contributor_state": "MA", "contributor_zip": "02110"},
+        {"contributor_name": "Business Roundtable", "contribution_receipt_amount": 20000, "contribution_receipt_date": "2023-08-22", "contributor_employer": "Various Corporations", "contributor_state": "DC", "contributor_zip": "20004"},
+        {"contributor_name": "National Security Alliance", "contribution_receipt_amount": 15000, "contribution_receipt_date": "2023-09-10", "contributor_employer": "Defense Contractors", "contributor_state": "ME", "contributor_zip": "04401"}
     ],
     "H0AZ01012": [
-        {"contributor_name": "Moderate Democrats Coalition", "contribution_receipt_amount": 35000, "contribution_receipt_date": "2023-05-25", "contributor_employer": "Centrist Alliance"},
-        {"contributor_name": "Rural Development Fund", "contribution_receipt_amount": 30000, "contribution_receipt_date": "2023-06-10", "contributor_employer": "Rural America Initiative"},
-        {"contributor_name": "Border Security PAC", "contribution_receipt_amount": 25000, "contribution_receipt_date": "2023-07-20", "contributor_employer": "Border Solutions Group"},
-        {"contributor_name": "Energy Workers Union", "contribution_receipt_amount": 20000, "contribution_receipt_date": "2023-08-15", "contributor_employer": "Energy Workers United"},
-        {"contributor_name": "Small Business Association", "contribution_receipt_amount": 15000, "contribution_receipt_date": "2023-09-22", "contributor_employer": "Small Business Alliance"}
+        {"contributor_name": "Moderate Democrats Coalition", "contribution_receipt_amount": 35000, "contribution_receipt_date": "2023-05-25", "contributor_employer": "Centrist Alliance", "contributor_state": "AZ", "contributor_zip": "85251"},
+        {"contributor_name": "Rural Development Fund", "contribution_receipt_amount": 30000, "contribution_receipt_date": "2023-06-10", "contributor_employer": "Rural America Initiative", "contributor_state": "AZ", "contributor_zip": "86001"},
+        {"contributor_name": "Border Security PAC", "contribution_receipt_amount": 25000, "contribution_receipt_date": "2023-07-20", "contributor_employer": "Border Solutions Group", "contributor_state": "AZ", "contributor_zip": "85701"},
+        {"contributor_name": "Energy Workers Union", "contribution_receipt_amount": 20000, "contribution_receipt_date": "2023-08-15", "contributor_employer": "Energy Workers United", "contributor_state": "CO", "contributor_zip": "80202"},
+        {"contributor_name": "Small Business Association", "contribution_receipt_amount": 15000, "contribution_receipt_date": "2023-09-22", "contributor_employer": "Small Business Alliance", "contributor_state": "DC", "contributor_zip": "20005"}
     ]
 }
 
+# Sample ZIP crosswalk rows for demonstration: (zip, state, county FIPS, county name, district)
+# District 0 is an at-large seat or non-voting delegate
+SAMPLE_ZIP_LOOKUP = [
+    ("02110", "MA", "25025", "Suffolk County", 8),
+    ("04101", "ME", "23005", "Cumberland County", 1),
+    ("04401", "ME", "23019", "Penobscot County", 2),
+    ("10010", "NY", "36061", "New York County", 12),
+    ("20001", "DC", "11001", "District of Columbia", 0),
+    ("20003", "DC", "11001", "District of Columbia", 0),
+    ("20004", "DC", "11001", "District of Columbia", 0),
+    ("20005", "DC", "11001", "District of Columbia", 0),
+    ("20036", "DC", "11001", "District of Columbia", 0),
+    ("22030", "VA", "51059", "Fairfax County", 11),
+    ("22201", "VA", "51013", "Arlington County", 8),
+    ("75601", "TX", "48183", "Gregg County", 1),
+    ("75701", "TX", "48423", "Smith County", 1),
+    ("77002", "TX", "48201", "Harris County", 18),
+    ("80202", "CO", "08031", "Denver County", 1),
+    ("85251", "AZ", "04013", "Maricopa County", 1),
+    ("85701", "AZ", "04019", "Pima County", 7),
+    ("86001", "AZ", "04005", "Coconino County", 2),
+    ("94105", "CA", "06075", "San Francisco County", 11),
+    ("94612", "CA", "06001", "Alameda County", 12)
+]
+
+# Request coalescing
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one execution whose result they share"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.stats = {}
+
+    def do(self, key, fn):
+        """Run fn for key, or wait for the identical call already in flight"""
+        with self._lock:
+            stats = self.stats.setdefault(key[0], {"calls": 0, "executions": 0, "coalesced": 0})
+            stats["calls"] += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = {"done": threading.Event(), "result": None, "error": None}
+                self._calls[key] = call
+                stats["executions"] += 1
+            else:
+                stats["coalesced"] += 1
+
+        if leader:
+            try:
+                call["result"] = fn()
+            except Exception as e:
+                call["error"] = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call["done"].set()
+        else:
+            call["done"].wait()
+
+        if call["error"] is not None:
+            raise call["error"]
+        return call["result"]
+
+    def snapshot(self):
+        """Copy of the per-function call counters"""
+        with self._lock:
+            return {name: dict(stats) for name, stats in self.stats.items()}
+
+@st.cache_resource
+def get_single_flight():
+    """Process-wide single-flight group shared by every session"""
+    return SingleFlight()
+
+# Upstream request scheduling
+class RateLimitTimeout(Exception):
+    """Raised when a request could not get a rate limit token in time"""
+
+class TokenBucket:
+    """Token bucket refilled continuously at `rate` tokens per second"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now):
+        """Seconds until a token is available"""
+        self._refill(now)
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def consume(self, now):
+        self._refill(now)
+        self.tokens -= 1
+
+    def block(self, seconds, now):
+        """Stop handing out tokens for a while, e.g. after a 429"""
+        self.blocked_until = max(self.blocked_until, now + seconds)
+        self.tokens = 0.0
+
+class RequestScheduler:
+    """Shared per-API token buckets that serve waiting requests in priority order"""
+
+    def __init__(self, limits=None, session=None):
+        limits = limits or API_RATE_LIMITS
+        self.buckets = {api: TokenBucket(per_hour / 3600.0, burst) for api, (per_hour, burst) in limits.items()}
+        self.session = session or requests.Session()
+        self._condition = threading.Condition()
+        self._queues = {api: [] for api in limits}
+        self._sequence = itertools.count()
+        self.stats = {api: {"requests": 0, "throttled": 0, "retried": 0} for api in limits}
+
+    def acquire(self, api, priority=PRIORITY_INTERACTIVE, timeout=None):
+        """Block until this request may be sent; higher priority requests go first"""
+        ticket = (priority, next(self._sequence))
+        deadline = None if timeout is None else time.monotonic() + timeout
+        bucket = self.buckets[api]
+        queue = self._queues[api]
+
+        with self._condition:
+            heapq.heappush(queue, ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait = bucket.wait_time(now) if queue[0] == ticket else None
+                    if wait == 0:
+                        bucket.consume(now)
+                        heapq.heappop(queue)
+                        return
+                    if deadline is not None and now >= deadline:
+                        queue.remove(ticket)
+                        heapq.heapify(queue)
+                        raise RateLimitTimeout(f"No {api} rate limit token within {timeout:.1f}s")
+                    if deadline is not None:
+                        wait = deadline - now if wait is None else min(wait, deadline - now)
+                    self._condition.wait(timeout=wait)
+            finally:
+                self._condition.notify_all()
+
+    def observe(self, api, response):
+        """Adapt the bucket to rate limit headers reported by the API"""
+        now = time.monotonic()
+        bucket = self.buckets[api]
+        headers = response.headers
+
+        with self._condition:
+            limit = headers.get("X-RateLimit-Limit")
+            if limit and limit.isdigit() and int(limit) > 0:
+                bucket.rate = int(limit) / 3600.0
+
+            remaining = headers.get("X-RateLimit-Remaining")
+            if remaining and remaining.isdigit():
+                bucket.tokens = min(bucket.tokens, float(remaining))
+                if int(remaining) == 0:
+                    bucket.block(RATE_LIMIT_COOLDOWN, now)
+
+            if response.status_code in (429, 503):
+                self.stats[api]["throttled"] += 1
+                bucket.block(parse_retry_after(headers.get("Retry-After")), now)
+            self._condition.notify_all()
+
+    def request(self, api, url, params=None, priority=None, max_retries=3):
+        """Send a GET through the rate limiter, retrying after 429/503 responses
+
+        Raises RateLimitTimeout when no token is available within the priority's
+        RATE_LIMIT_WAIT, counting retries.
+        """
+        if priority is None:
+            priority = request_priority_var.get()
+        wait = RATE_LIMIT_WAIT.get(priority)
+        deadline = None if wait is None else time.monotonic() + wait
+
+        for attempt in range(max_retries + 1):
+            self.acquire(api, priority, None if deadline is None else max(0.0, deadline - time.monotonic()))
+            response = self.session.get(url, params=params, timeout=REQUEST_TIMEOUT)
+            with self._condition:
+                self.stats[api]["requests"] += 1
+            self.observe(api, response)
+            if response.status_code not in (429, 503) or attempt == max_retries:
+                return response
+            with self._condition:
+                self.stats[api]["retried"] += 1
+        return response
+
+    def snapshot(self):
+        """Request counters and current queue depth per API"""
+        with self._condition:
+            return {
+                api: dict(stats, waiting=len(self._queues[api]), tokens=round(self.buckets[api].tokens, 2))
+                for api, stats in self.stats.items()
+            }
+
+def parse_retry_after(value, default=RATE_LIMIT_COOLDOWN):
+    """Seconds to wait from a Retry-After header (delta seconds or HTTP date)"""
+    if not value:
+        return default
+    if value.strip().isdigit():
+        return int(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    return max(0.0, (retry_at - datetime.now(retry_at.tzinfo)).total_seconds())
+
+# Priority of upstream requests made from the current context
+request_priority_var = contextvars.ContextVar("request_priority", default=PRIORITY_INTERACTIVE)
+
+@contextmanager
+def request_priority(priority):
+    """Run fetches in this block at the given priority, e.g. PRIORITY_PREFETCH for background jobs"""
+    token = request_priority_var.set(priority)
+    try:
+        yield
+    finally:
+        request_priority_var.reset(token)
+
+@st.cache_resource
+def get_request_scheduler():
+    """Process-wide request scheduler shared by every session and background job"""
+    return RequestScheduler()
+
+def api_get(api, path, params=None):
+    """GET a JSON resource from the FEC or Congress.gov API through the request scheduler"""
+    if api == "fec":
+        url, params = FEC_API_BASE + path, dict(params or {}, api_key=FEC_API_KEY)
+    else:
+        url, params = CONGRESS_API_BASE + path, dict(params or {}, api_key=CONGRESS_API_KEY, format="json")
+
+    response = get_request_scheduler().request(api, url, params)
+    response.raise_for_status()
+    return response.json()
+
+# Stale-while-revalidate fetch cache
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream API whose circuit is open"""
+
+class CircuitBreaker:
+    """Stops calling an upstream API after repeated failures, then probes it with one trial call"""
+
+    def __init__(self, failure_threshold=CIRCUIT_FAILURE_THRESHOLD, reset_timeout=CIRCUIT_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Whether a call may go upstream now"""
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+                # Let a single trial call through
+                self.state = "half-open"
+                return True
+            return self.state == "closed"
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half-open" or self.failures >= self.failure_threshold:
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+    def call(self, fn):
+        if not self.allow():
+            raise CircuitOpenError("Upstream temporarily unavailable")
+        try:
+            result = fn()
+        except RateLimitTimeout:
+            # The call never reached the upstream: not a failure, and a trial slot is handed back
+            with self._lock:
+                if self.state == "half-open":
+                    self.state = "open"
+            raise
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+def estimate_size(obj, seen=None):
+    """Approximate bytes held by obj, following containers and counting shared objects once"""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    if hasattr(obj, "memory_usage") and hasattr(obj, "columns"):
+        # DataFrame
+        return int(obj.memory_usage(deep=True).sum())
+    if hasattr(obj, "nbytes") and hasattr(obj, "flags"):
+        # numpy array; views and memory-mapped arrays don't own their buffer
+        return sys.getsizeof(obj) + (obj.nbytes if obj.flags.owndata else 0)
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(estimate_size(k, seen) + estimate_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, seen) for item in obj)
+    elif type(obj).__sizeof__ is object.__sizeof__ and not isinstance(obj, (type, types.ModuleType, types.FunctionType)):
+        # Plain objects (sketches, dataset handles and their memos) hold their data in
+        # attributes; types that define __sizeof__ already account for their buffers
+        if hasattr(obj, "__dict__"):
+            size += estimate_size(vars(obj), seen)
+        for name in getattr(type(obj), "__slots__", ()):
+            if hasattr(obj, name):
+                size += estimate_size(getattr(obj, name), seen)
+    return size
+
+def fetch_version(value):
+    """Fingerprint of a fetch result's content, the same whenever a refetch returns the same data
+
+    Columnar payloads and arrays are hashed as bytes; other objects (datasets, sketches)
+    contribute their version or type, since they are derived from data hashed alongside.
+    """
+    def encode(obj):
+        if isinstance(obj, ContributionColumns):
+            return hashlib.blake2b(obj.payload, digest_size=8).hexdigest()
+        if isinstance(obj, np.ndarray):
+            return hashlib.blake2b(np.ascontiguousarray(obj).tobytes(), digest_size=8).hexdigest()
+        if isinstance(obj, np.generic):
+            return obj.item()
+        return getattr(obj, "version", type(obj).__name__)
+
+    payload = json.dumps(value, default=encode)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=8).hexdigest()
+
+class FetchCache:
+    """Cache of upstream fetch results that serves stale entries while refreshing them in the background
+
+    Entries are sized when stored and evicted once the total exceeds the memory budget.
+    Cached values are shared between sessions and must not be mutated by callers.
+    """
+
+    def __init__(self, ttl=CACHE_TTL, refresh_workers=CACHE_REFRESH_WORKERS, memory_budget=CACHE_MEMORY_BUDGET):
+        self.ttl = ttl
+        self.memory_budget = memory_budget
+        self.bytes = 0
+        self.entries = OrderedDict()  # Least recently used first
+        self.breakers = {"fec": CircuitBreaker(), "congress": CircuitBreaker()}
+        self.stats = {"fresh": 0, "stale": 0, "miss": 0, "refreshes": 0, "refresh_failures": 0, "unavailable": 0,
+                      "rate_limited": 0, "evictions": 0, "oversize": 0}
+        self.single_flight = get_single_flight()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._refresh_pool = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix="cache-refresh")
+
+    def _load(self, api, key, loader):
+        """Load through the API's circuit breaker, coalescing concurrent loads of the same key"""
+        def load():
+            value = self.breakers[api].call(loader)
+            value = dict(value, version=fetch_version(value))
+            self._store(key, value)
+            return value
+
+        return self.single_flight.do(key, load)
+
+    def _store(self, key, value):
+        size = estimate_size(value)
+        with self._lock:
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= previous["size"]
+            if size > self.memory_budget:
+                # Serve it this once rather than flushing the whole cache for it
+                self.stats["oversize"] += 1
+                return
+            self.entries[key] = {
+                "value": value,
+                "fetched_at": time.time(),
+                "size": size,
+                "hits": previous["hits"] if previous is not None else 0
+            }
+            self.bytes += size
+            self._evict(keep=key)
+
+    def _evict(self, keep):
+        """Evict until within budget, picking the least used of the least recently used entries
+
+        Called with the lock held. Surviving candidates have their hit counts halved so
+        entries that were popular long ago eventually age out.
+        """
+        while self.bytes > self.memory_budget:
+            candidates = [
+                (key, entry) for key, entry in itertools.islice(self.entries.items(), CACHE_EVICTION_SAMPLE + 1)
+                if key != keep
+            ][:CACHE_EVICTION_SAMPLE]
+            if not candidates:
+                break
+            victim, entry = min(candidates, key=lambda item: item[1]["hits"])
+            del self.entries[victim]
+            self.bytes -= entry["size"]
+            self.stats["evictions"] += 1
+            for key, survivor in candidates:
+                if key != victim:
+                    survivor["hits"] //= 2
+
+    def _refresh(self, api, key, loader):
+        try:
+            with request_priority(PRIORITY_PREFETCH):
+                self._load(api, key, loader)
+            with self._lock:
+                self.stats["refreshes"] += 1
+        except Exception:
+            # Keep serving the last good value
+            with self._lock:
+                self.stats["refresh_failures"] += 1
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def fetch(self, api, key, loader, empty=None):
+        """Return the cached value for key, annotated with its fetch time and staleness
+
+        Loaded values carry a content `version` (see fetch_version) that derived caches
+        key on, since the fetch time changes whenever an entry is reloaded.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self.entries.get(key)
+            stale = entry is not None and now - entry["fetched_at"] >= self.ttl
+            if entry is not None:
+                self.stats["stale" if stale else "fresh"] += 1
+                entry["hits"] += 1
+                self.entries.move_to_end(key)
+            refresh = stale and key not in self._refreshing
+            if refresh:
+                self._refreshing.add(key)
+
+        if refresh:
+            self._refresh_pool.submit(self._refresh, api, key, loader)
+
+        if entry is None:
+            with self._lock:
+                self.stats["miss"] += 1
+            try:
+                value = self._load(api, key, loader)
+            except RateLimitTimeout:
+                with self._lock:
+                    self.stats["rate_limited"] += 1
+                return dict(empty or {}, status="error", message="Rate limit reached, try again shortly",
+                            fetched_at=None, stale=False)
+            except Exception as e:
+                with self._lock:
+                    self.stats["unavailable"] += 1
+                return dict(empty or {}, status="error", message=f"Data source unavailable: {e}",
+                            fetched_at=None, stale=False)
+            return dict(value, fetched_at=now, stale=False)
+
+        return dict(entry["value"], fetched_at=entry["fetched_at"], stale=stale)
+
+    def snapshot(self):
+        """Cache counters plus the state of each API's circuit breaker"""
+        with self._lock:
+            stats = dict(self.stats, entries=len(self.entries), refreshing=len(self._refreshing),
+                         bytes=self.bytes, memory_budget=self.memory_budget)
+        stats.update({f"{api}_circuit": breaker.state for api, breaker in self.breakers.items()})
+        return stats
+
+@st.cache_resource
+def get_fetch_cache():
+    """Process-wide fetch cache shared by every session"""
+    return FetchCache()
+
+class SessionMemoryTracker:
+    """Approximate memory held by each browser session, measured at the end of its reruns"""
+
+    def __init__(self, idle_timeout=SESSION_IDLE_TIMEOUT):
+        self.idle_timeout = idle_timeout
+        self.sessions = {}
+        self._lock = threading.Lock()
+
+    def record(self, session_id, objects):
+        """Size the named objects a session holds and replace its previous measurement"""
+        parts = {name: estimate_size(obj) for name, obj in objects.items()}
+        now = time.time()
+        with self._lock:
+            self.sessions[session_id] = {"bytes": sum(parts.values()), "parts": parts, "seen": now}
+            for idle in [sid for sid, usage in self.sessions.items() if now - usage["seen"] > self.idle_timeout]:
+                del self.sessions[idle]
+
+    def snapshot(self):
+        """Totals across active sessions plus the largest few"""
+        with self._lock:
+            usage = sorted(self.sessions.items(), key=lambda item: item[1]["bytes"], reverse=True)
+        total = sum(u["bytes"] for _, u in usage)
+        return {
+            "sessions": len(usage),
+            "bytes": total,
+            "mean_bytes": total // len(usage) if usage else 0,
+            "largest": [{"session": sid[:8], "bytes": u["bytes"], "parts": u["parts"]} for sid, u in usage[:5]]
+        }
+
+@st.cache_resource
+def get_session_memory():
+    """Process-wide per-session memory accounting"""
+    return SessionMemoryTracker()
+
+def record_session_memory(objects):
+    """Account the current session's state plus the given per-run objects"""
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return
+    get_session_memory().record(ctx.session_id, dict(objects, session_state=st.session_state.to_dict()))
+
+def data_age_caption(result):
+    """Describe how old a fetch result is, for display under the data it came from"""
+    if not result.get("fetched_at"):
+        return ""
+    minutes = int((time.time() - result["fetched_at"]) // 60)
+    age = "just now" if minutes < 1 else f"{minutes} min ago" if minutes < 120 else f"{minutes // 60} h ago"
+    note = " (update pending)" if result.get("stale") else ""
+    return f"Data fetched {age}{note}"
+
+class DatasetHandle:
+    """Immutable bill list with a content fingerprint computed once when it is loaded
+
+    Caches key on `version` instead of hashing the bills on every call, and structures
+    derived from the bills are memoized on the handle. The bill dicts are shared
+    between sessions and must not be mutated.
+    """
+
+    def __init__(self, bills, congress_number=118, version=None):
+        self.bills = tuple(bills)
+        self.congress_number = congress_number
+        self.version = version or fingerprint_data(list(self.bills))[:16]
+        self._derived = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.bills)
+
+    def derived(self, name, build):
+        """Return build(bills), computed once for this version"""
+        with self._lock:
+            if name not in self._derived:
+                self._derived[name] = build(self.bills)
+            return self._derived[name]
+
+    @property
+    def bill_index(self):
+        """Column of each bill_id in vote matrices"""
+        return self.derived("bill_index", lambda bills: {bill["bill_id"]: i for i, bill in enumerate(bills)})
+
+    @property
+    def alignment_arrays(self):
+        """Bill signs and the bills x areas indicator matrix"""
+        return self.derived("alignment_arrays", bill_alignment_arrays)
+
+    @property
+    def date_order(self):
+        """Bill positions ordered by vote date; undated bills sort first"""
+        return self.derived("date_order", lambda bills: sorted(range(len(bills)), key=lambda i: bills[i].get("vote_date", "")))
+
 # Functions to fetch data from Congress.gov
-@st.cache_data(ttl=CACHE_TTL)
-def fetch_congressional_data(congress_number=118):
-    """Fetch bill and voting data from Congress.gov"""
+def member_directory():
+    """Members keyed by bioguide_id, from the snapshot bundle when one is configured"""
+    snapshot = get_snapshot()
+    return snapshot.members if snapshot is not None else SAMPLE_MEMBERS
+
+def load_congressional_data(congress_number=118):
+    """Load bill and voting data from Congress.gov"""
+    snapshot = get_snapshot()
+    if snapshot is not None and snapshot.congress_number == congress_number:
+        return {
+            "bills": snapshot.bills,
+            "dataset": DatasetHandle(snapshot.bills, congress_number, snapshot.metadata.get("bills_version")),
+            "status": "success"
+        }
+
+    # Earlier Congresses come from their shard, opened on first use
+    store = get_shard_store()
+    if store is not None and store.shard(congress_number) is not None:
+        return {
+            "bills": store.shard(congress_number).bills,
+            "dataset": store.datasets[congress_number],
+            "status": "success"
+        }
+
+    path = os.path.join(BILLS_DIR, f"congress-{congress_number}.json") if BILLS_DIR else ""
+    if path and os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            bills = json.load(f)
+        return {
+            "bills": bills,
+            "dataset": DatasetHandle(bills, congress_number),
+            "status": "success"
+        }
+
     # In a real implementation, you would call the Congress.gov API
     # For demonstration, we'll use sample data
-    
+    if congress_number != SAMPLE_CONGRESS:
+        return {
+            "bills": [],
+            "dataset": DatasetHandle([], congress_number),
+            "status": "error",
+            "message": f"No data for Congress {congress_number}"
+        }
+
     return {
         "bills": SAMPLE_BILLS,
+        "dataset": DatasetHandle(SAMPLE_BILLS, congress_number),
         "status": "success"
     }
 
-@st.cache_data(ttl=CACHE_TTL)
-def fetch_member_data(member_id=None, state=None, party=None):
-    """Fetch member data from Congress.gov"""
+def fetch_congressional_data(congress_number=118):
+    """Fetch bill and voting data from Congress.gov"""
+    key = ("fetch_congressional_data", congress_number)
+    return get_fetch_cache().fetch("congress", key, lambda: load_congressional_data(congress_number),
+                                   empty={"bills": [], "dataset": DatasetHandle([], congress_number)})
+
+def fetch_dataset(congress_number=118):
+    """Versioned handle on the bills of a Congress"""
+    return fetch_congressional_data(congress_number)["dataset"]
+
+def load_member_data(member_id=None, state=None, party=None):
+    """Load member data from Congress.gov"""
     # In a real implementation, you would call the Congress.gov API
     # For demonstration, we'll use sample data
     
-    if member_id and member_id in SAMPLE_MEMBERS:
+    members = member_directory()
+    if member_id and member_id in members:
         return {
-            "results": [SAMPLE_MEMBERS[member_id]],
+            "results": [members[member_id]],
             "status": "success"
         }
     
     results = []
-    for id, member in SAMPLE_MEMBERS.items():
+    for id, member in members.items():
         if (not state or member["state"] == state) and (not party or member["party"] == party):
             results.append(member)
     
@@ -502,12 +1291,38 @@ def fetch_member_data(member_id=None, state=None, party=None):
         "status": "success"
     }
 
-@st.cache_data(ttl=CACHE_TTL)
-def fetch_member_votes(member_id):
-    """Fetch voting record for a specific member"""
+def fetch_member_data(member_id=None, state=None, party=None):
+    """Fetch member data from Congress.gov"""
+    key = ("fetch_member_data", member_id, state, party)
+    return get_fetch_cache().fetch("congress", key, lambda: load_member_data(member_id, state, party), empty={"results": []})
+
+def load_member_votes(member_id, congress_number=SAMPLE_CONGRESS):
+    """Load voting record for a specific member in a Congress
+
+    Votes in earlier Congresses come from their shard or from roll-call files in
+    ROLLCALL_DIR; the sample votes only cover SAMPLE_CONGRESS.
+    """
+    snapshot = get_snapshot()
+    if snapshot is not None and snapshot.congress_number == congress_number:
+        return snapshot.member_votes(member_id)
+
+    store = get_shard_store()
+    if store is not None and store.shard(congress_number) is not None:
+        return store.shard(congress_number).member_votes(member_id)
+
+    rollcalls = get_rollcall_votes()
+    if rollcalls is not None:
+        return rollcall_member_votes(rollcalls, member_id, congress_number)
+
     # In a real implementation, you would call the Congress.gov API
     # For demonstration, we'll use sample data
-    
+    if congress_number != SAMPLE_CONGRESS:
+        return {
+            "votes": {},
+            "status": "error",
+            "message": f"No votes for Congress {congress_number}"
+        }
+
     if member_id in SAMPLE_MEMBER_VOTES:
         return {
             "votes": SAMPLE_MEMBER_VOTES[member_id],
@@ -520,15 +1335,20 @@ def fetch_member_votes(member_id):
             "message": "Member not found"
         }
 
+def fetch_member_votes(member_id, congress_number=SAMPLE_CONGRESS):
+    """Fetch voting record for a specific member in a Congress"""
+    key = ("fetch_member_votes", member_id, congress_number)
+    return get_fetch_cache().fetch("congress", key, lambda: load_member_votes(member_id, congress_number),
+                                   empty={"votes": {}})
+
 # Functions to fetch data from FEC API
-@st.cache_data(ttl=CACHE_TTL)
-def fetch_candidate_data(name=None, state=None, party=None):
-    """Fetch candidate data from FEC API"""
+def load_candidate_data(name=None, state=None, party=None):
+    """Load candidate data from FEC API"""
     # In a real implementation, you would call the FEC API
     # For demonstration, we'll convert our sample data to FEC format
     
     results = []
-    for id, member in SAMPLE_MEMBERS.items():
+    for id, member in member_directory().items():
         if (not name or name.lower() in member["name"].lower()) and \
            (not state or member["state"] == state) and \
            (not party or member["party"] == party):
@@ -546,12 +1366,69 @@ def fetch_candidate_data(name=None, state=None, party=None):
         "status": "success"
     }
 
-@st.cache_data(ttl=CACHE_TTL)
-def fetch_candidate_contributions(candidate_id):
-    """Fetch contribution data for a specific candidate"""
-    # In a real implementation, you would call the FEC API
+def fetch_candidate_data(name=None, state=None, party=None):
+    """Fetch candidate data from FEC API"""
+    key = ("fetch_candidate_data", name, state, party)
+    return get_fetch_cache().fetch("fec", key, lambda: load_candidate_data(name, state, party), empty={"results": []})
+
+def congress_cycle(congress_number):
+    """FEC two-year transaction period of a Congress; FEC_CYCLE for SAMPLE_CONGRESS"""
+    return FEC_CYCLE if congress_number == SAMPLE_CONGRESS else 1788 + 2 * congress_number
+
+def load_live_candidate_contributions(candidate_id, congress_number=SAMPLE_CONGRESS):
+    """Load itemized receipts for a candidate's principal committees from FEC Schedule A"""
+    committees = api_get("fec", f"/candidate/{candidate_id}/committees/", {"designation": "P"})
+    committee_ids = [c["committee_id"] for c in committees.get("results", [])]
+    if not committee_ids:
+        return {
+            "results": [],
+            "status": "error",
+            "message": "No principal campaign committee found"
+        }
+
+    params = {
+        "committee_id": committee_ids,
+        "two_year_transaction_period": congress_cycle(congress_number),
+        "sort": "-contribution_receipt_date",
+        "per_page": 100
+    }
+    results = []
+    for _ in range(FEC_MAX_PAGES):
+        page = api_get("fec", "/schedules/schedule_a/", params)
+        results.extend(page.get("results", []))
+
+        # Schedule A uses keyset pagination
+        last_indexes = page.get("pagination", {}).get("last_indexes")
+        if not last_indexes or not page.get("results"):
+            break
+        params.update(last_indexes)
+
+    return {
+        "results": results,
+        "status": "success"
+    }
+
+def load_candidate_contributions(candidate_id, congress_number=SAMPLE_CONGRESS):
+    """Load contribution data for a specific candidate in a Congress's election cycle"""
+    snapshot = get_snapshot()
+    if snapshot is not None and snapshot.congress_number == congress_number:
+        return snapshot.contributions(candidate_id)
+
+    store = get_shard_store()
+    if store is not None and store.shard(congress_number) is not None:
+        return store.shard(congress_number).contributions(candidate_id)
+
+    if DATA_SOURCE == "live":
+        return load_live_candidate_contributions(candidate_id, congress_number)
+
     # For demonstration, we'll use sample data
-    
+    if congress_number != SAMPLE_CONGRESS:
+        return {
+            "results": [],
+            "status": "error",
+            "message": f"No contributions for Congress {congress_number}"
+        }
+
     if candidate_id in SAMPLE_CONTRIBUTIONS:
         return {
             "results": SAMPLE_CONTRIBUTIONS[candidate_id],
@@ -564,11 +1441,47 @@ def fetch_candidate_contributions(candidate_id):
             "message": "Candidate not found"
         }
 
+def fetch_candidate_contributions(candidate_id, congress_number=SAMPLE_CONGRESS):
+    """Fetch contribution data for a specific candidate in a Congress's election cycle"""
+    key = ("fetch_candidate_contributions", candidate_id, congress_number)
+    # Records are packed as columns first so validation runs on the codes; sketches are
+    # then built from the validated records, once the whole batch has been checked
+    return get_fetch_cache().fetch(
+        "fec", key,
+        lambda: with_contribution_sketches(
+            with_validated_contributions(with_columnar_contributions(load_candidate_contributions(candidate_id, congress_number)))
+        ),
+        empty={"results": []}
+    )
+
 # Data analysis functions
-def analyze_voting_pattern(member_id, bills_data):
+@st.cache_resource
+def get_analysis_cache():
+    """Per-member analysis results shared across sessions"""
+    return {"results": OrderedDict(), "lock": threading.Lock()}
+
+def cached_analysis(key):
+    """Look up an analysis keyed by dataset version and the content versions of its inputs"""
+    cache = get_analysis_cache()
+    with cache["lock"]:
+        result = cache["results"].get(key)
+        if result is not None:
+            cache["results"].move_to_end(key)
+    return result
+
+def store_analysis(key, result):
+    """Remember a successful analysis and return it"""
+    cache = get_analysis_cache()
+    with cache["lock"]:
+        cache["results"][key] = result
+        while len(cache["results"]) > ANALYSIS_CACHE_MAX_ENTRIES:
+            cache["results"].popitem(last=False)
+    return result
+
+def analyze_voting_pattern(member_id, dataset):
     """Analyze voting patterns for a specific member of Congress"""
     # Get member votes
-    member_votes_data = fetch_member_votes(member_id)
+    member_votes_data = fetch_member_votes(member_id, dataset.congress_number)
     
     if member_votes_data["status"] != "success":
         return {
@@ -576,8 +1489,13 @@ def analyze_voting_pattern(member_id, bills_data):
             "message": member_votes_data.get("message", "Failed to fetch voting data")
         }
     
+    key = ("voting_pattern", dataset.version, member_id, member_votes_data["version"])
+    cached = cached_analysis(key)
+    if cached is not None:
+        return cached
+
     member_votes = member_votes_data["votes"]
-    bills = bills_data["bills"]
+    bills = dataset.bills
     
     # Initialize counters
     total_votes = 0
@@ -621,7 +1539,7 @@ def analyze_voting_pattern(member_id, bills_data):
         else:
             category_alignment[category] = 0
     
-    return {
+    return store_analysis(key, {
         "status": "success",
         "total_votes": total_votes,
         "conservative_aligned_votes": conservative_aligned_votes,
@@ -629,12 +1547,12 @@ def analyze_voting_pattern(member_id, bills_data):
         "conservative_alignment": conservative_alignment,
         "votes_by_category": votes_by_category,
         "category_alignment": category_alignment
-    }
+    })
 
-def match_contributions_to_votes(candidate_id, member_id, bills_data):
+def match_contributions_to_votes(candidate_id, member_id, dataset):
     """Match campaign contributions to voting records"""
     # Get contribution data
-    contributions_data = fetch_candidate_contributions(candidate_id)
+    contributions_data = fetch_candidate_contributions(candidate_id, dataset.congress_number)
     
     if contributions_data["status"] != "success":
         return {
@@ -643,7 +1561,7 @@ def match_contributions_to_votes(candidate_id, member_id, bills_data):
         }
     
     # Get voting pattern
-    voting_pattern = analyze_voting_pattern(member_id, bills_data)
+    voting_pattern = analyze_voting_pattern(member_id, dataset)
     
     if voting_pattern["status"] != "success":
         return {
@@ -651,62 +1569,29 @@ def match_contributions_to_votes(candidate_id, member_id, bills_data):
             "message": "Failed to analyze voting pattern"
         }
     
+    key = ("contribution_match", dataset.version, member_id, candidate_id,
+           fetch_member_votes(member_id, dataset.congress_number).get("version"), contributions_data["version"])
+    cached = cached_analysis(key)
+    if cached is not None:
+        return cached
+
     # In a real implementation, this would involve complex analysis
     # For demonstration, we'll create a simplified correlation
     
-    contributions = contributions_data["results"]
+    fields = contribution_fields(contributions_data["results"],
+                                 ["contributor_name", "contributor_employer", CONTRIBUTION_AMOUNT_FIELD])
     
-    # Map contributors to likely policy interests
-    contributor_interests = {}
-    for contribution in contributions:
-        contributor = contribution["contributor_name"]
-        employer = contribution["contributor_employer"]
-        amount = contribution["contribution_receipt_amount"]
-        
-        # Simple keyword matching (would be more sophisticated in practice)
-        interests = []
-        
-        if any(word in contributor.lower() or word in employer.lower() 
-               for word in ["oil", "gas", "coal", "energy", "petroleum"]):
-            interests.append("energy")
-        
-        if any(word in contributor.lower() or word in employer.lower() 
-               for word in ["bank", "invest", "financ", "capital", "fund"]):
-            interests.append("economy")
-        
-        if any(word in contributor.lower() or word in employer.lower() 
-               for word in ["defense", "military", "security", "weapon"]):
-            interests.append("defense")
-        
-        if any(word in contributor.lower() or word in employer.lower() 
-               for word in ["health", "pharma", "medical", "hospital"]):
-            interests.append("healthcare")
-        
-        if any(word in contributor.lower() or word in employer.lower() 
-               for word in ["school", "education", "teacher", "university"]):
-            interests.append("education")
-        
-        if any(word in contributor.lower() or word in employer.lower() 
-               for word in ["immigration", "border", "patrol"]):
-            interests.append("immigration")
-        
-        if any(word in contributor.lower() or word in employer.lower() 
-               for word in ["court", "judicial", "legal", "law", "attorney"]):
-            interests.append("judiciary")
-        
-        if any(word in contributor.lower() or word in employer.lower() 
-               for word in ["election", "vote", "ballot", "campaign"]):
-            interests.append("elections")
-        
-        # If no specific interests found, mark as "general"
-        if not interests:
-            interests.append("general")
-        
-        # Add to contributor interests
-        contributor_interests[contributor] = {
-            "interests": interests,
-            "amount": amount
-        }
+    # Map contributors to likely policy interests; each contributor keeps the interests
+    # and amount of their last record
+    donor_codes, interests = donor_interest_codes(fields["contributor_name"], fields["contributor_employer"])
+    name_codes, names = pd.factorize(fields["contributor_name"], use_na_sentinel=False)
+    last = np.zeros(len(names), dtype=np.int64)
+    np.maximum.at(last, name_codes, np.arange(len(name_codes)))
+    contributor_interests = {
+        contributor if isinstance(contributor, str) else None: {"interests": interests[donor], "amount": amount}
+        for contributor, donor, amount in zip(names.tolist(), donor_codes[last].tolist(),
+                                              fields[CONTRIBUTION_AMOUNT_FIELD][last].tolist())
+    }
     
     # Calculate alignment between contributions and votes
     interest_alignment = {}
@@ -716,7 +1601,7 @@ def match_contributions_to_votes(candidate_id, member_id, bills_data):
         
         # Sum contributions in this category
         category_contributions = sum(
-            contrib["amount"] for contrib, data in contributor_interests.items()
+            data["amount"] for contrib, data in contributor_interests.items()
             if category in data["interests"]
         )
         
@@ -743,197 +1628,2867 @@ def match_contributions_to_votes(candidate_id, member_id, bills_data):
     
     overall_correlation = (total_aligned_contributions / total_contributions * 100) if total_contributions > 0 else 0
     
-    return {
+    return store_analysis(key, {
         "status": "success",
         "interest_alignment": interest_alignment,
         "overall_correlation": overall_correlation,
         "contributor_interests": contributor_interests
-    }
+    })
 
-def calculate_policy_alignment(member_id, bills_data):
-    """Calculate alignment with policy positions"""
-    # Get voting pattern analysis
-    voting_pattern = analyze_voting_pattern(member_id, bills_data)
-    
-    if voting_pattern["status"] != "success":
-        return {
-            "status": "error",
-            "message": "Failed to analyze voting pattern"
-        }
-    
-    # Get member data for context
-    member_data = fetch_member_data(member_id)
-    if member_data["status"] != "success" or not member_data["results"]:
-        member_info = {"name": "Unknown", "party": "Unknown", "state": "Unknown"}
-    else:
-        member_info = member_data["results"][0]
-    
-    # Get overall alignment score
-    overall_score = voting_pattern["conservative_alignment"]
-    
-    # Get category scores
-    category_scores = voting_pattern["category_alignment"]
-    
-    # Generate analysis text based on scores
-    analysis = f"## Policy Alignment Analysis for {member_info['name']}\n\n"
-    analysis += f"### Overall Conservative Alignment: {overall_score:.1f}%\n\n"
+def build_alignment_report(member_info, overall_score, category_scores):
+    """Render the templated markdown alignment report"""
+    parts = [f"## Policy Alignment Analysis for {member_info['name']}\n\n"]
+    parts.append(f"### Overall Conservative Alignment: {overall_score:.1f}%\n\n")
     
     # Add party context
     if member_info["party"] == "REP":
         if overall_score > 75:
-            analysis += "This Republican representative shows strong alignment with conservative policies, "
-            analysis += "voting consistently in favor of bills that align with conservative positions.\n\n"
+            parts.append("This Republican representative shows strong alignment with conservative policies, ")
+            parts.append("voting consistently in favor of bills that align with conservative positions.\n\n")
         elif overall_score > 50:
-            analysis += "This Republican representative shows moderate alignment with conservative policies, "
-            analysis += "supporting many but not all initiatives that align with conservative positions.\n\n"
+            parts.append("This Republican representative shows moderate alignment with conservative policies, ")
+            parts.append("supporting many but not all initiatives that align with conservative positions.\n\n")
         else:
-            analysis += "Despite being a Republican, this representative shows limited alignment with conservative policies, "
-            analysis += "often voting against bills that would advance conservative positions.\n\n"
+            parts.append("Despite being a Republican, this representative shows limited alignment with conservative policies, ")
+            parts.append("often voting against bills that would advance conservative positions.\n\n")
     elif member_info["party"] == "DEM":
         if overall_score < 25:
-            analysis += "This Democratic representative shows strong alignment with progressive policies, "
-            analysis += "consistently voting against bills that align with conservative positions.\n\n"
+            parts.append("This Democratic representative shows strong alignment with progressive policies, ")
+            parts.append("consistently voting against bills that align with conservative positions.\n\n")
         elif overall_score < 50:
-            analysis += "This Democratic representative shows moderate alignment with progressive policies, "
-            analysis += "though occasionally supporting some initiatives that align with conservative positions.\n\n"
+            parts.append("This Democratic representative shows moderate alignment with progressive policies, ")
+            parts.append("though occasionally supporting some initiatives that align with conservative positions.\n\n")
         else:
-            analysis += "Despite being a Democrat, this representative shows surprising alignment with conservative policies, "
-            analysis += "often voting for bills that would advance conservative positions.\n\n"
+            parts.append("Despite being a Democrat, this representative shows surprising alignment with conservative policies, ")
+            parts.append("often voting for bills that would advance conservative positions.\n\n")
 
     # Add category-specific analysis
-    analysis += "### Policy Area Analysis\n\n"
+    parts.append("### Policy Area Analysis\n\n")
 
     for category, score in category_scores.items():
         if category in POLICY_DETAILS:
             details = POLICY_DETAILS[category]
-            analysis += f"#### {category.capitalize()}: {score:.1f}%\n\n"
+            parts.append(f"#### {category.capitalize()}: {score:.1f}%\n\n")
 
             # Add category description
-            analysis += f"{details['description']}\n\n"
+            parts.append(f"{details['description']}\n\n")
 
             # Add alignment assessment
             if score > 75:
-                analysis += "**Strong conservative alignment**: "
+                parts.append("**Strong conservative alignment**: ")
                 indicators = details["alignment_indicators"]["high"]
                 if indicators:
-                    analysis += f"The representative has {indicators[0].lower()}"
+                    parts.append(f"The representative has {indicators[0].lower()}")
                     if len(indicators) > 1:
-                        analysis += f" and {indicators[1].lower()}"
-                    analysis += ".\n\n"
+                        parts.append(f" and {indicators[1].lower()}")
+                    parts.append(".\n\n")
             elif score > 50:
-                analysis += "**Moderate conservative alignment**: "
-                analysis += "The representative has shown mixed support for conservative positions in this area.\n\n"
+                parts.append("**Moderate conservative alignment**: ")
+                parts.append("The representative has shown mixed support for conservative positions in this area.\n\n")
             elif score > 25:
-                analysis += "**Limited conservative alignment**: "
-                analysis += "The representative has occasionally supported conservative positions but generally opposes them.\n\n"
+                parts.append("**Limited conservative alignment**: ")
+                parts.append("The representative has occasionally supported conservative positions but generally opposes them.\n\n")
             else:
-                analysis += "**Strong progressive alignment**: "
+                parts.append("**Strong progressive alignment**: ")
                 indicators = details["alignment_indicators"]["low"]
                 if indicators:
-                    analysis += f"The representative has {indicators[0].lower()}"
+                    parts.append(f"The representative has {indicators[0].lower()}")
                     if len(indicators) > 1:
-                        analysis += f" and {indicators[1].lower()}"
-                    analysis += ".\n\n"
+                        parts.append(f" and {indicators[1].lower()}")
+                    parts.append(".\n\n")
 
             # Add key proposals
-            analysis += "**Key policy proposals in this area:**\n"
+            parts.append("**Key policy proposals in this area:**\n")
             for proposal in details["key_proposals"][:3]:  # Show top 3 proposals
-                analysis += f"- {proposal}\n"
-            analysis += "\n"
+                parts.append(f"- {proposal}\n")
+            parts.append("\n")
 
     # Add conclusion
-    analysis += "### Conclusion\n\n"
+    parts.append("### Conclusion\n\n")
     if overall_score > 75:
-        analysis += f"Representative {member_info['name']} demonstrates strong alignment with conservative policy positions "
-        analysis += "across most policy areas, particularly in "
+        parts.append(f"Representative {member_info['name']} demonstrates strong alignment with conservative policy positions ")
+        parts.append("across most policy areas, particularly in ")
         # Find top 2 aligned categories
         top_categories = sorted(category_scores.items(), key=lambda x: x[1], reverse=True)[:2]
-        analysis += f"{top_categories[0][0]} ({top_categories[0][1]:.1f}%) and {top_categories[1][0]} ({top_categories[1][1]:.1f}%)."
+        parts.append(f"{top_categories[0][0]} ({top_categories[0][1]:.1f}%) and {top_categories[1][0]} ({top_categories[1][1]:.1f}%).")
     elif overall_score > 50:
-        analysis += f"Representative {member_info['name']} demonstrates moderate alignment with conservative policy positions, "
-        analysis += "with stronger support in some areas than others. "
+        parts.append(f"Representative {member_info['name']} demonstrates moderate alignment with conservative policy positions, ")
+        parts.append("with stronger support in some areas than others. ")
         # Find top aligned category
         top_category = max(category_scores.items(), key=lambda x: x[1])
-        analysis += f"Their strongest alignment is in {top_category[0]} ({top_category[1]:.1f}%)."
+        parts.append(f"Their strongest alignment is in {top_category[0]} ({top_category[1]:.1f}%).")
     elif overall_score > 25:
-        analysis += f"Representative {member_info['name']} demonstrates limited alignment with conservative policy positions, "
-        analysis += "opposing most but not all conservative agenda items. "
+        parts.append(f"Representative {member_info['name']} demonstrates limited alignment with conservative policy positions, ")
+        parts.append("opposing most but not all conservative agenda items. ")
         # Find top aligned category
         top_category = max(category_scores.items(), key=lambda x: x[1])
-        analysis += f"Their only notable conservative alignment is in {top_category[0]} ({top_category[1]:.1f}%)."
+        parts.append(f"Their only notable conservative alignment is in {top_category[0]} ({top_category[1]:.1f}%).")
     else:
-        analysis += f"Representative {member_info['name']} demonstrates strong alignment with progressive policy positions "
-        analysis += "across virtually all policy areas. "
+        parts.append(f"Representative {member_info['name']} demonstrates strong alignment with progressive policy positions ")
+        parts.append("across virtually all policy areas. ")
         # Find most opposed categories
         bottom_categories = sorted(category_scores.items(), key=lambda x: x[1])[:2]
-        analysis += f"Their progressive alignment is strongest in {bottom_categories[0][0]} ({100-bottom_categories[0][1]:.1f}%) and {bottom_categories[1][0]} ({100-bottom_categories[1][1]:.1f}%)."
-
-    return {
-        "status": "success",
-        "overall_score": overall_score,
-        "category_scores": category_scores,
-        "analysis": analysis
-    }
-
-def categorize_bill_by_policy(bill_data):
-    """Categorize a bill according to policy areas"""
-    # This would analyze bill text and metadata to determine which
-    # policy areas it relates to
-
-    # For demonstration, we'll use the categories already assigned in our sample data
-    return bill_data.get("categories", [])
-
-def map_donor_interests_to_policy(donor_data):
-    """Map donor industries and interests to policy areas"""
-    # This would analyze donor information to determine which
-    # policy areas align with their interests
-
-    contributor = donor_data.get("contributor_name", "")
-    employer = donor_data.get("contributor_employer", "")
-
-    interests = []
-
-    # Simple keyword matching (would be more sophisticated in practice)
-    if any(word in contributor.lower() or word in employer.lower()
-           for word in ["oil", "gas", "coal", "energy", "petroleum"]):
-        interests.append("energy")
+        parts.append(f"Their progressive alignment is strongest in {bottom_categories[0][0]} ({100-bottom_categories[0][1]:.1f}%) and {bottom_categories[1][0]} ({100-bottom_categories[1][1]:.1f}%).")
 
-    if any(word in contributor.lower() or word in employer.lower()
-           for word in ["bank", "invest", "financ", "capital", "fund"]):
-        interests.append("economy")
+    return "".join(parts)
 
-    if any(word in contributor.lower() or word in employer.lower()
-           for word in ["defense", "military", "security", "weapon"]):
-        interests.append("defense")
+def calculate_policy_alignment(member_id, dataset):
+    """Calculate alignment with policy positions"""
+    # Get voting pattern analysis
+    voting_pattern = analyze_voting_pattern(member_id, dataset)
+    
+    if voting_pattern["status"] != "success":
+        return {
+            "status": "error",
+            "message": "Failed to analyze voting pattern"
+        }
+    
+    # Get member data for context
+    member_data = fetch_member_data(member_id)
+    if member_data["status"] != "success" or not member_data["results"]:
+        member_info = {"name": "Unknown", "party": "Unknown", "state": "Unknown"}
+    else:
+        member_info = member_data["results"][0]
+
+    key = ("policy_alignment", dataset.version, member_id,
+           fetch_member_votes(member_id, dataset.congress_number).get("version"), member_data.get("version"))
+    cached = cached_analysis(key)
+    if cached is not None:
+        return cached
+    
+    # Get overall alignment score
+    overall_score = voting_pattern["conservative_alignment"]
+    
+    # Get category scores
+    category_scores = voting_pattern["category_alignment"]
+    
+    # Generate analysis text based on scores
+    analysis = build_alignment_report(member_info, overall_score, category_scores)
+
+    return store_analysis(key, {
+        "status": "success",
+        "overall_score": overall_score,
+        "category_scores": category_scores,
+        "analysis": analysis
+    })
+
+def categorize_bill_by_policy(bill_data):
+    """Categorize a bill according to policy areas"""
+    # This would analyze bill text and metadata to determine which
+    # policy areas it relates to
+
+    # For demonstration, we'll use the categories already assigned in our sample data
+    return bill_data.get("categories", [])
+
+def map_donor_interests_to_policy(donor_data):
+    """Map donor industries and interests to policy areas"""
+    # This would analyze donor information to determine which
+    # policy areas align with their interests
+
+    contributor = (donor_data.get("contributor_name") or "").lower()
+    employer = (donor_data.get("contributor_employer") or "").lower()
+
+    # Simple keyword matching (would be more sophisticated in practice)
+    interests = [
+        area for area, pattern in DONOR_INTEREST_PATTERNS.items()
+        if pattern.search(contributor) or pattern.search(employer)
+    ]
+
+    # If no specific interests found, mark as "general"
+    if not interests:
+        interests.append("general")
+
+    return interests
+
+def distinct_donors(names, employers):
+    """Code of each record's donor and the (name, employer) of each distinct donor"""
+    name_codes, names = pd.factorize(names)
+    employer_codes, employers = pd.factorize(employers)
+    # Code 0 stands for a missing value
+    names, employers = [None] + names.tolist(), [None] + employers.tolist()
+    donor_codes, donors = pd.factorize((name_codes + 1).astype(np.int64) * len(employers) + employer_codes + 1)
+    return donor_codes, [(names[donor // len(employers)], employers[donor % len(employers)]) for donor in donors.tolist()]
+
+def donor_interest_codes(names, employers):
+    """Code of each record's donor (name and employer) and the policy interests of each distinct donor
+
+    Donors repeat across a candidate's records, so each distinct name and employer
+    pair is matched against the interest patterns once.
+    """
+    donor_codes, donors = distinct_donors(names, employers)
+    interests = [
+        map_donor_interests_to_policy({"contributor_name": name, "contributor_employer": employer})
+        for name, employer in donors
+    ]
+    return donor_codes, interests
+
+def donor_area_shares(interests):
+    """Share of each donor's contributions credited to each of POLICY_AREA_KEYS and "other", one row per donor"""
+    areas = POLICY_AREA_KEYS + ["other"]
+    shares = np.zeros((len(interests), len(areas)))
+    for row, donor_interests in enumerate(interests):
+        # Amounts split equally across interests; ones outside the policy areas go to "other"
+        for interest in donor_interests:
+            shares[row, areas.index(interest) if interest in POLICY_AREAS else -1] += 1 / len(donor_interests)
+    return shares
+
+def donor_area_totals(contributions):
+    """Total contributions by policy area, splitting each amount across its interests"""
+    fields = contribution_fields(contributions, ["contributor_name", "contributor_employer", CONTRIBUTION_AMOUNT_FIELD])
+    donor_codes, interests = donor_interest_codes(fields["contributor_name"], fields["contributor_employer"])
+    donor_amounts = np.bincount(donor_codes, weights=fields[CONTRIBUTION_AMOUNT_FIELD], minlength=len(interests))
+    return dict(zip(POLICY_AREA_KEYS + ["other"], (donor_amounts @ donor_area_shares(interests)).tolist()))
+
+# Contribution validation
+# Reasons a record is excluded from analysis, in the order they are checked; a record
+# is reported under the first reason that applies
+REJECT_REASONS = ["invalid_amount", "invalid_date", "missing_contributor", "refund", "memo", "superseded", "duplicate"]
+def rows_mask(size, rows):
+    """Boolean mask of length size that is True at rows"""
+    mask = np.zeros(size, dtype=bool)
+    mask[rows] = True
+    return mask
+
+def contribution_codes(columns, field, arrays):
+    """A field's codes, all 0 (missing) when the payload doesn't hold it"""
+    if f"{field}.codes" not in arrays:
+        return np.zeros(len(columns), dtype=np.uint8)
+    return arrays[f"{field}.codes"]
+
+def contribution_dictionary(columns, field, arrays):
+    """Codes and distinct values of a field as a Series (index 0 is the missing value)"""
+    if f"{field}.codes" not in arrays:
+        return contribution_codes(columns, field, arrays), pd.Series([None], dtype=object)
+    codes, values = columns.dictionary(field, arrays)
+    return codes, pd.Series(values, dtype=object)
+
+def superseded_rows(committees, transactions, files):
+    """Rows whose transaction reappears in a later filing of the same committee"""
+    keys = committees.astype(np.int64) * (int(transactions.max(initial=0)) + 1) + transactions
+    order = np.lexsort((files, keys))
+    # After sorting by key then file number, every row but the last of its key is superseded
+    earlier = np.zeros(len(order), dtype=bool)
+    earlier[:-1] = keys[order][1:] == keys[order][:-1]
+    return order[earlier]
+
+def contribution_reject_codes(columns):
+    """Reject code of each record in a ContributionColumns: 0 keeps it, i + 1 rejects it for REJECT_REASONS[i]
+
+    Every check runs on the dictionary codes: per-value checks (dates, names, memo
+    codes, file numbers) test each distinct value once and are gathered by code.
+    """
+    arrays = columns.arrays()
+    size = len(columns)
+    codes = np.zeros(size, dtype=np.int8)
+
+    def reject(mask, reason):
+        codes[(codes == 0) & mask] = REJECT_REASONS.index(reason) + 1
+
+    def by_code(field, check):
+        """check applied to the field's distinct values (missing fails), gathered per record"""
+        value_codes, values = contribution_dictionary(columns, field, arrays)
+        passed = np.zeros(len(values), dtype=bool)
+        passed[1:] = check(values[1:]).to_numpy(dtype=bool)
+        return passed[value_codes]
+
+    # Schema and types
+    amounts = arrays[CONTRIBUTION_AMOUNT_FIELD]
+    reject(~np.isfinite(amounts), "invalid_amount")
+    reject(~by_code("contribution_receipt_date", lambda dates: pd.to_datetime(
+        dates.str.slice(0, 10), format="%Y-%m-%d", errors="coerce").notna()), "invalid_date")
+    reject(~by_code("contributor_name", lambda names: names.str.strip().ne("")), "missing_contributor")
+
+    # Amended filings repeat a transaction id and the latest filing's version supersedes the
+    # rest, even when that version is itself a memo or refund rejected below, so the join runs
+    # over every row with a transaction id. Only committees with more than one filing in the
+    # batch need it.
+    committees = contribution_codes(columns, "committee_id", arrays)
+    file_codes, file_numbers = contribution_dictionary(columns, "file_number", arrays)
+    files = pd.to_numeric(file_numbers, errors="coerce").fillna(-1).to_numpy()[file_codes]
+    filing_range = pd.Series(files).groupby(committees).agg(["min", "max"])
+    amended = filing_range.index[(filing_range["min"] < filing_range["max"]).to_numpy()]
+    transactions = contribution_codes(columns, "transaction_id", arrays)
+    candidates = np.flatnonzero(np.isin(committees, amended) & (transactions > 0))
+    superseded = rows_mask(size, candidates[superseded_rows(committees[candidates], transactions[candidates], files[candidates])])
+
+    # Refunds carry negative amounts; memo entries itemize money reported on another line
+    reject(amounts < 0, "refund")
+    reject(by_code("memo_code", lambda memos: memos.isin(["X", "x"])), "memo")
+    reject(superseded, "superseded")
+
+    # Repeated transactions, by FEC sub_id
+    sub_ids = contribution_codes(columns, "sub_id", arrays)
+    remaining = np.flatnonzero((codes == 0) & (sub_ids > 0))
+    repeated = pd.Series(sub_ids[remaining]).duplicated(keep="first").to_numpy()
+    reject(rows_mask(size, remaining[repeated]), "duplicate")
+    return codes, amounts
+
+def validate_contributions(records):
+    """Split contribution records into those fit for analysis and a summary of the rest
+
+    Takes a list of records or a ContributionColumns and returns the same kind; kept
+    columns drop the filing fields, which only validation needs.
+    """
+    if not len(records):
+        return records, {}
+    columnar = isinstance(records, ContributionColumns)
+    columns = records if columnar else ContributionColumns.encode(
+        records, compression="", fields=["contributor_name", "contribution_receipt_date", "committee_id", "sub_id"] + CONTRIBUTION_FILING_FIELDS
+    )
+    codes, amounts = contribution_reject_codes(columns)
+    counts = np.bincount(codes, minlength=len(REJECT_REASONS) + 1)
+    totals = np.bincount(codes, weights=np.nan_to_num(amounts), minlength=len(REJECT_REASONS) + 1)
+    rejects = {
+        reason: {"count": int(counts[i + 1]), "amount": float(totals[i + 1])}
+        for i, reason in enumerate(REJECT_REASONS)
+        if counts[i + 1]
+    }
+    if columnar:
+        kept = [field for field in records.fields if field not in CONTRIBUTION_FILING_FIELDS]
+        return records.select(codes == 0, kept), rejects
+    return list(itertools.compress(records, codes == 0)), rejects
+
+def with_validated_contributions(contributions_data):
+    """Drop invalid, refunded, memo, superseded and duplicate records from a contribution fetch result"""
+    if contributions_data.get("status") != "success" or "rejects" in contributions_data:
+        return contributions_data
+    results, rejects = validate_contributions(contributions_data.get("results", []))
+    return dict(contributions_data, results=results, rejects=rejects)
+
+# Streaming donor sketches
+def bit_length64(values):
+    """Bit length of each uint64, exact (float64 only sees 32-bit halves)"""
+    high = np.frexp((values >> np.uint64(32)).astype(np.float64))[1]
+    low = np.frexp((values & np.uint64(0xFFFFFFFF)).astype(np.float64))[1]
+    return np.where(high > 0, high + 32, low)
+
+def donor_hashes(keys):
+    """64-bit hashes of donor keys, stable across processes"""
+    return np.fromiter(
+        (int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little") for key in keys),
+        dtype=np.uint64, count=len(keys)
+    )
+
+class HyperLogLog:
+    """Distinct-count sketch; merging two sketches counts the union of their items"""
+
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add_hashes(self, hashes):
+        if len(hashes) == 0:
+            return
+        p = self.precision
+        buckets = (hashes >> np.uint64(64 - p)).astype(np.int64)
+        rest = hashes & np.uint64((1 << (64 - p)) - 1)
+        ranks = (64 - p) - bit_length64(rest) + 1
+        np.maximum.at(self.registers, buckets, ranks.astype(np.uint8))
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is more accurate while most registers are empty
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+class KLLSketch:
+    """Mergeable quantile sketch: compactors that halve sorted items level by level
+
+    An item at level h stands for 2^h original items. Lower levels get geometrically
+    smaller capacities, so the sketch holds O(k) items however many it has seen.
+    """
+
+    def __init__(self, k=KLL_K, seed=0):
+        self.k = k
+        self.n = 0
+        self.max = float("-inf")
+        self.levels = [np.empty(0)]
+        self.rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        # Compact lazily: only once the sketch as a whole is over capacity, starting at the lowest full level
+        while sum(len(items) for items in self.levels) > sum(self._capacity(h) for h in range(len(self.levels))):
+            level = next(h for h, items in enumerate(self.levels) if len(items) >= self._capacity(h))
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            items = np.sort(self.levels[level])
+            # An odd item out stays behind; the rest promote every other item at a random offset
+            keep = len(items) % 2
+            self.levels[level] = items[:keep]
+            offset = keep + int(self.rng.integers(2))
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], items[offset::2]])
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return
+        self.n += len(values)
+        self.max = max(self.max, float(values.max()))
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other):
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def quantiles(self, qs):
+        """Approximate values at each quantile in qs, or zeros for an empty sketch"""
+        if self.n == 0:
+            return [0.0 for _ in qs]
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2.0 ** level) for level, items in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        cumulative = np.cumsum(weights[order])
+        ranks = np.searchsorted(cumulative, np.asarray(qs) * cumulative[-1], side="left")
+        return items[order][np.minimum(ranks, len(items) - 1)].tolist()
+
+class ContributionSketches:
+    """Distinct donors, contribution size quantiles and totals per donor policy area
+
+    Built when contributions are fetched, from the records that pass validation, so
+    the Campaign Finance tab can query them without rescanning the records.
+    """
+
+    def __init__(self):
+        self.areas = ["all"] + POLICY_AREA_KEYS + ["other"]
+        self.donors = {area: HyperLogLog() for area in self.areas}
+        self.amounts = {area: KLLSketch(seed=i) for i, area in enumerate(self.areas)}
+        self.totals = {area: 0.0 for area in self.areas}
+
+    def ingest(self, contributions):
+        """Classify a batch of contributions and add them to every matching area's sketches
+
+        Each distinct donor is classified and hashed once; records then take their
+        donor's hash and area shares, and each area's sketches are fed in one call.
+        """
+        if not len(contributions):
+            return
+        fields = contribution_fields(contributions, ["contributor_name", "contributor_employer", CONTRIBUTION_AMOUNT_FIELD])
+        donor_codes, donors = distinct_donors(fields["contributor_name"], fields["contributor_employer"])
+        hashes = donor_hashes([
+            f"{(name or '').strip().upper()}|{(employer or '').strip().upper()}" for name, employer in donors
+        ])[donor_codes]
+        interests = [
+            map_donor_interests_to_policy({"contributor_name": name, "contributor_employer": employer})
+            for name, employer in donors
+        ]
+        # Totals split each amount equally across interests, as in donor_area_totals
+        shares = donor_area_shares(interests)[donor_codes]
+        amounts = fields[CONTRIBUTION_AMOUNT_FIELD]
+
+        self.donors["all"].add_hashes(hashes)
+        self.amounts["all"].update(amounts)
+        self.totals["all"] += float(amounts.sum())
+        for column, area in enumerate(POLICY_AREA_KEYS + ["other"]):
+            rows = shares[:, column] > 0
+            if rows.any():
+                self.donors[area].add_hashes(hashes[rows])
+                self.amounts[area].update(amounts[rows])
+                self.totals[area] += float(shares[rows, column] @ amounts[rows])
+
+    def merge(self, other):
+        for area in self.areas:
+            self.donors[area].merge(other.donors[area])
+            self.amounts[area].merge(other.amounts[area])
+            self.totals[area] += other.totals[area]
+        return self
+
+    def area_totals(self):
+        """Contribution totals by donor policy area, in the donor_area_totals shape"""
+        return {area: self.totals[area] for area in POLICY_AREA_KEYS + ["other"]}
+
+    def outlier_threshold(self, area="all"):
+        """Contribution size above which an amount is unusually large for this area"""
+        q1, q3 = self.amounts[area].quantiles([0.25, 0.75])
+        return q3 + OUTLIER_IQR_MULTIPLIER * (q3 - q1)
+
+    def summary(self):
+        """Per-area donor counts and contribution size quantiles, for areas with any contributions"""
+        rows = []
+        for area in self.areas:
+            sketch = self.amounts[area]
+            if sketch.n == 0:
+                continue
+            median, p95, p99 = sketch.quantiles([0.5, 0.95, 0.99])
+            threshold = self.outlier_threshold(area)
+            rows.append({
+                "area": area,
+                "distinct_donors": self.donors[area].count(),
+                "contributions": sketch.n,
+                "median": median,
+                "p95": p95,
+                "p99": p99,
+                "largest": sketch.max,
+                "outlier_threshold": threshold,
+                "has_outliers": sketch.max > threshold
+            })
+        return rows
+
+def with_contribution_sketches(contributions_data):
+    """Attach donor sketches to a contribution fetch result unless ingestion already built them"""
+    if contributions_data.get("status") != "success" or "sketches" in contributions_data:
+        return contributions_data
+    sketches = ContributionSketches()
+    sketches.ingest(contributions_data.get("results", []))
+    return dict(contributions_data, sketches=sketches)
+
+# Columnar contribution payloads
+# Layout: magic, compression flag, header length, header JSON, then the body holding each
+# array on an 8-byte boundary; with compression the whole body is zlib-compressed.
+PAYLOAD_MAGIC = b"RESISTCOLS"
+PAYLOAD_ALIGNMENT = 8
+CONTRIBUTION_TEXT_FIELDS = ["contributor_name", "contributor_employer", "contributor_state", "contributor_zip",
+                            "contribution_receipt_date", "committee_id", "sub_id"]
+CONTRIBUTION_AMOUNT_FIELD = "contribution_receipt_amount"
+CONTRIBUTION_FILING_FIELDS = ["memo_code", "transaction_id", "file_number"]  # Only needed to validate records
+
+class ContributionColumns:
+    """Contribution records packed into one buffer of dictionary-encoded columns
+
+    Cached in place of a list of dicts. Each text field stores its distinct values
+    once plus a small integer code per record (0 for missing), amounts are float64,
+    and fields the app doesn't use are dropped. Columns decode as NumPy views into
+    the buffer; records are only built as dicts when the object is iterated.
+    """
+
+    def __init__(self, payload):
+        self.payload = payload
+        if payload[:len(PAYLOAD_MAGIC)] != PAYLOAD_MAGIC:
+            raise ValueError("Not a contribution payload")
+        self.compressed, header_length = struct.unpack_from("<BI", payload, len(PAYLOAD_MAGIC))
+        header_start = len(PAYLOAD_MAGIC) + struct.calcsize("<BI")
+        self.header = json.loads(payload[header_start:header_start + header_length])
+        self.body_start = header_start + header_length
+        self.rows = self.header["rows"]
+
+    @classmethod
+    def encode(cls, records, compression=CACHE_PAYLOAD_COMPRESSION, fields=CONTRIBUTION_TEXT_FIELDS + CONTRIBUTION_FILING_FIELDS):
+        """Pack contribution records, optionally zlib-compressing the column data
+
+        Filing fields are kept by default so validation can run on the codes; validation
+        drops them again from the records it keeps.
+        """
+        def values_of(field):
+            try:
+                # One C-level pass when every record has the field
+                return pd.Series(list(map(operator.itemgetter(field), records)), dtype=object)
+            except KeyError:
+                return pd.Series([c.get(field) for c in records], dtype=object)
+
+        amounts = pd.to_numeric(values_of(CONTRIBUTION_AMOUNT_FIELD), errors="coerce")
+        arrays = {CONTRIBUTION_AMOUNT_FIELD: amounts.to_numpy(dtype=np.float64, na_value=np.nan)}
+        for field in fields:
+            # Codes follow first appearance; missing values get code 0
+            codes, values = pd.factorize(values_of(field))
+            offsets, blob = encode_strings([str(value) for value in values])
+            arrays[f"{field}.codes"] = (codes + 1).astype(np.min_scalar_type(len(values)))
+            arrays[f"{field}.offsets"] = offsets
+            arrays[f"{field}.blob"] = blob
+        return cls.pack(arrays, len(records), compression)
+
+    @classmethod
+    def pack(cls, arrays, rows, compression=CACHE_PAYLOAD_COMPRESSION):
+        """Lay encoded arrays out in one payload"""
+        layout = {}
+        chunks = []
+        position = 0
+        for name, array in arrays.items():
+            padding = -position % PAYLOAD_ALIGNMENT
+            chunks.append(b"\0" * padding)
+            position += padding
+            layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": position}
+            chunks.append(array.tobytes())
+            position += array.nbytes
+
+        body = b"".join(chunks)
+        if compression == "zlib":
+            body = zlib.compress(body, 1)
+        header = json.dumps({"rows": rows, "arrays": layout}).encode("utf-8")
+        return cls(PAYLOAD_MAGIC + struct.pack("<BI", compression == "zlib", len(header)) + header + body)
+
+    @property
+    def fields(self):
+        """Text fields held in the payload, in encoding order"""
+        return [name[:-len(".codes")] for name in self.header["arrays"] if name.endswith(".codes")]
+
+    def select(self, rows, fields=None):
+        """The records at rows (a boolean mask or positions), keeping only the given text fields
+
+        Dictionaries are carried over as they are, so values only the dropped records
+        used stay in the payload.
+        """
+        arrays = self.arrays()
+        selected = {CONTRIBUTION_AMOUNT_FIELD: arrays[CONTRIBUTION_AMOUNT_FIELD][rows]}
+        for field in fields or self.fields:
+            selected[f"{field}.codes"] = arrays[f"{field}.codes"][rows]
+            selected[f"{field}.offsets"] = arrays[f"{field}.offsets"]
+            selected[f"{field}.blob"] = arrays[f"{field}.blob"]
+        return self.pack(selected, len(selected[CONTRIBUTION_AMOUNT_FIELD]), "zlib" if self.compressed else "")
+
+    def arrays(self):
+        """The encoded arrays, as views into the payload (or one decompressed copy of it)"""
+        body = memoryview(self.payload)[self.body_start:]
+        if self.compressed:
+            body = zlib.decompress(body)
+        return {
+            name: np.frombuffer(body, dtype=np.dtype(info["dtype"]), count=int(np.prod(info["shape"])),
+                                offset=info["offset"]).reshape(info["shape"])
+            for name, info in self.header["arrays"].items()
+        }
+
+    def dictionary(self, field, arrays=None):
+        """A text field's codes and its distinct values, indexed by code (None at code 0)"""
+        arrays = arrays or self.arrays()
+        bounds, blob = arrays[f"{field}.offsets"].tolist(), arrays[f"{field}.blob"].tobytes()
+        values = np.empty(len(bounds), dtype=object)
+        values[1:] = [blob[start:end].decode("utf-8") for start, end in zip(bounds, bounds[1:])]
+        return arrays[f"{field}.codes"], values
+
+    def columns(self, fields=None):
+        """Decoded columns by field: float64 amounts and object arrays of strings (None when missing)"""
+        arrays = self.arrays()
+        fields = fields or [CONTRIBUTION_AMOUNT_FIELD] + self.fields
+        columns = {}
+        for field in fields:
+            if field == CONTRIBUTION_AMOUNT_FIELD:
+                columns[field] = arrays[field]
+                continue
+            # Decode each distinct value once, then gather by code
+            codes, values = self.dictionary(field, arrays)
+            columns[field] = values[codes]
+        return columns
+
+    def frame(self, fields=None):
+        """The records as a DataFrame with one column per field"""
+        return pd.DataFrame(self.columns(fields))
+
+    def __len__(self):
+        return self.rows
+
+    def __iter__(self):
+        columns = self.columns()
+        amounts = columns.pop(CONTRIBUTION_AMOUNT_FIELD)
+        for i in range(self.rows):
+            record = {field: values[i] for field, values in columns.items()}
+            record[CONTRIBUTION_AMOUNT_FIELD] = None if np.isnan(amounts[i]) else float(amounts[i])
+            yield record
+
+    def __getitem__(self, position):
+        """One record, decoding only its own values; slices decode every column"""
+        if isinstance(position, slice):
+            return list(self)[position]
+        position = range(self.rows)[position]
+        arrays = self.arrays()
+        record = {}
+        for field in self.fields:
+            code = int(arrays[f"{field}.codes"][position])
+            record[field] = decode_string(arrays[f"{field}.offsets"], arrays[f"{field}.blob"], code - 1) if code else None
+        amount = float(arrays[CONTRIBUTION_AMOUNT_FIELD][position])
+        record[CONTRIBUTION_AMOUNT_FIELD] = None if np.isnan(amount) else amount
+        return record
+
+    def __sizeof__(self):
+        return object.__sizeof__(self) + sys.getsizeof(self.payload) + sys.getsizeof(self.header)
+
+def contribution_fields(records, fields):
+    """Fields of a contribution list or ContributionColumns as NumPy arrays, by field"""
+    if isinstance(records, ContributionColumns):
+        columns = records.columns(fields)
+        if CONTRIBUTION_AMOUNT_FIELD in columns:
+            # Missing amounts count as 0, as for record lists
+            columns[CONTRIBUTION_AMOUNT_FIELD] = np.nan_to_num(columns[CONTRIBUTION_AMOUNT_FIELD])
+        return columns
+    return {
+        field: np.array([c.get(field) or 0 for c in records], dtype=np.float64)
+        if field == CONTRIBUTION_AMOUNT_FIELD else np.array([c.get(field) for c in records], dtype=object)
+        for field in fields
+    }
+
+def with_columnar_contributions(contributions_data):
+    """Replace a contribution fetch result's records with their columnar encoding for caching"""
+    if contributions_data.get("status") != "success" or isinstance(contributions_data.get("results"), ContributionColumns):
+        return contributions_data
+    return dict(contributions_data, results=ContributionColumns.encode(contributions_data.get("results", [])))
+
+# Vectorized scoring
+# Votes are stored as int8 codes in a members x bills matrix. Any recorded vote other
+# than yes/no (e.g. "present") still counts towards the total, as in analyze_voting_pattern.
+VOTE_NONE = 0
+VOTE_CODES = {"yes": 1, "no": 2}
+VOTE_OTHER = 3
+
+def bill_alignment_arrays(bills):
+    """Encode bill alignments as signs and policy areas as a bills x areas indicator matrix"""
+    signs = np.zeros(len(bills), dtype=np.int8)
+    category_matrix = np.zeros((len(bills), len(POLICY_AREA_KEYS)), dtype=np.int32)
+    area_index = {area: i for i, area in enumerate(POLICY_AREA_KEYS)}
+
+    for i, bill in enumerate(bills):
+        if bill["policy_alignment"] == "conservative":
+            signs[i] = 1
+        elif bill["policy_alignment"] == "progressive":
+            signs[i] = -1
+        for category in bill["categories"]:
+            if category in area_index:
+                category_matrix[i, area_index[category]] += 1
+
+    return signs, category_matrix
+
+def build_vote_matrix(member_votes, dataset):
+    """Build a members x bills matrix of vote codes from per-member vote dicts"""
+    bill_index = dataset.bill_index
+    member_ids = list(member_votes.keys())
+    matrix = np.zeros((len(member_ids), len(dataset)), dtype=np.int8)
+
+    for row, member_id in enumerate(member_ids):
+        for bill_id, vote in member_votes[member_id].items():
+            col = bill_index.get(bill_id)
+            if col is not None:
+                matrix[row, col] = VOTE_CODES.get(vote, VOTE_OTHER)
+
+    return member_ids, matrix
+
+def conservative_vote_mask(matrix, signs):
+    """Mark votes that align with the conservative position on each bill"""
+    return ((signs == 1) & (matrix == VOTE_CODES["yes"])) | \
+           ((signs == -1) & (matrix == VOTE_CODES["no"]))
+
+def score_vote_matrix(matrix, dataset):
+    """Score every member in a vote matrix at once"""
+    signs, category_matrix = dataset.alignment_arrays
+
+    voted = matrix != VOTE_NONE
+    conservative = conservative_vote_mask(matrix, signs)
+
+    total_votes = voted.sum(axis=1)
+    conservative_votes = conservative.sum(axis=1)
+    category_total = voted.astype(np.int32) @ category_matrix
+    category_conservative = conservative.astype(np.int32) @ category_matrix
+
+    overall = np.divide(conservative_votes * 100.0, total_votes,
+                        out=np.zeros(len(matrix)), where=total_votes > 0)
+    category_scores = np.divide(category_conservative * 100.0, category_total,
+                                out=np.zeros(category_total.shape), where=category_total > 0)
+
+    return {
+        "total_votes": total_votes,
+        "conservative_votes": conservative_votes,
+        "overall": overall,
+        "category_total": category_total,
+        "category_conservative": category_conservative,
+        "category_scores": category_scores
+    }
+
+def bootstrap_alignment_intervals(matrix, dataset, replicates=BOOTSTRAP_REPLICATES,
+                                  confidence=BOOTSTRAP_CONFIDENCE, seed=0):
+    """Percentile bootstrap intervals for every member's overall and per-area alignment"""
+    signs, category_matrix = dataset.alignment_arrays
+    voted = (matrix != VOTE_NONE).astype(np.float32)
+    conservative = conservative_vote_mask(matrix, signs).astype(np.float32)
+    rng = np.random.default_rng(seed)
+    tail = (1 - confidence) / 2 * 100
+
+    # Column 0 resamples every roll call, the rest resample the roll calls in one policy area
+    columns = [np.arange(len(dataset))] + [np.flatnonzero(category_matrix[:, i]) for i in range(len(POLICY_AREA_KEYS))]
+    low = np.zeros((len(matrix), len(columns)))
+    high = np.zeros((len(matrix), len(columns)))
+
+    for col, bill_rows in enumerate(columns):
+        n = len(bill_rows)
+        if n == 0:
+            continue
+
+        # One row of resampled roll-call indices per replicate, turned into per-bill draw counts
+        draws = rng.integers(0, n, size=(replicates, n))
+        offsets = (draws + n * np.arange(replicates)[:, None]).ravel()
+        counts = np.bincount(offsets, minlength=replicates * n).reshape(replicates, n).astype(np.float32)
+
+        # Resampled totals for all members at once: (members x bills) @ (bills x replicates)
+        totals = voted[:, bill_rows] @ counts.T
+        aligned = conservative[:, bill_rows] @ counts.T
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rates = aligned.astype(np.float64) / totals * 100
+
+        # Members with no votes in the area keep the 0-0 band their score reports
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            bounds = np.nanpercentile(rates, [tail, 100 - tail], axis=1)
+        low[:, col] = np.nan_to_num(bounds[0])
+        high[:, col] = np.nan_to_num(bounds[1])
+
+    return {"areas": ["overall"] + POLICY_AREA_KEYS, "low": low, "high": high}
+
+def dataset_version(dataset, member_votes):
+    """Fingerprint the bills and vote records an analysis is computed from"""
+    return fingerprint_data({"bills": dataset.version, "votes": member_votes})[:16]
+
+@st.cache_resource
+def get_interval_cache():
+    """Bootstrap intervals by dataset version, shared across sessions"""
+    return {"intervals": OrderedDict(), "lock": threading.Lock()}
+
+def alignment_intervals_for(version, matrix, dataset):
+    """Bootstrap intervals for a dataset version, computed once per version"""
+    cache = get_interval_cache()
+    with cache["lock"]:
+        intervals = cache["intervals"].get(version)
+        if intervals is None:
+            intervals = bootstrap_alignment_intervals(matrix, dataset, seed=int(version, 16))
+            cache["intervals"][version] = intervals
+            # Older dataset versions are only needed until every session has moved on
+            while len(cache["intervals"]) > 4:
+                cache["intervals"].popitem(last=False)
+    return intervals
+
+def fetch_comparison_data(candidates):
+    """Fetch votes and contributions for several candidates concurrently"""
+    ctx = get_script_run_ctx()
+
+    def with_context(fetch, key):
+        # Let worker threads use the session's caches without missing-context warnings
+        if ctx is not None:
+            add_script_run_ctx(threading.current_thread(), ctx)
+        return fetch(key)
+
+    workers = max(1, min(COMPARISON_FETCH_WORKERS, 2 * len(candidates)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # Each task runs in a copy of this context so it keeps the caller's request priority
+        vote_futures = {
+            c["bioguide_id"]: pool.submit(contextvars.copy_context().run, with_context, fetch_member_votes,
+                                          c["bioguide_id"])
+            for c in candidates
+        }
+        contribution_futures = {
+            c["candidate_id"]: pool.submit(contextvars.copy_context().run, with_context, fetch_candidate_contributions,
+                                           c["candidate_id"])
+            for c in candidates
+        }
+        votes = {member_id: future.result() for member_id, future in vote_futures.items()}
+        contributions = {cand_id: future.result() for cand_id, future in contribution_futures.items()}
+
+    return votes, contributions
+
+def compare_members(candidates, dataset):
+    """Score candidates side by side with one vectorized pass over their votes"""
+    votes, contributions = fetch_comparison_data(candidates)
+
+    member_votes = {
+        c["bioguide_id"]: votes[c["bioguide_id"]]["votes"]
+        for c in candidates
+        if votes[c["bioguide_id"]]["status"] == "success"
+    }
+    member_ids, matrix = build_vote_matrix(member_votes, dataset)
+    scores = score_vote_matrix(matrix, dataset)
+    row_of = {member_id: i for i, member_id in enumerate(member_ids)}
+
+    rows = []
+    radar = []
+    for candidate in candidates:
+        row = row_of.get(candidate["bioguide_id"])
+        if row is None:
+            continue
+
+        category_scores = dict(zip(POLICY_AREA_KEYS, scores["category_scores"][row].round(1).tolist()))
+        snapshot = get_snapshot()
+        donor_totals = snapshot.donor_area_totals(candidate["candidate_id"]) if snapshot is not None else None
+        if donor_totals is None:
+            donor_totals = donor_area_totals(contributions[candidate["candidate_id"]].get("results", []))
+
+        record = {
+            "Name": candidate["name"],
+            "Party": candidate["party"],
+            "State": candidate["state"],
+            "Overall Alignment": round(float(scores["overall"][row]), 1)
+        }
+        record.update({f"{area.capitalize()} Alignment": score for area, score in category_scores.items()})
+        record["Total Donations"] = sum(donor_totals.values())
+        record.update({f"{area.capitalize()} Donations": amount for area, amount in donor_totals.items()})
+        rows.append(record)
+        radar.append({"name": candidate["name"], "scores": category_scores})
+
+    return {"table": rows, "radar": radar}
+
+# Score index for range filters and leaderboards
+class ScoreIndex:
+    """Sorted per-area alignment scores answering range and top-k queries"""
+
+    def __init__(self, member_ids, scores, intervals=None, version=None):
+        self.version = version
+        self.member_ids = np.array(member_ids, dtype=object)
+        self.rows = {member_id: i for i, member_id in enumerate(member_ids)}
+        self.columns = {"overall": scores["overall"]}
+        for i, area in enumerate(POLICY_AREA_KEYS):
+            self.columns[area] = scores["category_scores"][:, i]
+        self.intervals = intervals
+
+        # Votes behind each score, when known; a score over no votes reads as 0
+        self.vote_counts = None
+        if "category_total" in scores:
+            self.vote_counts = {"overall": scores["total_votes"]}
+            for i, area in enumerate(POLICY_AREA_KEYS):
+                self.vote_counts[area] = scores["category_total"][:, i]
+
+        # Keep each column sorted alongside the member rows it came from
+        self.order = {}
+        self.sorted_scores = {}
+        for area, values in self.columns.items():
+            order = np.argsort(values, kind="stable")
+            self.order[area] = order
+            self.sorted_scores[area] = values[order].tolist()
+
+    def interval(self, member_id, area="overall"):
+        """Bootstrap confidence interval of a member's score, if computed"""
+        row = self.rows.get(member_id)
+        if row is None or self.intervals is None:
+            return None
+        col = self.intervals["areas"].index(area)
+        return float(self.intervals["low"][row, col]), float(self.intervals["high"][row, col])
+
+    def range(self, area, low, high):
+        """Member IDs whose score in an area lies within [low, high]"""
+        values = self.sorted_scores[area]
+        start = bisect.bisect_left(values, low)
+        stop = bisect.bisect_right(values, high)
+        return set(self.member_ids[self.order[area][start:stop]])
+
+    def top_k(self, area, k, most_aligned=True):
+        """The k most (or least) conservative-aligned members in an area, best first"""
+        values = self.columns[area] if most_aligned else -self.columns[area]
+        k = min(k, len(values))
+        if k <= 0:
+            return []
+        rows = np.argpartition(-values, k - 1)[:k]
+        rows = rows[np.argsort(-values[rows], kind="stable")]
+        return [(self.member_ids[row], float(self.columns[area][row])) for row in rows]
+
+def fetch_all_member_votes(congress_number=SAMPLE_CONGRESS):
+    """Fetch voting records in a Congress for every member that has one"""
+    member_votes = {}
+    for member in fetch_member_data()["results"]:
+        votes_data = fetch_member_votes(member["bioguide_id"], congress_number)
+        if votes_data["status"] == "success":
+            member_votes[member["bioguide_id"]] = votes_data["votes"]
+    return member_votes
+
+@st.cache_resource(ttl=CACHE_TTL)
+def get_score_index(congress_number=118):
+    """Precompute alignment scores for every member and index them by area"""
+    snapshot = get_snapshot()
+    if snapshot is not None and snapshot.congress_number == congress_number:
+        return snapshot.score_index()
+
+    dataset = fetch_dataset(congress_number)
+    member_votes = fetch_all_member_votes(congress_number)
+    member_ids, matrix = build_vote_matrix(member_votes, dataset)
+    version = dataset_version(dataset, member_votes)
+    intervals = alignment_intervals_for(version, matrix, dataset)
+    return ScoreIndex(member_ids, score_vote_matrix(matrix, dataset), intervals, version)
+
+# Contributor geography
+def zip5_codes(values):
+    """Five-digit ZIP codes as integers, -1 where a value has no usable ZIP"""
+    digits = pd.Series(values, dtype="string").str.replace(r"\D", "", regex=True).str[:5]
+    codes = pd.to_numeric(digits.where(digits.str.len() == 5), errors="coerce")
+    return codes.fillna(-1).to_numpy(dtype=np.int32)
+
+def district_number(value):
+    """Congressional district as an integer: 0 for an at-large seat, -1 when there is none"""
+    text = str(value or "").strip().upper()
+    if text.isdigit():
+        return int(text)
+    return 0 if text in ("AL", "AT-LARGE", "AT LARGE") else -1
+
+class ZipLookup:
+    """ZIP -> state, county and congressional district crosswalk held as sorted arrays
+
+    Columns have one extra trailing row for unknown ZIPs, so lookups can gather from
+    them without masking.
+    """
+
+    def __init__(self, rows):
+        rows = sorted(rows, key=lambda row: row[0])
+        self.zips = np.array([int(row[0]) for row in rows], dtype=np.int32)
+        self.state = np.array([row[1] for row in rows] + [""], dtype="U2")
+        self.county = np.array([row[2] for row in rows] + [""], dtype="U5")
+        self.district = np.array([row[4] for row in rows] + [-1], dtype=np.int16)
+        self.county_names = {row[2]: f"{row[3]}, {row[1]}" for row in rows}
+
+    @classmethod
+    def from_csv(cls, path):
+        """Load a crosswalk CSV, keeping each ZIP's row with the largest address ratio"""
+        table = pd.read_csv(path, dtype=str).fillna("")
+        if "ratio" in table:
+            table["ratio"] = pd.to_numeric(table["ratio"], errors="coerce").fillna(0)
+            table = table.sort_values("ratio", ascending=False, kind="stable")
+        table = table.drop_duplicates("zip")
+        return cls(zip(
+            table["zip"].str.zfill(5), table["state"].str.upper(), table["county_fips"].str.zfill(5),
+            table["county_name"], table["district"].map(district_number)
+        ))
+
+    def lookup(self, zips):
+        """Crosswalk row of each ZIP code; unknown ZIPs get the trailing empty row"""
+        rows = np.searchsorted(self.zips, zips)
+        known = rows < len(self.zips)
+        known[known] = self.zips[rows[known]] == zips[known]
+        return np.where(known, rows, len(self.zips))
+
+@st.cache_resource
+def get_zip_lookup():
+    """The configured ZIP crosswalk, or the sample table"""
+    if ZIP_LOOKUP_PATH and os.path.exists(ZIP_LOOKUP_PATH):
+        return ZipLookup.from_csv(ZIP_LOOKUP_PATH)
+    return ZipLookup(SAMPLE_ZIP_LOOKUP)
+
+def group_totals(member_rows, keys, amounts):
+    """Totals per (member, key) pair as parallel arrays, by member then largest total first"""
+    labels, key_codes = np.unique(keys, return_inverse=True)
+    pairs, pair_codes = np.unique(member_rows.astype(np.int64) * max(1, len(labels)) + key_codes, return_inverse=True)
+    totals = np.bincount(pair_codes, weights=amounts, minlength=len(pairs))
+    rows = pairs // max(1, len(labels))
+    order = np.lexsort((-totals, rows))
+    return rows[order], labels[pairs % max(1, len(labels))][order], totals[order]
+
+class DonorGeography:
+    """In-state, in-district and per-state/county contribution totals for every member
+
+    Built in one vectorized pass: all members' contributions are flattened into
+    columns, ZIPs are joined to the crosswalk by binary search and totals are
+    grouped with bincount. A member whose contributions are None counts as having
+    none and is listed in `missing`.
+    """
+
+    def __init__(self, members, member_contributions, zip_lookup):
+        self.members = members
+        # Members with an FEC candidate whose contributions could not be fetched
+        self.missing = sorted(member_id for member_id, records in member_contributions.items() if records is None)
+        member_contributions = {member_id: records or [] for member_id, records in member_contributions.items()}
+        self.member_ids = list(member_contributions)
+        self.rows = {member_id: i for i, member_id in enumerate(self.member_ids)}
+        self.county_names = zip_lookup.county_names
+        member_rows = np.repeat(
+            np.arange(len(self.member_ids)),
+            [len(member_contributions[member_id]) for member_id in self.member_ids]
+        )
+
+        fields = [CONTRIBUTION_AMOUNT_FIELD, "contributor_state", "contributor_zip"]
+        member_fields = [contribution_fields(member_contributions[member_id], fields) for member_id in self.member_ids]
+        column = {
+            field: np.concatenate([np.empty(0, dtype=object)] + [values[field] for values in member_fields])
+            for field in fields
+        }
+
+        amounts = np.nan_to_num(column[CONTRIBUTION_AMOUNT_FIELD].astype(np.float64))
+        states = pd.Series(column["contributor_state"], dtype=object).fillna("").str.strip().str.upper().to_numpy(dtype="U2")
+
+        # Join ZIPs to the crosswalk, which also fills in any missing contributor state
+        matches = zip_lookup.lookup(zip5_codes(column["contributor_zip"]))
+        states = np.where(states == "", zip_lookup.state[matches], states)
+        counties = zip_lookup.county[matches]
+        districts = zip_lookup.district[matches]
+
+        member_states = np.array([members.get(m, {}).get("state", "") for m in self.member_ids], dtype="U2")
+        member_districts = np.array([district_number(members.get(m, {}).get("district")) for m in self.member_ids],
+                                    dtype=np.int16)
+        located = states != ""
+        in_state = located & (states == member_states[member_rows])
+        in_district = in_state & (member_districts[member_rows] >= 0) & (districts == member_districts[member_rows])
+
+        count = len(self.member_ids)
+        self.total = np.bincount(member_rows, weights=amounts, minlength=count)
+        self.in_state = np.bincount(member_rows, weights=amounts * in_state, minlength=count)
+        self.in_district = np.bincount(member_rows, weights=amounts * in_district, minlength=count)
+        self.unknown = np.bincount(member_rows, weights=amounts * ~located, minlength=count)
+        self.has_district = member_districts >= 0
+        self.by_state = group_totals(member_rows, states, amounts)
+        self.by_county = group_totals(member_rows, counties, amounts)
+
+    def shares(self):
+        """In-state, in-district and out-of-state percentages of each member's total"""
+        total = np.where(self.total > 0, self.total, 1.0)
+        return {
+            "in_state": 100 * self.in_state / total,
+            "in_district": 100 * self.in_district / total,
+            "out_of_state": 100 * (self.total - self.in_state - self.unknown) / total
+        }
+
+    @staticmethod
+    def member_groups(groups, row):
+        """(label, total) pairs of one member from group_totals output"""
+        rows, labels, totals = groups
+        start, stop = np.searchsorted(rows, row, side="left"), np.searchsorted(rows, row, side="right")
+        return list(zip(labels[start:stop].tolist(), totals[start:stop].tolist()))
+
+    def member(self, member_id):
+        """Geographic breakdown of one member's contributions, or None if they have none"""
+        row = self.rows.get(member_id)
+        if row is None or self.total[row] <= 0:
+            return None
+        shares = self.shares()
+        return {
+            "total": float(self.total[row]),
+            "in_state": float(self.in_state[row]),
+            "in_district": float(self.in_district[row]),
+            "unknown": float(self.unknown[row]),
+            "in_state_share": float(shares["in_state"][row]),
+            "in_district_share": float(shares["in_district"][row]) if self.has_district[row] else None,
+            "out_of_state_share": float(shares["out_of_state"][row]),
+            "by_state": [[state or "Unknown", amount] for state, amount in self.member_groups(self.by_state, row)],
+            "by_county": [
+                [self.county_names.get(county, "Unknown"), amount]
+                for county, amount in self.member_groups(self.by_county, row)
+            ]
+        }
+
+    def table(self):
+        """In-state and out-of-state shares for every member with contributions"""
+        shares = self.shares()
+        return [
+            {
+                "Name": self.members.get(member_id, {}).get("name", member_id),
+                "Party": self.members.get(member_id, {}).get("party", ""),
+                "State": self.members.get(member_id, {}).get("state", ""),
+                "Total Donations": float(self.total[row]),
+                "In-State %": round(float(shares["in_state"][row]), 1),
+                "In-District %": round(float(shares["in_district"][row]), 1) if self.has_district[row] else None,
+                "Out-of-State %": round(float(shares["out_of_state"][row]), 1)
+            }
+            for member_id, row in self.rows.items()
+            if self.total[row] > 0
+        ]
+
+def fetch_all_member_contributions():
+    """Contribution records and their content version for every member with an FEC candidate
+
+    A member whose fetch failed gets None for both, so callers can tell it apart
+    from a member without contributions.
+    """
+    member_contributions = {}
+    versions = {}
+    for member in fetch_member_data()["results"]:
+        if not member.get("fec_candidate_id"):
+            continue
+        contributions_data = fetch_candidate_contributions(member["fec_candidate_id"])
+        ok = contributions_data["status"] == "success"
+        member_contributions[member["bioguide_id"]] = contributions_data["results"] if ok else None
+        versions[member["bioguide_id"]] = contributions_data.get("version") if ok else None
+    return member_contributions, versions
+
+class DonorGeographyBuilder:
+    """Keeps DonorGeography current by rebuilding it in a background thread
+
+    Fetching every member's contributions is too slow for a page view, so readers
+    get the last complete build (None until the first one finishes). A rebuild is
+    started when the last check is older than the TTL or left members missing, and
+    the geography is only recomputed when the contribution versions changed.
+    """
+
+    def __init__(self, ttl=CACHE_TTL):
+        self.ttl = ttl
+        self.geography = None
+        self.versions = None
+        self.checked_at = None
+        self.building = False
+        self._lock = threading.Lock()
+
+    def get(self):
+        """The latest geography, starting a background rebuild when it is due"""
+        with self._lock:
+            due = self.geography is None or bool(self.geography.missing) or time.monotonic() - self.checked_at >= self.ttl
+            start = due and not self.building
+            if start:
+                self.building = True
+            geography = self.geography
+        if start:
+            threading.Thread(target=self.build, name="donor-geography", daemon=True).start()
+        return geography
+
+    def build(self):
+        try:
+            with request_priority(PRIORITY_PREFETCH):
+                member_contributions, versions = fetch_all_member_contributions()
+                geography = self.geography
+                if versions != self.versions or geography is None:
+                    geography = DonorGeography(member_directory(), member_contributions, get_zip_lookup())
+            with self._lock:
+                self.geography, self.versions, self.checked_at = geography, versions, time.monotonic()
+        finally:
+            with self._lock:
+                self.building = False
+
+@st.cache_resource
+def get_donor_geography_builder():
+    """Process-wide donor geography, shared across sessions"""
+    return DonorGeographyBuilder()
+
+def get_donor_geography():
+    """Geographic contribution totals for every member, or None while the first build runs"""
+    return get_donor_geography_builder().get()
+
+# State delegation and party aggregates
+DELEGATION_GROUPINGS = {"State": ("state",), "Party": ("party",), "State and party": ("state", "party")}
+DELEGATION_CACHE_VERSIONS = 4  # Score and contribution versions whose aggregates are kept
+
+def grouped_statistics(codes, groups, values, counted):
+    """Count, mean, standard deviation, min and max of each column of values per group code
+
+    counted marks the entries that take part. Each sum is one bincount over
+    (group, column) codes, covering every group and column together.
+    """
+    columns = values.shape[1]
+    cells = (codes[:, None] * columns + np.arange(columns)).ravel()
+    weights = counted.ravel().astype(np.float64)
+    flat = values.ravel()
+
+    def total(x):
+        return np.bincount(cells, weights=x, minlength=groups * columns).reshape(groups, columns)
+
+    count = total(weights)
+    safe = np.where(count > 0, count, 1.0)
+    mean = total(flat * weights) / safe
+    variance = np.maximum(total(flat * flat * weights) / safe - mean ** 2, 0.0)
+    low = np.full(groups * columns, np.inf)
+    high = np.full(groups * columns, -np.inf)
+    np.minimum.at(low, cells[counted.ravel()], flat[counted.ravel()])
+    np.maximum.at(high, cells[counted.ravel()], flat[counted.ravel()])
+    return {"count": count.astype(np.int64), "mean": mean, "std": np.sqrt(variance),
+            "min": low.reshape(groups, columns), "max": high.reshape(groups, columns)}
+
+class DelegationAggregates:
+    """Alignment and donation aggregates per state, per party and per state delegation by party
+
+    Built from the score index and per-member donor totals in one pass: members are
+    coded by state and party once and every statistic is a bincount over those
+    codes. An area's alignment statistics only count members who voted in it. A member
+    whose donor totals are None counts as no donations and is listed in `missing`.
+    """
+
+    def __init__(self, index, members, donations):
+        self.version = index.version
+        # Members with an FEC candidate whose contributions could not be fetched
+        self.missing = sorted(member_id for member_id, totals in donations.items() if totals is None)
+        self.areas = ["overall"] + POLICY_AREA_KEYS
+        self.donation_areas = POLICY_AREA_KEYS + ["other"]
+        member_ids = index.member_ids.tolist()
+
+        scores = np.column_stack([index.columns[area] for area in self.areas]).astype(np.float64)
+        if index.vote_counts is not None:
+            counted = np.column_stack([index.vote_counts[area] for area in self.areas]) > 0
+        else:
+            counted = np.ones(scores.shape, dtype=bool)
+        donation_matrix = np.array([
+            [(donations.get(member_id) or {}).get(area, 0.0) for area in self.donation_areas]
+            for member_id in member_ids
+        ], dtype=np.float64).reshape(len(member_ids), len(self.donation_areas))
+
+        keys = {
+            field: np.array([members.get(member_id, {}).get(field) or "" for member_id in member_ids], dtype=str)
+            for field in ("state", "party")
+        }
+        self.groups = {}
+        for grouping, fields in DELEGATION_GROUPINGS.items():
+            # Combine the per-field codes into one code per member, then renumber densely
+            combined = np.zeros(len(member_ids), dtype=np.int64)
+            field_labels = []
+            for field in fields:
+                labels, codes = np.unique(keys[field], return_inverse=True)
+                combined = combined * max(1, len(labels)) + codes
+                field_labels.append(labels.tolist())
+            groups, codes = np.unique(combined, return_inverse=True)
+
+            labels = []
+            for code in groups.tolist():
+                label = []
+                for field_values in reversed(field_labels):
+                    code, position = divmod(code, max(1, len(field_values)))
+                    label.append(field_values[position])
+                labels.append(tuple(reversed(label)))
+
+            statistics = grouped_statistics(codes, len(groups), scores, counted)
+            statistics["members"] = np.bincount(codes, minlength=len(groups))
+            statistics["donations"] = np.column_stack([
+                np.bincount(codes, weights=donation_matrix[:, i], minlength=len(groups))
+                for i in range(len(self.donation_areas))
+            ]).reshape(len(groups), len(self.donation_areas))
+            self.groups[grouping] = {"labels": labels, **statistics}
+
+    def table(self, grouping, area="overall"):
+        """One row per group: alignment statistics in an area and donation totals by policy area"""
+        group = self.groups[grouping]
+        col = self.areas.index(area)
+        rows = []
+        for row, label in enumerate(group["labels"]):
+            record = {field.capitalize(): value or "Unknown" for field, value in zip(DELEGATION_GROUPINGS[grouping], label)}
+            voting = int(group["count"][row, col])
+            record["Members"] = int(group["members"][row])
+            record["Voting Members"] = voting
+            for name, statistic in (("Mean", "mean"), ("Std Dev", "std"), ("Min", "min"), ("Max", "max")):
+                record[f"{name} Alignment"] = round(float(group[statistic][row, col]), 1) if voting else None
+            record["Total Donations"] = float(group["donations"][row].sum())
+            record.update({
+                f"{donation_area.capitalize()} Donations": float(amount)
+                for donation_area, amount in zip(self.donation_areas, group["donations"][row])
+            })
+            rows.append(record)
+        return rows
+
+def candidate_donor_area_totals(candidate_id, congress_number=SAMPLE_CONGRESS):
+    """Contribution totals by donor policy area for a candidate and the version of the data they came from
+
+    Both are None when the contributions could not be fetched.
+    """
+    snapshot = get_snapshot()
+    if snapshot is not None and snapshot.congress_number == congress_number:
+        totals = snapshot.donor_area_totals(candidate_id)
+        if totals is not None:
+            return totals, f"snapshot:{snapshot.dataset_version}"
+    contributions_data = fetch_candidate_contributions(candidate_id, congress_number)
+    if contributions_data["status"] != "success":
+        return None, None
+    sketches = contributions_data.get("sketches")
+    totals = sketches.area_totals() if sketches is not None else donor_area_totals(contributions_data["results"])
+    return totals, contributions_data.get("version")
+
+@st.cache_resource
+def get_delegation_cache():
+    """Delegation aggregates by score index and contribution versions, shared across sessions"""
+    return {"aggregates": OrderedDict(), "lock": threading.Lock()}
+
+def get_delegation_aggregates(congress_number=118):
+    """State and party aggregates for the current scores and donations, computed once per version
+
+    Donations are collected before the cache lock is taken; the fetch cache already
+    coalesces concurrent fetches of the same candidate. The key covers the content
+    version of every member's contributions, so refetched donations that changed
+    rebuild the aggregates and a fetch that failed is retried on the next call.
+    """
+    index = get_score_index(congress_number)
+    members = member_directory()
+    donations = {}
+    versions = []
+    for member_id in index.member_ids.tolist():
+        candidate_id = members.get(member_id, {}).get("fec_candidate_id")
+        if candidate_id:
+            donations[member_id], version = candidate_donor_area_totals(candidate_id, congress_number)
+            versions.append([member_id, version])
+    key = (index.version, fingerprint_data(versions))
+
+    cache = get_delegation_cache()
+    with cache["lock"]:
+        aggregates = cache["aggregates"].get(key)
+        if aggregates is not None:
+            cache["aggregates"].move_to_end(key)
+            return aggregates
+
+    aggregates = DelegationAggregates(index, members, donations)
+    with cache["lock"]:
+        aggregates = cache["aggregates"].setdefault(key, aggregates)
+        while len(cache["aggregates"]) > DELEGATION_CACHE_VERSIONS:
+            cache["aggregates"].popitem(last=False)
+    return aggregates
+
+# Bill search index
+def search_terms(text):
+    """Lowercase word tokens without stop words, with plurals folded to the singular"""
+    terms = []
+    for word in re.findall(r"[a-z0-9]+", (text or "").lower()):
+        if word in SEARCH_STOP_WORDS:
+            continue
+        if len(word) > 4 and word.endswith("ies"):
+            word = word[:-3] + "y"
+        elif len(word) > 4 and word.endswith(("xes", "ches", "shes", "sses")):
+            word = word[:-2]
+        elif len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        terms.append(word)
+    return terms
+
+class BillSearchIndex:
+    """Inverted index over bill titles and descriptions, ranked with BM25
+
+    Postings are stored term by term in flat arrays (CSR layout), so an index
+    can be saved and reloaded as a single .npz file per dataset version.
+    """
+
+    def __init__(self, bill_ids, vocabulary, offsets, postings, frequencies, doc_lengths):
+        self.bill_ids = bill_ids
+        self.vocabulary = vocabulary
+        self.offsets = offsets
+        self.postings = postings
+        self.frequencies = frequencies
+        self.doc_lengths = doc_lengths
+        self.term_ids = {term: i for i, term in enumerate(vocabulary.tolist())}
+        self.avg_length = float(doc_lengths.mean()) if len(doc_lengths) else 0.0
+
+    @classmethod
+    def build(cls, bills):
+        term_postings = {}
+        doc_lengths = np.zeros(len(bills), dtype=np.float32)
+        for doc, bill in enumerate(bills):
+            counts = Counter(search_terms(bill.get("title")) * BM25_TITLE_WEIGHT)
+            counts.update(search_terms(bill.get("description")))
+            doc_lengths[doc] = sum(counts.values())
+            for term, count in counts.items():
+                term_postings.setdefault(term, []).append((doc, count))
+
+        vocabulary = sorted(term_postings)
+        offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(term_postings[term]) for term in vocabulary])
+        flat = [posting for term in vocabulary for posting in term_postings[term]]
+        return cls(
+            np.array([bill["bill_id"] for bill in bills], dtype=np.str_),
+            np.array(vocabulary, dtype=np.str_),
+            offsets,
+            np.array([doc for doc, _ in flat], dtype=np.int32),
+            np.array([count for _, count in flat], dtype=np.float32),
+            doc_lengths
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as arrays:
+            return cls(*(arrays[name] for name in
+                         ("bill_ids", "vocabulary", "offsets", "postings", "frequencies", "doc_lengths")))
+
+    def save(self, path):
+        """Write the index atomically so concurrent workers never read a partial file"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp.npz"
+        np.savez(tmp_path, bill_ids=self.bill_ids, vocabulary=self.vocabulary, offsets=self.offsets,
+                 postings=self.postings, frequencies=self.frequencies, doc_lengths=self.doc_lengths)
+        os.replace(tmp_path, path)
+
+    def search(self, query, k=None):
+        """Bill ids matching any query term as (bill_id, score) pairs, best first"""
+        scores = np.zeros(len(self.bill_ids), dtype=np.float32)
+        n_docs = len(self.bill_ids)
+        for term in set(search_terms(query)):
+            t = self.term_ids.get(term)
+            if t is None:
+                continue
+            lo, hi = self.offsets[t], self.offsets[t + 1]
+            docs = self.postings[lo:hi]
+            tf = self.frequencies[lo:hi]
+            idf = np.log(1 + (n_docs - (hi - lo) + 0.5) / ((hi - lo) + 0.5))
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lengths[docs] / self.avg_length)
+            # Each term lists a bill at most once, so fancy-indexed += is safe
+            scores[docs] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+        hits = np.flatnonzero(scores)
+        if k is not None and len(hits) > k:
+            hits = hits[np.argpartition(-scores[hits], k - 1)[:k]]
+        hits = hits[np.argsort(-scores[hits], kind="stable")]
+        return [(str(self.bill_ids[i]), float(scores[i])) for i in hits]
+
+def bill_search_index(dataset):
+    """Search index for a dataset version, loaded from disk when it was built before"""
+    def load_or_build(bills):
+        path = os.path.join(BILL_INDEX_DIR, f"{dataset.version}.npz")
+        if os.path.exists(path):
+            try:
+                return BillSearchIndex.load(path)
+            except (OSError, ValueError, KeyError):
+                pass  # Rebuild a damaged file
+        index = BillSearchIndex.build(bills)
+        try:
+            index.save(path)
+        except OSError:
+            pass  # Read-only filesystem; keep the in-memory index
+        return index
+
+    return dataset.derived("bill_search", load_or_build)
+
+# Time index for date-window queries
+TIME_INDEX_CACHE_VERSIONS = 2  # Fetch versions whose indexes are kept
+
+class TimeIndex:
+    """Prefix sums of vote counts and contributions over roll-call and receipt dates
+
+    `missing` lists the members and candidates whose votes or contributions could
+    not be fetched when the index was built.
+    """
+
+    def __init__(self, dataset, member_ids, matrix, contributions, missing=()):
+        self.missing = sorted(missing)
+        # Order roll calls by date; undated bills sort first and only count in open-ended windows
+        order = dataset.date_order
+        self.vote_dates = [dataset.bills[i].get("vote_date", "") for i in order]
+        sorted_matrix = matrix[:, order]
+
+        # Column 0 counts every vote, the rest count votes per policy area
+        signs, category_matrix = dataset.alignment_arrays
+        signs, category_matrix = signs[order], category_matrix[order]
+        weights = np.hstack([np.ones((len(order), 1), dtype=np.int32), category_matrix])
+        voted = (sorted_matrix != VOTE_NONE).astype(np.int32)
+        conservative = conservative_vote_mask(sorted_matrix, signs).astype(np.int32)
+
+        self.member_rows = {member_id: i for i, member_id in enumerate(member_ids)}
+        self.cum_total = self._prefix_sum(voted[:, :, None] * weights[None, :, :])
+        self.cum_conservative = self._prefix_sum(conservative[:, :, None] * weights[None, :, :])
+
+        # Per-candidate running totals of contributions, overall and by donor policy area
+        self.contribution_areas = POLICY_AREA_KEYS + ["other"]
+        self.contribution_dates = {}
+        self.cum_contributions = {}
+        for candidate_id, records in contributions.items():
+            fields = contribution_fields(records, ["contributor_name", "contributor_employer",
+                                                   "contribution_receipt_date", CONTRIBUTION_AMOUNT_FIELD])
+            # Receipt dates are cut to the day, as in export_snapshot, so a timestamped
+            # receipt still falls in a window ending on its date
+            dates = fields["contribution_receipt_date"]
+            dates = np.where(pd.isna(dates), "", dates).astype("U10")
+            order = np.argsort(dates, kind="stable")
+
+            # Each donor's interests are matched once and every record takes its donor's area shares
+            donor_codes, interests = donor_interest_codes(fields["contributor_name"], fields["contributor_employer"])
+            amounts = fields[CONTRIBUTION_AMOUNT_FIELD]
+            values = np.column_stack([amounts, donor_area_shares(interests)[donor_codes] * amounts[:, None]])
+            self.contribution_dates[candidate_id] = dates[order].tolist()
+            self.cum_contributions[candidate_id] = self._prefix_sum(values[None, order, :])[0]
+
+    @staticmethod
+    def _prefix_sum(values):
+        """Cumulative sums along axis 1 with a leading zero row"""
+        padded = np.zeros((values.shape[0], values.shape[1] + 1, values.shape[2]), dtype=values.dtype)
+        np.cumsum(values, axis=1, out=padded[:, 1:, :])
+        return padded
+
+    @staticmethod
+    def _window(dates, start, end):
+        """Slice bounds of the dates falling within [start, end]"""
+        lo = bisect.bisect_left(dates, start) if start else 0
+        hi = bisect.bisect_right(dates, end) if end else len(dates)
+        return lo, max(lo, hi)
+
+    @property
+    def date_span(self):
+        """Earliest and latest dated roll call or contribution"""
+        dates = [d for d in self.vote_dates if d]
+        for candidate_dates in self.contribution_dates.values():
+            dates.extend(d for d in candidate_dates if d)
+        return (min(dates), max(dates)) if dates else (None, None)
+
+    def voting_pattern(self, member_id, start=None, end=None):
+        """Vote counts and alignment for roll calls between two ISO dates, like analyze_voting_pattern"""
+        row = self.member_rows.get(member_id)
+        if row is None:
+            return {"status": "error", "message": "Member not found"}
+
+        lo, hi = self._window(self.vote_dates, start, end)
+        totals = (self.cum_total[row, hi] - self.cum_total[row, lo]).tolist()
+        conservative = (self.cum_conservative[row, hi] - self.cum_conservative[row, lo]).tolist()
+
+        votes_by_category = {
+            area: {
+                "conservative": conservative[i + 1],
+                "progressive": totals[i + 1] - conservative[i + 1],
+                "total": totals[i + 1]
+            }
+            for i, area in enumerate(POLICY_AREA_KEYS)
+        }
+
+        return {
+            "status": "success",
+            "total_votes": totals[0],
+            "conservative_aligned_votes": conservative[0],
+            "progressive_aligned_votes": totals[0] - conservative[0],
+            "conservative_alignment": (conservative[0] / totals[0] * 100) if totals[0] > 0 else 0,
+            "votes_by_category": votes_by_category,
+            "category_alignment": {
+                area: (counts["conservative"] / counts["total"] * 100) if counts["total"] > 0 else 0
+                for area, counts in votes_by_category.items()
+            }
+        }
+
+    def contribution_totals(self, candidate_id, start=None, end=None):
+        """Contribution count and sums received between two ISO dates"""
+        dates = self.contribution_dates.get(candidate_id)
+        if dates is None:
+            return {"status": "error", "message": "Candidate not found"}
+
+        lo, hi = self._window(dates, start, end)
+        sums = (self.cum_contributions[candidate_id][hi] - self.cum_contributions[candidate_id][lo]).tolist()
+        return {
+            "status": "success",
+            "count": hi - lo,
+            "total": sums[0],
+            "by_area": dict(zip(self.contribution_areas, sums[1:]))
+        }
+
+@st.cache_resource
+def get_time_index_cache():
+    """Date-window indexes by dataset and fetch versions, shared across sessions"""
+    return {"indexes": OrderedDict(), "lock": threading.Lock()}
+
+def get_time_index(congress_number=118):
+    """The date-window index over every member's votes and contributions, built once per version
+
+    The key covers the content version of every fetch the index is built from, so
+    changed data rebuilds it and a fetch that failed, which is left out and listed
+    in `missing`, is retried on the next call.
+    """
+    dataset = fetch_dataset(congress_number)
+    member_votes, contributions, missing, versions = {}, {}, [], []
+    for member in fetch_member_data()["results"]:
+        votes_data = fetch_member_votes(member["bioguide_id"], congress_number)
+        versions.append([member["bioguide_id"], votes_data.get("version")])
+        if votes_data["status"] == "success":
+            member_votes[member["bioguide_id"]] = votes_data["votes"]
+        else:
+            missing.append(member["bioguide_id"])
+    for candidate in fetch_candidate_data()["results"]:
+        contributions_data = fetch_candidate_contributions(candidate["candidate_id"], congress_number)
+        versions.append([candidate["candidate_id"], contributions_data.get("version")])
+        if contributions_data["status"] == "success":
+            contributions[candidate["candidate_id"]] = contributions_data["results"]
+        else:
+            missing.append(candidate["candidate_id"])
+    key = (dataset.version, fingerprint_data(versions))
+
+    cache = get_time_index_cache()
+    with cache["lock"]:
+        index = cache["indexes"].get(key)
+        if index is not None:
+            cache["indexes"].move_to_end(key)
+            return index
+
+    member_ids, matrix = build_vote_matrix(member_votes, dataset)
+    index = TimeIndex(dataset, member_ids, matrix, contributions, missing)
+    with cache["lock"]:
+        index = cache["indexes"].setdefault(key, index)
+        while len(cache["indexes"]) > TIME_INDEX_CACHE_VERSIONS:
+            cache["indexes"].popitem(last=False)
+    return index
 
-    if any(word in contributor.lower() or word in employer.lower()
-           for word in ["health", "pharma", "medical", "hospital"]):
-        interests.append("healthcare")
+# Offline snapshot bundles
+# Layout: magic, format version, metadata length, metadata JSON, then raw arrays, each
+# starting on a 64-byte boundary so they can be memory-mapped straight from the file.
+SNAPSHOT_MAGIC = b"RESISTSNAP"
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_ALIGNMENT = 64
+VOTE_LABELS = {VOTE_CODES["yes"]: "yes", VOTE_CODES["no"]: "no", VOTE_OTHER: "other"}
 
-    if any(word in contributor.lower() or word in employer.lower()
-           for word in ["school", "education", "teacher", "university"]):
-        interests.append("education")
+def encode_strings(values):
+    """Pack strings into UTF-8 bytes plus an offsets array"""
+    encoded = [(value or "").encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(item) for item in encoded])
+    return offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8)
 
-    if any(word in contributor.lower() or word in employer.lower()
-           for word in ["immigration", "border", "patrol"]):
-        interests.append("immigration")
+def decode_string(offsets, blob, i):
+    return bytes(blob[offsets[i]:offsets[i + 1]]).decode("utf-8")
 
-    if any(word in contributor.lower() or word in employer.lower()
-           for word in ["court", "judicial", "legal", "law", "attorney"]):
-        interests.append("judiciary")
+def write_snapshot_bundle(path, metadata, arrays):
+    """Write metadata and arrays into a single memory-mappable bundle file"""
+    layout = {}
+    position = 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        arrays[name] = array
+        position = -(-position // SNAPSHOT_ALIGNMENT) * SNAPSHOT_ALIGNMENT
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": position}
+        position += array.nbytes
 
-    if any(word in contributor.lower() or word in employer.lower()
-           for word in ["election", "vote", "ballot", "campaign"]):
-        interests.append("elections")
+    meta = json.dumps(dict(metadata, arrays=layout)).encode("utf-8")
+    header = SNAPSHOT_MAGIC + struct.pack("<IQ", SNAPSHOT_FORMAT, len(meta)) + meta
+    data_start = -(-len(header) // SNAPSHOT_ALIGNMENT) * SNAPSHOT_ALIGNMENT
 
-    # If no specific interests found, mark as "general"
-    if not interests:
-        interests.append("general")
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        for name, array in arrays.items():
+            f.seek(data_start + layout[name]["offset"])
+            f.write(array.tobytes())
+    os.replace(tmp_path, path)
 
-    return interests
+class SnapshotBundle:
+    """Read-only view of a snapshot bundle whose arrays are memory-mapped from disk"""
+
+    def __init__(self, path):
+        self.path = path
+        self._map = np.memmap(path, dtype=np.uint8, mode="r")
+        if bytes(self._map[:len(SNAPSHOT_MAGIC)]) != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} is not a snapshot bundle")
+
+        fmt, meta_length = struct.unpack_from("<IQ", self._map, len(SNAPSHOT_MAGIC))
+        if fmt != SNAPSHOT_FORMAT:
+            raise ValueError(f"Unsupported snapshot format {fmt}")
+        meta_start = len(SNAPSHOT_MAGIC) + struct.calcsize("<IQ")
+        self.metadata = json.loads(bytes(self._map[meta_start:meta_start + meta_length]))
+        data_start = -(-(meta_start + meta_length) // SNAPSHOT_ALIGNMENT) * SNAPSHOT_ALIGNMENT
+
+        # Views into the mapping; pages are shared through the OS page cache. Empty arrays
+        # (e.g. a Congress without contributions) may sit at the very end, past the last byte.
+        self.arrays = {
+            name: np.ndarray(tuple(info["shape"]), dtype=np.dtype(info["dtype"]),
+                             buffer=self._map, offset=data_start + info["offset"])
+            if math.prod(info["shape"]) else np.empty(tuple(info["shape"]), dtype=np.dtype(info["dtype"]))
+            for name, info in self.metadata["arrays"].items()
+        }
+
+        self.congress_number = self.metadata["congress_number"]
+        self.dataset_version = self.metadata["dataset_version"]
+        self.bills = self.metadata["bills"]
+        self.members = self.metadata["members"]
+        self.member_rows = {member_id: i for i, member_id in enumerate(self.metadata["member_ids"])}
+        self.candidate_rows = {cand_id: i for i, cand_id in enumerate(self.metadata["candidate_ids"])}
+
+    def member_votes(self, member_id):
+        """Voting record for a member, in the fetch_member_votes shape"""
+        row = self.member_rows.get(member_id)
+        if row is None:
+            return {"votes": {}, "status": "error", "message": "Member not found"}
+        codes = self.arrays["vote_matrix"][row]
+        return {
+            "votes": {self.bills[col]["bill_id"]: VOTE_LABELS[int(codes[col])] for col in np.flatnonzero(codes)},
+            "status": "success"
+        }
+
+    def contributions(self, candidate_id):
+        """Contribution records for a candidate, in the fetch_candidate_contributions shape"""
+        row = self.candidate_rows.get(candidate_id)
+        if row is None:
+            return {"results": [], "status": "error", "message": "Candidate not found"}
+
+        a = self.arrays
+        start, stop = a["contrib_offsets"][row], a["contrib_offsets"][row + 1]
+        results = [
+            {
+                "contributor_name": decode_string(a["name_offsets"], a["name_blob"], a["contrib_name"][i]),
+                "contribution_receipt_amount": float(a["contrib_amount"][i]),
+                "contribution_receipt_date": a["contrib_date"][i].decode("ascii") or None,
+                "contributor_employer": decode_string(a["employer_offsets"], a["employer_blob"], a["contrib_employer"][i])
+            }
+            for i in range(start, stop)
+        ]
+        # Bundles exported before contributor geography was kept have no state/ZIP columns
+        if "contrib_state" in a:
+            for record, i in zip(results, range(start, stop)):
+                record["contributor_state"] = a["contrib_state"][i].decode("ascii") or None
+                record["contributor_zip"] = a["contrib_zip"][i].decode("ascii") or None
+        return {
+            "results": results,
+            "status": "success"
+        }
+
+    def donor_area_totals(self, candidate_id):
+        """Precomputed contribution totals by donor policy area, or None if not in the bundle"""
+        row = self.candidate_rows.get(candidate_id)
+        if row is None:
+            return None
+        return dict(zip(self.metadata["contribution_areas"], self.arrays["contrib_area_totals"][row].tolist()))
+
+    def score_index(self):
+        """Score index over the precomputed scores and intervals"""
+        a = self.arrays
+        intervals = {"areas": ["overall"] + POLICY_AREA_KEYS, "low": a["interval_low"], "high": a["interval_high"]}
+        voted = (a["vote_matrix"] != VOTE_NONE).astype(np.int32)
+        scores = {"overall": a["overall_scores"], "category_scores": a["category_scores"],
+                  "total_votes": voted.sum(axis=1), "category_total": voted @ bill_alignment_arrays(self.bills)[1]}
+        return ScoreIndex(self.metadata["member_ids"], scores, intervals, self.dataset_version)
+
+@st.cache_resource
+def get_snapshot():
+    """The configured snapshot bundle, or None to use the regular data source"""
+    if SNAPSHOT_PATH and os.path.exists(SNAPSHOT_PATH):
+        return SnapshotBundle(SNAPSHOT_PATH)
+    return None
+
+def export_snapshot(path, congress_number=118):
+    """Export members, bills, votes, contributions and precomputed scores into a bundle
+
+    Nothing is written unless the Congress has bills and recorded votes.
+    """
+    congress_data = fetch_congressional_data(congress_number)
+    if congress_data["status"] != "success":
+        return {"status": "error", "message": congress_data.get("message", f"No bills for Congress {congress_number}")}
+    member_votes = fetch_all_member_votes(congress_number)
+    if not member_votes:
+        return {"status": "error", "message": f"No votes for Congress {congress_number}"}
+
+    dataset = congress_data["dataset"]
+    members = {m["bioguide_id"]: m for m in fetch_member_data()["results"]}
+    member_ids, matrix = build_vote_matrix(member_votes, dataset)
+    scores = score_vote_matrix(matrix, dataset)
+    version = dataset_version(dataset, member_votes)
+    intervals = alignment_intervals_for(version, matrix, dataset)
+
+    # Contributions as columns, grouped by candidate through an offsets array
+    fields = ["contributor_name", "contributor_employer", "contributor_state", "contributor_zip",
+              "contribution_receipt_date", CONTRIBUTION_AMOUNT_FIELD]
+    candidate_ids, columns, area_totals = [], [], []
+    offsets = [0]
+    for candidate in fetch_candidate_data()["results"]:
+        contributions_data = fetch_candidate_contributions(candidate["candidate_id"], congress_number)
+        if contributions_data["status"] == "success":
+            candidate_ids.append(candidate["candidate_id"])
+            columns.append(contribution_fields(contributions_data["results"], fields))
+            area_totals.append(list(donor_area_totals(contributions_data["results"]).values()))
+            offsets.append(offsets[-1] + len(columns[-1][CONTRIBUTION_AMOUNT_FIELD]))
+
+    def column(field, dtype=None):
+        values = np.concatenate([c[field] for c in columns]) if columns else np.empty(0, dtype=object)
+        if dtype is None:
+            return values
+        # Fixed-width byte strings truncate to the width, e.g. timestamps to their date
+        return np.where(pd.isna(values), "", values).astype(dtype)
+
+    names, name_codes = np.unique(column("contributor_name", str), return_inverse=True)
+    employers, employer_codes = np.unique(column("contributor_employer", str), return_inverse=True)
+    name_offsets, name_blob = encode_strings(names.tolist())
+    employer_offsets, employer_blob = encode_strings(employers.tolist())
+
+    arrays = {
+        "vote_matrix": matrix,
+        "overall_scores": scores["overall"],
+        "category_scores": scores["category_scores"],
+        "interval_low": intervals["low"],
+        "interval_high": intervals["high"],
+        "contrib_offsets": np.array(offsets, dtype=np.int64),
+        "contrib_amount": column(CONTRIBUTION_AMOUNT_FIELD).astype(np.float64),
+        "contrib_date": column("contribution_receipt_date", "S10"),
+        "contrib_name": name_codes.astype(np.int32),
+        "contrib_employer": employer_codes.astype(np.int32),
+        "contrib_state": column("contributor_state", "S2"),
+        "contrib_zip": column("contributor_zip", "S10"),
+        "contrib_area_totals": np.array(area_totals, dtype=np.float64).reshape(len(candidate_ids), len(POLICY_AREA_KEYS) + 1),
+        "name_offsets": name_offsets,
+        "name_blob": name_blob,
+        "employer_offsets": employer_offsets,
+        "employer_blob": employer_blob
+    }
+    metadata = {
+        "congress_number": congress_number,
+        "dataset_version": version,
+        "bills_version": dataset.version,
+        "created": datetime.now().isoformat(),
+        "bills": list(dataset.bills),
+        "members": members,
+        "member_ids": member_ids,
+        "candidate_ids": candidate_ids,
+        "contribution_areas": POLICY_AREA_KEYS + ["other"]
+    }
+    write_snapshot_bundle(path, metadata, arrays)
+    return {"status": "success", "path": path, "dataset_version": version, "members": len(member_ids),
+            "bills": len(dataset), "contributions": offsets[-1]}
+
+# Multi-Congress shards
+def shard_path(directory, congress_number):
+    return os.path.join(directory, f"congress-{congress_number}.snap")
+
+class ChunkedArray:
+    """Read-only concatenation of arrays (or sequences) along their first axis, without copying
+
+    Positions map to a chunk and an offset within it by binary search over the
+    chunk boundaries.
+    """
+
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+        self.offsets = np.cumsum([0] + [len(chunk) for chunk in self.chunks])
+
+    def __len__(self):
+        return int(self.offsets[-1])
+
+    def locate(self, position):
+        """Chunk number and offset within it of a position"""
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError(position)
+        chunk = int(np.searchsorted(self.offsets, position, side="right")) - 1
+        return chunk, position - int(self.offsets[chunk])
+
+    def __getitem__(self, position):
+        chunk, offset = self.locate(position)
+        return self.chunks[chunk][offset]
+
+class ShardStore:
+    """Per-Congress snapshot bundles in a directory, opened on first use and shared by every session
+
+    The directory's manifest lists the members in each shard, so a member query
+    only opens the shards that member appears in. Without a manifest every shard
+    file is a candidate.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.shards = {}
+        self.datasets = {}
+        self._manifest = None
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+
+    def manifest(self):
+        """Congress number -> member ids in its shard (None when unknown)"""
+        with self._lock:
+            if self._manifest is None:
+                path = os.path.join(self.directory, SHARD_MANIFEST)
+                if os.path.exists(path):
+                    with open(path, encoding="utf-8") as f:
+                        self._manifest = {int(n): set(entry["members"]) for n, entry in json.load(f).items()}
+                elif os.path.isdir(self.directory):
+                    names = (re.fullmatch(r"congress-(\d+)\.snap", name) for name in os.listdir(self.directory))
+                    self._manifest = {int(match.group(1)): None for match in names if match}
+                else:
+                    self._manifest = {}
+            return self._manifest
+
+    def congresses(self, member_id=None):
+        """Congress numbers with a shard, optionally only those that include a member"""
+        return sorted(
+            n for n, members in self.manifest().items()
+            if member_id is None or members is None or member_id in members
+        )
+
+    def shard(self, congress_number):
+        """The bundle for a Congress, opened on first use, or None if there is no shard"""
+        with self._lock:
+            if congress_number in self.shards:
+                return self.shards[congress_number]
+        path = shard_path(self.directory, congress_number)
+        if not os.path.exists(path):
+            return None
+
+        def open_shard():
+            bundle = SnapshotBundle(path)
+            dataset = DatasetHandle(bundle.bills, congress_number, bundle.metadata.get("bills_version"))
+            with self._lock:
+                self.datasets.setdefault(congress_number, dataset)
+                return self.shards.setdefault(congress_number, bundle)
+
+        # Sessions asking for the same shard at once share one open
+        return self._flight.do(("open_shard", congress_number), open_shard)
+
+    def load(self, congress_numbers):
+        """Bundles for several Congresses, opening those not yet loaded in parallel"""
+        with self._lock:
+            missing = [n for n in congress_numbers if n not in self.shards]
+        if len(missing) > 1:
+            with ThreadPoolExecutor(max_workers=min(SHARD_LOAD_WORKERS, len(missing))) as pool:
+                list(pool.map(self.shard, missing))
+        shards = {n: self.shard(n) for n in congress_numbers}
+        return {n: shard for n, shard in shards.items() if shard is not None}
+
+    def snapshot(self):
+        """Shard counts for capacity monitoring"""
+        available = len(self.manifest())
+        with self._lock:
+            return {"directory": self.directory, "available": available, "loaded": sorted(self.shards)}
+
+@st.cache_resource
+def get_shard_store():
+    """The configured shard directory, or None when SHARD_DIR is not set"""
+    return ShardStore(SHARD_DIR) if SHARD_DIR else None
+
+def member_career(member_id, congress_numbers=None):
+    """A member's alignment in each Congress with a shard and over their whole career
+
+    Only the shards the member appears in are opened. Their vote rows stay views
+    into the memory-mapped bundles, joined end to end by ChunkedArray.
+    """
+    store = get_shard_store()
+    if store is None:
+        return {"status": "error", "message": "No Congress shards configured"}
+
+    numbers = [n for n in store.congresses(member_id) if congress_numbers is None or n in congress_numbers]
+    shards = store.load(numbers)
+    served = [(n, shard, shard.member_rows[member_id]) for n, shard in sorted(shards.items())
+              if member_id in shard.member_rows]
+    if not served:
+        return {"status": "error", "message": "Member not found in any Congress shard"}
+
+    votes = ChunkedArray([shard.arrays["vote_matrix"][row] for _, shard, row in served])
+    bills = ChunkedArray([shard.bills for _, shard, _ in served])
+    signs = [store.datasets[n].alignment_arrays[0] for n, _, _ in served]
+
+    trend = []
+    total_votes = conservative_votes = 0
+    for (n, shard, row), member_votes, bill_signs in zip(served, votes.chunks, signs):
+        voted = int(np.count_nonzero(member_votes))
+        total_votes += voted
+        conservative_votes += int(conservative_vote_mask(member_votes, bill_signs).sum())
+        trend.append({
+            "congress": n,
+            "overall": float(shard.arrays["overall_scores"][row]),
+            "category_scores": dict(zip(POLICY_AREA_KEYS, shard.arrays["category_scores"][row].tolist())),
+            "votes": voted
+        })
+
+    return {
+        "status": "success",
+        "trend": trend,
+        "total_votes": total_votes,
+        "career_overall": conservative_votes * 100.0 / total_votes if total_votes else 0.0,
+        "votes": votes,
+        "bills": bills
+    }
+
+def export_shard(directory, congress_number=SAMPLE_CONGRESS):
+    """Export a Congress into the shard directory and record its members in the manifest"""
+    os.makedirs(directory, exist_ok=True)
+    summary = export_snapshot(shard_path(directory, congress_number), congress_number)
+    if summary["status"] != "success":
+        return summary
+
+    manifest_path = os.path.join(directory, SHARD_MANIFEST)
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    manifest[str(congress_number)] = {
+        "members": SnapshotBundle(summary["path"]).metadata["member_ids"],
+        "dataset_version": summary["dataset_version"]
+    }
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, manifest_path)
+    return summary
+
+# Roll-call vote records
+@st.cache_resource(ttl=CACHE_TTL)
+def get_rollcall_votes():
+    """Parse ROLLCALL_DIR into a members x roll-calls matrix, or None when it isn't configured"""
+    if not ROLLCALL_DIR or not os.path.isdir(ROLLCALL_DIR):
+        return None
+    id_map = rollcall.load_legislator_ids(LEGISLATORS_PATH) if LEGISLATORS_PATH else {}
+    parsed = rollcall.parse_rollcall_directory(ROLLCALL_DIR, list(member_directory()), id_map,
+                                               workers=ROLLCALL_PARSE_WORKERS)
+    parsed["member_rows"] = {member_id: i for i, member_id in enumerate(parsed["member_ids"])}
+    # A bill's final roll call stands for the member's vote on it; bill numbers restart each Congress
+    parsed["bill_columns"] = {
+        congress_number: rollcall.latest_rollcall_columns([m for m in parsed["rollcalls"] if m["congress"] == congress_number])
+        for congress_number in sorted({m["congress"] for m in parsed["rollcalls"]})
+    }
+    return parsed
+
+def rollcall_member_votes(parsed, member_id, congress_number=SAMPLE_CONGRESS):
+    """Voting record for a member in a Congress from parsed roll calls, in the fetch_member_votes shape"""
+    row = parsed["member_rows"].get(member_id)
+    if row is None:
+        return {
+            "votes": {},
+            "status": "error",
+            "message": "Member not found"
+        }
+    if congress_number not in parsed["bill_columns"]:
+        return {
+            "votes": {},
+            "status": "error",
+            "message": f"No roll calls for Congress {congress_number}"
+        }
+    codes = parsed["matrix"][row]
+    # Only the member's own chamber has a vote recorded in its column
+    return {
+        "votes": {
+            bill_id: VOTE_LABELS[int(codes[col])]
+            for (chamber, bill_id), col in parsed["bill_columns"][congress_number].items()
+            if codes[col] != VOTE_NONE
+        },
+        "status": "success"
+    }
+
+# AI narrative generation
+class NarrativeFlight:
+    """Chunks of one in-progress narrative, shared by every session waiting on it"""
+
+    def __init__(self):
+        self.chunks = []
+        self.done = False
+        self.failed = False
+        self._condition = threading.Condition()
+
+    def append(self, text):
+        with self._condition:
+            self.chunks.append(text)
+            self._condition.notify_all()
+
+    def finish(self, failed=False):
+        with self._condition:
+            self.done = True
+            self.failed = failed
+            self._condition.notify_all()
+
+    def wait(self, seen, deadline):
+        """Block until there are more than `seen` chunks, the flight ends, or the deadline passes"""
+        with self._condition:
+            self._condition.wait_for(
+                lambda: len(self.chunks) > seen or self.done,
+                timeout=max(0.0, deadline - time.monotonic())
+            )
+            return list(self.chunks), self.done, self.failed
+
+class NarrativeGenerator:
+    """Streams LLM narratives from a background event loop, with a persistent cache and request dedup
+
+    `model` needs an async `generate_content_async(prompt, stream=True)` whose result is an
+    async iterable of chunks with a `.text` attribute, like `genai.GenerativeModel`.
+    """
+
+    def __init__(self, model, cache_dir=NARRATIVE_CACHE_DIR, timeout=NARRATIVE_TIMEOUT,
+                 generation_limit=NARRATIVE_GENERATION_LIMIT):
+        self.model = model
+        self.cache_dir = cache_dir
+        self.timeout = timeout
+        self.generation_limit = generation_limit
+        self._flights = {}
+        self._lock = threading.Lock()
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, name="narrative-loop", daemon=True).start()
+
+    @staticmethod
+    def cache_key(member_id, scores, version):
+        """Hash of everything the narrative depends on"""
+        return fingerprint_data({"member": member_id, "scores": scores, "version": version, "model": GEMINI_MODEL})
+
+    def _cache_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def cached(self, key):
+        """Return a previously completed narrative, if any"""
+        try:
+            with open(self._cache_path(key), encoding="utf-8") as f:
+                return json.load(f)["narrative"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _store(self, key, narrative):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{self._cache_path(key)}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"narrative": narrative, "created": datetime.now().isoformat()}, f)
+        os.replace(tmp_path, self._cache_path(key))
+
+    async def _generate(self, prompt, flight):
+        response = await self.model.generate_content_async(prompt, stream=True)
+        async for chunk in response:
+            text = getattr(chunk, "text", "")
+            if text:
+                flight.append(text)
+
+    async def _run(self, key, prompt, flight):
+        try:
+            await asyncio.wait_for(self._generate(prompt, flight), self.generation_limit)
+        except Exception:
+            flight.finish(failed=True)
+        else:
+            # Persist before releasing the flight so later requests hit the cache; a failed
+            # write only costs the cache, waiters still get the narrative they streamed
+            try:
+                self._store(key, "".join(flight.chunks))
+            except OSError:
+                pass
+            finally:
+                flight.finish()
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+
+    def stream(self, key, prompt, fallback):
+        """Yield the narrative so far each time it grows, or the fallback on error or when it stalls
+
+        The timeout is an idle timeout: it restarts with every chunk, so a long
+        generation that keeps streaming is shown in full.
+        """
+        narrative = self.cached(key)
+        if narrative is not None:
+            yield narrative
+            return
+
+        # Join an in-flight generation for the same key instead of starting another
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = NarrativeFlight()
+                self._flights[key] = flight
+                asyncio.run_coroutine_threadsafe(self._run(key, prompt, flight), self._loop)
+
+        deadline = time.monotonic() + self.timeout
+        seen = 0
+        while True:
+            chunks, done, failed = flight.wait(seen, deadline)
+            if failed or (not done and len(chunks) == seen):
+                # Generation failed or timed out; it may still finish and be cached for next time
+                yield fallback
+                return
+            if len(chunks) > seen:
+                seen = len(chunks)
+                deadline = time.monotonic() + self.timeout
+                yield "".join(chunks)
+            if done:
+                return
+
+def build_narrative_prompt(member_info, overall_score, category_scores, report):
+    """Prompt asking the model to expand the templated report into a narrative"""
+    scores = "\n".join(f"- {category}: {score:.1f}%" for category, score in category_scores.items())
+    return (
+        f"Write a neutral, factual markdown analysis of how {member_info['name']} "
+        f"({member_info['party']}-{member_info['state']}) votes relative to conservative policy positions.\n\n"
+        f"Overall conservative alignment: {overall_score:.1f}%\n"
+        f"Alignment by policy area:\n{scores}\n\n"
+        "Use the headings of the reference report below, explain what the scores mean in each area, "
+        "and note where few votes make a score less certain. Do not invent votes or bills.\n\n"
+        f"Reference report:\n{report}"
+    )
+
+@st.cache_resource
+def get_narrative_generator():
+    """Shared narrative generator, or None when no Gemini key is configured"""
+    if not GEMINI_API_KEY:
+        return None
+    genai.configure(api_key=GEMINI_API_KEY)
+    return NarrativeGenerator(genai.GenerativeModel(GEMINI_MODEL))
+
+def render_narrative(placeholder, member_id, alignment_data, version):
+    """Stream the AI narrative into a placeholder, falling back to the templated report
+
+    Called once the rest of the page is laid out, so a slow model only holds up the
+    narrative itself.
+    """
+    generator = get_narrative_generator()
+    if generator is None:
+        placeholder.markdown(alignment_data["analysis"])
+        return
+
+    member_data = fetch_member_data(member_id)
+    member_info = member_data["results"][0] if member_data["results"] else \
+        {"name": "Unknown", "party": "Unknown", "state": "Unknown"}
+    key = NarrativeGenerator.cache_key(member_id, alignment_data["category_scores"], version)
+    prompt = build_narrative_prompt(
+        member_info, alignment_data["overall_score"], alignment_data["category_scores"], alignment_data["analysis"]
+    )
+
+    for text in generator.stream(key, prompt, fallback=alignment_data["analysis"]):
+        placeholder.markdown(text)
+
+# Startup cache warming
+class PopularityTracker:
+    """Counts detailed views of each (bioguide_id, candidate_id) pair, persisted across deploys"""
+
+    def __init__(self, path=WARMUP_STATS_PATH, flush_interval=WARMUP_FLUSH_INTERVAL):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.counts = Counter()
+        self.flushed_at = time.monotonic()
+        self._lock = threading.Lock()
+        try:
+            with open(path, encoding="utf-8") as f:
+                for record in json.load(f):
+                    self.counts[(record["bioguide_id"], record["candidate_id"])] = record["views"]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    def record(self, bioguide_id, candidate_id):
+        with self._lock:
+            self.counts[(bioguide_id, candidate_id)] += 1
+            due = time.monotonic() - self.flushed_at >= self.flush_interval
+        if due:
+            self.flush()
+
+    def top(self, n):
+        """The n most viewed pairs, most viewed first"""
+        with self._lock:
+            return [pair for pair, _ in self.counts.most_common(n)]
+
+    def flush(self):
+        with self._lock:
+            records = [
+                {"bioguide_id": bioguide_id, "candidate_id": candidate_id, "views": views}
+                for (bioguide_id, candidate_id), views in self.counts.most_common()
+            ]
+            self.flushed_at = time.monotonic()
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(records, f)
+        os.replace(tmp_path, self.path)
+
+@st.cache_resource
+def get_popularity_tracker():
+    """Process-wide member view counter, saved again on shutdown"""
+    tracker = PopularityTracker()
+    atexit.register(tracker.flush)
+    return tracker
+
+class CacheWarmer:
+    """Prefetches and scores the most viewed members in the background after startup
+
+    Fetches report upstream errors in their result rather than raising, so a target
+    only counts as warmed once each of its results came back successful.
+    """
+
+    def __init__(self, targets, max_failure_ratio=WARMUP_MAX_FAILURE_RATIO):
+        self.targets = targets
+        self.max_failure_ratio = max_failure_ratio
+        self.scored = False
+        self.warmed = 0
+        self.failed = 0
+        self.done = False
+        self.started_at = time.time()
+        self.finished_at = None
+
+    def start(self):
+        threading.Thread(target=self.run, name="cache-warmer", daemon=True).start()
+
+    def run(self):
+        with request_priority(PRIORITY_PREFETCH):
+            dataset = None
+            try:
+                dataset = fetch_dataset()
+                # Scores every member, including bootstrap intervals
+                self.scored = len(get_score_index().member_ids) > 0
+            except Exception:
+                # Left unscored, which keeps the instance from reporting ready
+                pass
+
+            # Most viewed first, so partial warmup still covers the busiest pages
+            for bioguide_id, candidate_id in self.targets:
+                try:
+                    results = [fetch_member_votes(bioguide_id), fetch_candidate_contributions(candidate_id),
+                               calculate_policy_alignment(bioguide_id, dataset)]
+                    ok = all(result["status"] == "success" for result in results)
+                except Exception:
+                    ok = False
+                if ok:
+                    self.warmed += 1
+                else:
+                    self.failed += 1
+
+            # Covers every member, so it is built in the background rather than counted as a target
+            get_donor_geography()
+
+        self.finished_at = time.time()
+        self.done = True
+
+    @property
+    def ready(self):
+        """Warmup finished with scores built and no more than the allowed share of targets failing"""
+        if not self.done or not self.scored:
+            return False
+        if not self.targets:
+            return True
+        return self.warmed > 0 and self.failed <= self.max_failure_ratio * len(self.targets)
+
+    def status(self):
+        return {
+            "ready": self.ready,
+            "scored": self.scored,
+            "targets": len(self.targets),
+            "warmed": self.warmed,
+            "failed": self.failed,
+            "started_at": datetime.fromtimestamp(self.started_at).isoformat(),
+            "seconds": round((self.finished_at or time.time()) - self.started_at, 2)
+        }
+
+def memory_stats():
+    """Sizes of the shared caches and per-session memory, for capacity monitoring"""
+    figures = get_figure_cache()
+    with figures["lock"]:
+        figure_stats = {"entries": len(figures["specs"]), "bytes": figures["bytes"],
+                        "memory_budget": FIGURE_CACHE_MAX_BYTES}
+    store = get_shard_store()
+    return {
+        "fetch_cache": get_fetch_cache().snapshot(),
+        "figure_cache": figure_stats,
+        "sessions": get_session_memory().snapshot(),
+        "shards": store.snapshot() if store is not None else None
+    }
+
+class HealthRequestHandler(BaseHTTPRequestHandler):
+    """Liveness, readiness and memory endpoints for the load balancer and monitoring"""
+
+    def do_GET(self):
+        if self.path == "/healthz":
+            self._send(200, {"status": "ok"})
+        elif self.path == "/readyz":
+            status = self.server.warmer.status()
+            self._send(200 if status["ready"] else 503, status)
+        elif self.path == "/memz":
+            self._send(200, memory_stats())
+        else:
+            self._send(404, {"status": "not found"})
+
+    def _send(self, code, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_health_server(port, warmer):
+    """Serve /healthz, /readyz and /memz on a background thread"""
+    try:
+        server = ThreadingHTTPServer(("0.0.0.0", port), HealthRequestHandler)
+    except OSError:
+        # Another worker on this host already serves health checks
+        return None
+    server.daemon_threads = True
+    server.warmer = warmer
+    threading.Thread(target=server.serve_forever, name="health-server", daemon=True).start()
+    return server
+
+@st.cache_resource
+def get_cache_warmer():
+    """Start warming the most viewed members once per process
+
+    Streamlit only runs the script for a session, so deployments should point a startup
+    probe at /_stcore/script-health-check (see .streamlit/config.toml) to trigger this.
+    """
+    warmer = CacheWarmer(get_popularity_tracker().top(WARMUP_TOP_N))
+    warmer.start()
+    if HEALTH_PORT:
+        start_health_server(HEALTH_PORT, warmer)
+    return warmer
+
+# Chart helpers
+@st.cache_resource
+def get_figure_cache():
+    """Shared store of built figures and their sizes, keyed by chart kind and data fingerprint"""
+    return {"specs": OrderedDict(), "bytes": 0, "lock": threading.Lock()}
+
+def fingerprint_data(data):
+    """Compute a stable fingerprint of chart input data"""
+    payload = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+def cached_figure(kind, data, build_figure):
+    """Return a figure for the data, only building the figure on a cache miss
+
+    The figure object itself is cached, so st.plotly_chart serializes it without
+    rebuilding and validating it from a dict. Cached figures are shared between
+    sessions and must not be mutated. The key hashes the data in the order the
+    build sees it: the same values in another order can draw a different chart.
+    Sizes are measured by walking the figure's trace and layout dicts, which is
+    cheaper than serializing it.
+    """
+    payload = json.dumps(data, default=str)
+    key = f"{kind}:{hashlib.sha1(payload.encode('utf-8')).hexdigest()}"
+    cache = get_figure_cache()
+
+    with cache["lock"]:
+        entry = cache["specs"].get(key)
+        if entry is not None:
+            cache["specs"].move_to_end(key)
+
+    if entry is None:
+        figure = build_figure(data)
+        entry = {"figure": figure, "size": estimate_size([figure._data, figure._layout])}
+        with cache["lock"]:
+            if key not in cache["specs"]:
+                cache["specs"][key] = entry
+                cache["bytes"] += entry["size"]
+            while cache["specs"] and (len(cache["specs"]) > FIGURE_CACHE_MAX_ENTRIES
+                                      or cache["bytes"] > FIGURE_CACHE_MAX_BYTES):
+                _, evicted = cache["specs"].popitem(last=False)
+                cache["bytes"] -= evicted["size"]
+
+    return entry["figure"]
+
+def build_gauge_figure(overall_score):
+    """Build the overall alignment gauge"""
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=overall_score,
+        domain={'x': [0, 1], 'y': [0, 1]},
+        title={'text': "Conservative Policy Alignment"},
+        gauge={
+            'axis': {'range': [0, 100]},
+            'bar': {'color': "darkblue"},
+            'steps': [
+                {'range': [0, 25], 'color': "lightblue"},
+                {'range': [25, 50], 'color': "cyan"},
+                {'range': [50, 75], 'color': "royalblue"},
+                {'range': [75, 100], 'color': "darkblue"}
+            ],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': overall_score
+            }
+        }
+    ))
+
+    fig.update_layout(
+        height=250,
+        margin=dict(l=20, r=20, t=50, b=20),
+    )
+    return fig
+
+def build_radar_figure(radar):
+    """Build the radar chart of alignment by policy area, with confidence bands if given"""
+    category_scores = radar["scores"]
+    fig = go.Figure()
+
+    fig.add_trace(go.Scatterpolar(
+        r=list(category_scores.values()),
+        theta=list(category_scores.keys()),
+        fill='toself',
+        name='Alignment Score'
+    ))
+
+    if radar.get("intervals"):
+        # Outline the lower and upper bounds of the bootstrap interval
+        for position, bound in enumerate(("Lower", "Upper")):
+            fig.add_trace(go.Scatterpolar(
+                r=[radar["intervals"][area][position] for area in category_scores],
+                theta=list(category_scores.keys()),
+                mode="lines",
+                line=dict(dash="dot", color="gray"),
+                name=f"{bound} {BOOTSTRAP_CONFIDENCE:.0%} bound"
+            ))
+
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, 100]
+            )
+        ),
+        showlegend=False
+    )
+    return fig
+
+def build_vote_pie_figure(vote_counts):
+    """Build the pie chart of aligned vs. non-aligned votes"""
+    return px.pie(
+        values=[vote_counts["aligned"], vote_counts["total"] - vote_counts["aligned"]],
+        names=["Conservative Aligned", "Progressive Aligned"],
+        title="Vote Alignment"
+    )
+
+def build_bar_figure(chart):
+    """Build a bar chart from records and axis names"""
+    return px.bar(
+        pd.DataFrame(chart["records"], columns=[chart["x"], chart["y"]]),
+        x=chart["x"],
+        y=chart["y"],
+        title=chart["title"]
+    )
+
+def build_delegation_donations_figure(records):
+    """Build the stacked donations-by-policy-area bar chart for delegations"""
+    fig = px.bar(
+        pd.DataFrame(records, columns=["Group", "Policy Area", "Amount"]),
+        x="Group",
+        y="Amount",
+        color="Policy Area",
+        title="Donations by Policy Area"
+    )
+    fig.update_layout(barmode="stack")
+    return fig
+
+def build_career_figure(records):
+    """Build the per-Congress alignment line chart"""
+    return px.line(
+        pd.DataFrame(records, columns=["Congress", "Conservative Alignment"]),
+        x="Congress",
+        y="Conservative Alignment",
+        markers=True,
+        range_y=[0, 100],
+        title="Conservative Alignment by Congress"
+    )
+
+def build_correlation_figure(records):
+    """Build the contribution vs. alignment bubble chart, using WebGL for large point counts"""
+    policy_corr_df = pd.DataFrame(records)
+    render_mode = "webgl" if len(policy_corr_df) > WEBGL_POINT_THRESHOLD else "svg"
+
+    fig = px.scatter(
+        policy_corr_df,
+        x="Contributions",
+        y="Alignment",
+        size="Size",
+        color="Policy Area",
+        hover_name="Member" if "Member" in policy_corr_df else "Policy Area",
+        size_max=60,
+        render_mode=render_mode,
+        title="Contribution Amount vs. Voting Alignment by Policy Area"
+    )
+
+    fig.update_layout(
+        xaxis_title="Contribution Amount ($)",
+        yaxis_title="Conservative Voting Alignment (%)"
+    )
+    return fig
+
+def build_comparison_radar_figure(members):
+    """Build a radar chart overlaying several members' policy area scores"""
+    fig = go.Figure()
+
+    for member in members:
+        fig.add_trace(go.Scatterpolar(
+            r=list(member["scores"].values()),
+            theta=list(member["scores"].keys()),
+            fill='toself',
+            opacity=0.5,
+            name=member["name"]
+        ))
+
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, 100]
+            )
+        ),
+        showlegend=True
+    )
+    return fig
+
+def correlation_chart_records(correlation, member_name=None):
+    """Flatten a correlation result into bubble chart points"""
+    policy_data = []
+    for policy, data in correlation["interest_alignment"].items():
+        if data["total_contributions"] > 0:
+            point = {
+                "Policy Area": policy.capitalize(),
+                "Alignment": data["alignment_percentage"],
+                "Contributions": data["total_contributions"],
+                "Size": float(np.log1p(data["total_contributions"]))  # Log scale for better visualization
+            }
+            if member_name:
+                point["Member"] = member_name
+            policy_data.append(point)
+    return policy_data
 
 # Streamlit UI
+def render_comparison_view():
+    """Render the side-by-side member comparison"""
+    st.header("Compare Members")
+
+    all_candidates = fetch_candidate_data().get("results", [])
+    labels = {f"{c['name']} ({c['party']}-{c['state']})": c for c in all_candidates}
+
+    selected = st.multiselect(
+        f"Select up to {COMPARISON_MAX_MEMBERS} members to compare",
+        list(labels.keys()),
+        max_selections=COMPARISON_MAX_MEMBERS,
+        key="comparison_members"
+    )
+
+    if not selected:
+        st.info("Choose members above to compare their alignment and donors")
+        return
+
+    with st.spinner("Scoring selected members..."):
+        comparison = compare_members([labels[label] for label in selected], fetch_dataset())
+
+    if not comparison["table"]:
+        st.warning("No voting records available for the selected members")
+        return
+
+    st.subheader("Alignment by Policy Area")
+    fig = cached_figure("comparison_radar", comparison["radar"], build_comparison_radar_figure)
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.subheader("Comparison Table")
+    st.dataframe(pd.DataFrame(comparison["table"]), use_container_width=True)
+
+def render_leaderboard_view():
+    """Render the most/least aligned members in a policy area"""
+    st.header("Alignment Leaderboard")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        area = st.selectbox("Policy Area", ["overall"] + POLICY_AREA_KEYS, key="leaderboard_area")
+    with col2:
+        direction = st.radio("Show", ["Most aligned", "Least aligned"], key="leaderboard_direction")
+    with col3:
+        k = st.slider("Members", 1, 100, 10, key="leaderboard_k")
+
+    index = get_score_index()
+    leaders = index.top_k(area, k, most_aligned=direction == "Most aligned")
+    members = {m["bioguide_id"]: m for m in fetch_member_data()["results"]}
+
+    st.dataframe(pd.DataFrame([
+        {
+            "Rank": rank,
+            "Name": members.get(member_id, {}).get("name", member_id),
+            "Party": members.get(member_id, {}).get("party"),
+            "State": members.get(member_id, {}).get("state"),
+            "Conservative Alignment": f"{score:.1f}%",
+            "Interval": "{:.0f}% to {:.0f}%".format(*index.interval(member_id, area)) if index.intervals else ""
+        }
+        for rank, (member_id, score) in enumerate(leaders, start=1)
+    ]), use_container_width=True, hide_index=True)
+
+def render_delegations_view():
+    """Render alignment and donation aggregates by state, party and state delegation"""
+    st.header("Delegations")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        grouping = st.selectbox("Group by", list(DELEGATION_GROUPINGS), key="delegation_grouping")
+    with col2:
+        area = st.selectbox("Policy Area", ["overall"] + POLICY_AREA_KEYS, key="delegation_area")
+
+    aggregates = get_delegation_aggregates()
+    rows = aggregates.table(grouping, area)
+    if not rows:
+        st.info("No voting records available")
+        return
+
+    st.subheader("Alignment")
+    group_fields = [field.capitalize() for field in DELEGATION_GROUPINGS[grouping]]
+    st.dataframe(pd.DataFrame([
+        {key: row[key] for key in group_fields + ["Members", "Voting Members", "Mean Alignment",
+                                                  "Std Dev Alignment", "Min Alignment", "Max Alignment"]}
+        for row in rows
+    ]), use_container_width=True, hide_index=True)
+
+    st.subheader("Donations")
+    if aggregates.missing:
+        directory = member_directory()
+        names = ", ".join(directory.get(member_id, {}).get("name", member_id) for member_id in aggregates.missing)
+        st.warning(f"Contributions could not be fetched for {len(aggregates.missing)} member(s), "
+                   f"so their donations are not counted: {names}")
+    donation_columns = ["Total Donations"] + [f"{name.capitalize()} Donations" for name in aggregates.donation_areas]
+    st.dataframe(pd.DataFrame([
+        {key: row[key] for key in group_fields + donation_columns} for row in rows
+    ]), use_container_width=True, hide_index=True)
+    fig = cached_figure("delegation_donations", [
+        ["-".join(row[field] for field in group_fields), name.capitalize(), row[f"{name.capitalize()} Donations"]]
+        for row in rows
+        for name in aggregates.donation_areas
+    ], build_delegation_donations_figure)
+    st.plotly_chart(fig, use_container_width=True)
+
+def render_date_range_tab(member_id, candidate_id):
+    """Render alignment and donations for a chosen date window"""
+    st.header("Date Range Analysis")
+
+    time_index = get_time_index()
+    first, last = time_index.date_span
+    if not first:
+        st.info("No dated votes or contributions available")
+        return
+    first, last = date.fromisoformat(first), date.fromisoformat(last)
+
+    window = st.radio("Window", ["Full record", "Last 90 days", "Custom"], horizontal=True, key="date_window")
+    if window == "Last 90 days":
+        start, end = last - timedelta(days=90), last
+    elif window == "Custom":
+        selected = st.date_input("Date range", value=(first, last), min_value=first, max_value=last, key="date_range")
+        if len(selected) != 2:
+            st.info("Select a start and end date")
+            return
+        start, end = selected
+    else:
+        start, end = first, last
+
+    pattern = time_index.voting_pattern(member_id, start.isoformat(), end.isoformat())
+    donations = time_index.contribution_totals(candidate_id, start.isoformat(), end.isoformat())
+
+    st.caption(f"{start:%b %d, %Y} to {end:%b %d, %Y}")
+    if {member_id, candidate_id} & set(time_index.missing):
+        st.warning("Some of this member's records could not be fetched; they are retried on the next visit")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Votes Cast", pattern.get("total_votes", 0))
+    with col2:
+        st.metric("Conservative Alignment", f"{pattern.get('conservative_alignment', 0):.1f}%")
+    with col3:
+        st.metric("Contributions Received", f"${donations.get('total', 0):,.2f}")
+
+    if pattern["status"] == "success" and pattern["total_votes"] > 0:
+        st.subheader("Alignment by Policy Area")
+        voted_areas = {
+            area: score for area, score in pattern["category_alignment"].items()
+            if pattern["votes_by_category"][area]["total"] > 0
+        }
+        st.dataframe(pd.DataFrame({
+            "Policy Area": [area.capitalize() for area in voted_areas],
+            "Votes": [pattern["votes_by_category"][area]["total"] for area in voted_areas],
+            "Conservative Alignment": [f"{score:.1f}%" for score in voted_areas.values()]
+        }), use_container_width=True, hide_index=True)
+    else:
+        st.info("No roll-call votes in this window")
+
+    if donations["status"] == "success" and donations["count"] > 0:
+        st.subheader("Contributions by Policy Area")
+        fig = cached_figure("bar", {
+            "records": sorted(
+                ([area, amount] for area, amount in donations["by_area"].items()),
+                key=lambda item: item[1], reverse=True
+            ),
+            "x": "Policy Area",
+            "y": "Amount",
+            "title": "Contributions by Policy Area"
+        }, build_bar_figure)
+        st.plotly_chart(fig, use_container_width=True, key="date_range_donations")
+    else:
+        st.info("No contributions received in this window")
+
+def search_result_row(candidate, alignment=None, interval=None):
+    """Search results table row; without an alignment the scores show as pending"""
+    return {
+        "Name": candidate.get("name"),
+        "Party": candidate.get("party"),
+        "State": candidate.get("state"),
+        "Office": candidate.get("office_full"),
+        "Conservative Alignment": f"{alignment['overall_score']:.1f}%" if alignment else "Scoring...",
+        "Interval": f"{interval[0]:.0f}% to {interval[1]:.0f}%" if interval else "",
+        "ID": candidate.get("candidate_id"),
+        "bioguide_id": candidate.get("bioguide_id"),
+        "alignment_data": alignment
+    }
+
+def score_search_candidates(candidates, dataset, score_index):
+    """Score candidates in concurrent batches, yielding each batch's (position, row) pairs as it completes
+
+    The row is None for a candidate whose alignment could not be calculated.
+    """
+    ctx = get_script_run_ctx()
+
+    def score_batch(batch):
+        # Let worker threads use the session's caches without missing-context warnings
+        if ctx is not None:
+            add_script_run_ctx(threading.current_thread(), ctx)
+        scored = []
+        for position, candidate in batch:
+            member_id = candidate.get("bioguide_id")
+            alignment = calculate_policy_alignment(member_id, dataset)
+            if alignment["status"] == "success":
+                scored.append((position, search_result_row(candidate, alignment, score_index.interval(member_id))))
+            else:
+                scored.append((position, None))
+        return scored
+
+    positions = list(enumerate(candidates))
+    batches = [positions[i:i + SEARCH_BATCH_SIZE] for i in range(0, len(positions), SEARCH_BATCH_SIZE)]
+    with ThreadPoolExecutor(max_workers=max(1, min(SEARCH_SCORE_WORKERS, len(batches)))) as pool:
+        futures = [pool.submit(contextvars.copy_context().run, score_batch, batch) for batch in batches]
+        for future in as_completed(futures):
+            yield future.result()
+
 def main():
+    # Kick off background warming of popular members on the first run in this process
+    warmer = get_cache_warmer()
+    session_objects = {}  # Large per-run objects counted towards this session's memory
+
     st.title("Congressional Finance Tracker")
 
     # Add information about the data sources
@@ -950,6 +4505,9 @@ def main():
         connect to the actual APIs and use real-time data.
         """)
 
+    # Choose between single-member search and side-by-side comparison
+    view = st.sidebar.radio("View", ["Search", "Compare Members", "Leaderboard", "Delegations"], key="view_mode")
+
     # Sidebar for search
     st.sidebar.header("Search Politicians")
     search_name = st.sidebar.text_input("Name")
@@ -975,7 +4533,17 @@ def main():
     min_alignment = st.sidebar.slider("Minimum Alignment Score", 0, 100, 0)
     max_alignment = st.sidebar.slider("Maximum Alignment Score", 0, 100, 100)
 
+    # Remember the search so widgets inside the results survive reruns
     if st.sidebar.button("Search"):
+        st.session_state["search_submitted"] = True
+
+    if view == "Compare Members":
+        render_comparison_view()
+    elif view == "Leaderboard":
+        render_leaderboard_view()
+    elif view == "Delegations":
+        render_delegations_view()
+    elif st.session_state.get("search_submitted"):
         with st.spinner("Searching for politicians..."):
             candidates = fetch_candidate_data(search_name, search_state, search_party)
 
@@ -983,51 +4551,48 @@ def main():
                 st.subheader("Search Results")
 
                 # Get congressional data for alignment analysis
-                bills_data = fetch_congressional_data()
-
-                # Calculate alignment scores for all candidates
-                candidates_with_scores = []
-                for candidate in candidates.get("results"):
-                    # Map FEC candidate_id to congressional member_id (bioguide_id)
-                    member_id = candidate.get("bioguide_id")
-
-                    # Calculate alignment score
-                    alignment = calculate_policy_alignment(member_id, bills_data)
-
-                    if alignment["status"] == "success":
-                        overall_score = alignment["overall_score"]
-                        category_scores = alignment["category_scores"]
-
-                        # Apply filters
-                        include_candidate = True
-
-                        # Apply alignment score filter
-                        if overall_score < min_alignment or overall_score > max_alignment:
-                            include_candidate = False
-
-                        # Apply policy area filter
-                        if selected_policy_area != "All" and selected_policy_area in category_scores:
-                            category_score = category_scores[selected_policy_area]
-                            if category_score < min_alignment or category_score > max_alignment:
-                                include_candidate = False
-
-                        if include_candidate:
-                            candidates_with_scores.append({
-                                "Name": candidate.get("name"),
-                                "Party": candidate.get("party"),
-                                "State": candidate.get("state"),
-                                "Office": candidate.get("office_full"),
-                                "Conservative Alignment": f"{overall_score:.1f}%",
-                                "ID": candidate.get("candidate_id"),
-                                "bioguide_id": member_id,
-                                "alignment_data": alignment
-                            })
+                dataset = fetch_dataset()
+
+                # Show the candidates matching the search straight away; the alignment filters
+                # need the score index, which may still be building on a cold start
+                display_cols = ["Name", "Party", "State", "Office", "Conservative Alignment", "Interval"]
+                members = [c for c in candidates.get("results") if c.get("bioguide_id")]
+                results_table = st.empty()
+                if members:
+                    results_table.dataframe(pd.DataFrame([search_result_row(c) for c in members])[display_cols])
+
+                # Apply the alignment and policy area filters on the precomputed index
+                # so only surviving candidates get a full analysis
+                score_index = get_score_index()
+                allowed_members = score_index.range("overall", min_alignment, max_alignment)
+                if selected_policy_area != "All":
+                    allowed_members &= score_index.range(selected_policy_area, min_alignment, max_alignment)
+                matches = [c for c in members if c["bioguide_id"] in allowed_members]
 
+                # Narrow the table to the matches, then fill in alignment scores as batches complete
+                rows = [search_result_row(candidate) for candidate in matches]
+                if not rows:
+                    results_table.empty()
+                else:
+                    results_table.dataframe(pd.DataFrame(rows)[display_cols])
+                    progress = st.progress(0.0, text=f"Scoring 0 of {len(matches)} candidates")
+                    scored = 0
+                    for batch in score_search_candidates(matches, dataset, score_index):
+                        for position, row in batch:
+                            rows[position] = row
+                        scored += len(batch)
+                        progress.progress(scored / len(matches), text=f"Scoring {scored} of {len(matches)} candidates")
+                        remaining = [row for row in rows if row is not None]
+                        if remaining:
+                            results_table.dataframe(pd.DataFrame(remaining)[display_cols])
+                        else:
+                            results_table.empty()
+                    progress.empty()
+
+                candidates_with_scores = [row for row in rows if row is not None]
                 if candidates_with_scores:
-                    # Display candidates in a table
                     candidates_df = pd.DataFrame(candidates_with_scores)
-                    display_cols = ["Name", "Party", "State", "Office", "Conservative Alignment"]
-                    st.dataframe(candidates_df[display_cols])
+                    session_objects["search_results"] = candidates_df
 
                     # Allow user to select a candidate for detailed analysis
                     selected_candidate = st.selectbox(
@@ -1041,12 +4606,18 @@ def main():
                         member_id = selected_row["bioguide_id"]
                         alignment_data = selected_row["alignment_data"]
 
+                        # Count each newly opened member towards startup warming
+                        if st.session_state.get("last_viewed") != (member_id, candidate_id):
+                            st.session_state["last_viewed"] = (member_id, candidate_id)
+                            get_popularity_tracker().record(member_id, candidate_id)
+
                         # Display tabs for different analyses
-                        tab1, tab2, tab3, tab4 = st.tabs([
+                        tab1, tab2, tab3, tab4, tab5 = st.tabs([
                             "Policy Alignment",
                             "Voting Record",
                             "Campaign Finance",
-                            "Finance-Voting Correlation"
+                            "Finance-Voting Correlation",
+                            "Date Range"
                         ])
 
                         with tab1:
@@ -1065,36 +4636,13 @@ def main():
                                     f"{overall_score:.1f}%",
                                     delta=None
                                 )
+                                interval = get_score_index().interval(member_id)
+                                if interval:
+                                    st.caption(f"{BOOTSTRAP_CONFIDENCE:.0%} interval: {interval[0]:.1f}% to {interval[1]:.1f}%")
 
                             with col2:
                                 # Create a gauge chart for overall score
-                                fig = go.Figure(go.Indicator(
-                                    mode="gauge+number",
-                                    value=overall_score,
-                                    domain={'x': [0, 1], 'y': [0, 1]},
-                                    title={'text': "Conservative Policy Alignment"},
-                                    gauge={
-                                        'axis': {'range': [0, 100]},
-                                        'bar': {'color': "darkblue"},
-                                        'steps': [
-                                            {'range': [0, 25], 'color': "lightblue"},
-                                            {'range': [25, 50], 'color': "cyan"},
-                                            {'range': [50, 75], 'color': "royalblue"},
-                                            {'range': [75, 100], 'color': "darkblue"}
-                                        ],
-                                        'threshold': {
-                                            'line': {'color': "red", 'width': 4},
-                                            'thickness': 0.75,
-                                            'value': overall_score
-                                        }
-                                    }
-                                ))
-
-                                fig.update_layout(
-                                    height=250,
-                                    margin=dict(l=20, r=20, t=50, b=20),
-                                )
-
+                                fig = cached_figure("gauge", overall_score, build_gauge_figure)
                                 st.plotly_chart(fig, use_container_width=True)
 
                             with col3:
@@ -1111,35 +4659,34 @@ def main():
                             # Display category scores with radar chart
                             st.subheader("Alignment by Policy Area")
 
-                            # Prepare data for radar chart
-                            categories = list(alignment_data["category_scores"].keys())
-                            scores = list(alignment_data["category_scores"].values())
-
-                            # Create radar chart
-                            fig = go.Figure()
-
-                            fig.add_trace(go.Scatterpolar(
-                                r=scores,
-                                theta=categories,
-                                fill='toself',
-                                name='Alignment Score'
-                            ))
-
-                            fig.update_layout(
-                                polar=dict(
-                                    radialaxis=dict(
-                                        visible=True,
-                                        range=[0, 100]
-                                    )
-                                ),
-                                showlegend=False
-                            )
-
+                            # Create radar chart with bootstrap confidence bands
+                            score_index = get_score_index()
+                            fig = cached_figure("radar", {
+                                "scores": alignment_data["category_scores"],
+                                "intervals": {
+                                    area: score_index.interval(member_id, area)
+                                    for area in alignment_data["category_scores"]
+                                } if score_index.interval(member_id) else None
+                            }, build_radar_figure)
                             st.plotly_chart(fig, use_container_width=True)
 
+                            # Alignment in each earlier Congress, when shards are configured
+                            career = member_career(member_id) if get_shard_store() is not None else None
+                            if career and career["status"] == "success" and len(career["trend"]) > 1:
+                                st.subheader("Career Alignment Trend")
+                                fig = cached_figure("career", [
+                                    [entry["congress"], entry["overall"]] for entry in career["trend"]
+                                ], build_career_figure)
+                                st.plotly_chart(fig, use_container_width=True)
+                                st.caption(
+                                    f"Career conservative alignment {career['career_overall']:.1f}% across "
+                                    f"{career['total_votes']:,} votes in {len(career['trend'])} Congresses"
+                                )
+
                             # Display detailed analysis
                             st.subheader("Detailed Analysis")
-                            st.markdown(alignment_data["analysis"])
+                            narrative_placeholder = st.empty()
+                            narrative_placeholder.caption("Preparing detailed analysis...")
 
                         with tab2:
                             st.header("Voting Record")
@@ -1149,9 +4696,10 @@ def main():
 
                             if member_votes_data["status"] == "success":
                                 member_votes = member_votes_data["votes"]
+                                st.caption(data_age_caption(member_votes_data))
 
                                 # Get bills data
-                                bills = fetch_congressional_data()["bills"]
+                                bills = fetch_dataset().bills
 
                                 # Create a dataframe of votes
                                 votes_data = []
@@ -1174,6 +4722,7 @@ def main():
                                         })
 
                                 votes_df = pd.DataFrame(votes_data)
+                                session_objects["votes"] = votes_df
 
                                 # Add filter for policy area
                                 vote_policy_filter = st.selectbox(
@@ -1185,6 +4734,21 @@ def main():
                                 if vote_policy_filter != "All":
                                     votes_df = votes_df[votes_df["Categories"].str.contains(vote_policy_filter)]
 
+                                # Keyword search over bill titles and descriptions, best matches first
+                                bill_query = st.text_input(
+                                    "Search bills",
+                                    placeholder="e.g. pipeline, asylum",
+                                    key="bill_search"
+                                )
+                                if bill_query:
+                                    relevance = {
+                                        bill_id.upper(): score
+                                        for bill_id, score in bill_search_index(fetch_dataset()).search(bill_query)
+                                    }
+                                    votes_df = votes_df[votes_df["Bill ID"].isin(relevance)].assign(
+                                        Relevance=lambda df: df["Bill ID"].map(relevance).round(2)
+                                    ).sort_values("Relevance", ascending=False)
+
                                 # Display votes
                                 st.dataframe(votes_df, use_container_width=True)
 
@@ -1206,10 +4770,10 @@ def main():
                                     st.metric("Alignment Percentage", f"{alignment_pct:.1f}%")
 
                                 # Create a pie chart of aligned vs. non-aligned votes
-                                fig = px.pie(
-                                    values=[aligned_votes, total_votes - aligned_votes],
-                                    names=["Conservative Aligned", "Progressive Aligned"],
-                                    title="Vote Alignment"
+                                fig = cached_figure(
+                                    "vote_pie",
+                                    {"aligned": aligned_votes, "total": total_votes},
+                                    build_vote_pie_figure
                                 )
                                 st.plotly_chart(fig, use_container_width=True)
                             else:
@@ -1220,15 +4784,27 @@ def main():
                             with st.spinner("Loading contribution data..."):
                                 contributions = fetch_candidate_contributions(candidate_id)
                                 if contributions and contributions.get("results"):
-                                    contrib_df = pd.DataFrame([
-                                        {
-                                            "Contributor": c.get("contributor_name"),
-                                            "Amount": c.get("contribution_receipt_amount"),
-                                            "Date": c.get("contribution_receipt_date"),
-                                            "Employer": c.get("contributor_employer")
-                                        }
-                                        for c in contributions.get("results")
-                                    ])
+                                    st.caption(data_age_caption(contributions))
+                                    if contributions.get("rejects"):
+                                        excluded = ", ".join(
+                                            f"{stats['count']:,} {reason.replace('_', ' ')} (${stats['amount']:,.2f})"
+                                            for reason, stats in contributions["rejects"].items()
+                                        )
+                                        st.caption(f"Excluded from totals: {excluded}")
+                                    # Straight from the cached columns, without building a dict per record
+                                    contrib_columns = {
+                                        "Contributor": "contributor_name",
+                                        "Amount": "contribution_receipt_amount",
+                                        "Date": "contribution_receipt_date",
+                                        "Employer": "contributor_employer",
+                                        "State": "contributor_state",
+                                        "ZIP": "contributor_zip"
+                                    }
+                                    contrib_values = contribution_fields(contributions["results"], list(contrib_columns.values()))
+                                    contrib_df = pd.DataFrame({
+                                        label: contrib_values[field] for label, field in contrib_columns.items()
+                                    })
+                                    session_objects["contributions"] = contrib_df
 
                                     # Display contributions
                                     st.dataframe(contrib_df)
@@ -1237,35 +4813,23 @@ def main():
                                     st.subheader("Top Contributors")
                                     top_contrib = contrib_df.groupby("Contributor")["Amount"].sum().reset_index().sort_values("Amount", ascending=False).head(10)
 
-                                    fig = px.bar(
-                                        top_contrib,
-                                        x="Contributor",
-                                        y="Amount",
-                                        title="Top 10 Contributors"
-                                    )
+                                    fig = cached_figure("bar", {
+                                        "records": top_contrib.values.tolist(),
+                                        "x": "Contributor",
+                                        "y": "Amount",
+                                        "title": "Top 10 Contributors"
+                                    }, build_bar_figure)
                                     st.plotly_chart(fig, use_container_width=True)
 
                                     # Map contributions to policy areas
                                     st.subheader("Contributions by Policy Area")
 
-                                    # Analyze each contribution for policy interests
-                                    policy_contributions = {policy: 0 for policy in POLICY_AREAS.keys()}
-                                    policy_contributions["other"] = 0
-
-                                    for _, contrib in contrib_df.iterrows():
-                                        interests = map_donor_interests_to_policy(contrib)
-                                        amount = contrib["Amount"]
-
-                                        if interests:
-                                            # Distribute amount equally among interests
-                                            amount_per_interest = amount / len(interests)
-                                            for interest in interests:
-                                                if interest in policy_contributions:
-                                                    policy_contributions[interest] += amount_per_interest
-                                                else:
-                                                    policy_contributions["other"] += amount_per_interest
-                                        else:
-                                            policy_contributions["other"] += amount
+                                    # Totals by policy interest, kept by the sketches built during ingestion
+                                    sketches = contributions.get("sketches")
+                                    if sketches is not None:
+                                        policy_contributions = sketches.area_totals()
+                                    else:
+                                        policy_contributions = donor_area_totals(contributions.get("results"))
 
                                     # Create dataframe for visualization
                                     policy_contrib_df = pd.DataFrame({
@@ -1277,13 +4841,84 @@ def main():
                                     policy_contrib_df = policy_contrib_df.sort_values("Amount", ascending=False)
 
                                     # Create bar chart
-                                    fig = px.bar(
-                                        policy_contrib_df,
-                                        x="Policy Area",
-                                        y="Amount",
-                                        title="Contributions by Policy Area"
-                                    )
+                                    fig = cached_figure("bar", {
+                                        "records": policy_contrib_df.values.tolist(),
+                                        "x": "Policy Area",
+                                        "y": "Amount",
+                                        "title": "Contributions by Policy Area"
+                                    }, build_bar_figure)
                                     st.plotly_chart(fig, use_container_width=True)
+
+                                    # Distinct donors and contribution sizes, answered from the sketches
+                                    if sketches is not None:
+                                        st.subheader("Donor Statistics")
+                                        summary = sketches.summary()
+                                        overall = summary[0]
+                                        col1, col2, col3, col4 = st.columns(4)
+                                        with col1:
+                                            st.metric("Distinct Donors", f"{overall['distinct_donors']:,}")
+                                        with col2:
+                                            st.metric("Median Contribution", f"${overall['median']:,.2f}")
+                                        with col3:
+                                            st.metric("95th Percentile", f"${overall['p95']:,.2f}")
+                                        with col4:
+                                            st.metric("99th Percentile", f"${overall['p99']:,.2f}")
+
+                                        st.dataframe(pd.DataFrame([
+                                            {
+                                                "Policy Area": row["area"],
+                                                "Distinct Donors": row["distinct_donors"],
+                                                "Contributions": row["contributions"],
+                                                "Median": row["median"],
+                                                "95th Percentile": row["p95"],
+                                                "99th Percentile": row["p99"],
+                                                "Largest": row["largest"],
+                                                "Large Outliers": "Yes" if row["has_outliers"] else "No"
+                                            }
+                                            for row in summary
+                                        ]), use_container_width=True)
+                                        st.caption(
+                                            f"Donor counts and percentiles are streaming estimates. Contributions above "
+                                            f"${sketches.outlier_threshold():,.2f} (Q3 + {OUTLIER_IQR_MULTIPLIER} x IQR) "
+                                            "are flagged as large outliers."
+                                        )
+
+                                    # Where the money comes from relative to the member's state and district
+                                    donor_geography = get_donor_geography()
+                                    geography = donor_geography.member(member_id) if donor_geography is not None else None
+                                    if donor_geography is None:
+                                        st.subheader("Donor Geography")
+                                        st.info("Donor geography is being computed for all members; it will appear here shortly.")
+                                    elif geography is not None:
+                                        st.subheader("Donor Geography")
+                                        col1, col2, col3 = st.columns(3)
+                                        with col1:
+                                            st.metric("In-State Share", f"{geography['in_state_share']:.1f}%")
+                                        with col2:
+                                            in_district = geography["in_district_share"]
+                                            st.metric("In-District Share", "n/a" if in_district is None else f"{in_district:.1f}%")
+                                        with col3:
+                                            st.metric("Out-of-State Share", f"{geography['out_of_state_share']:.1f}%")
+
+                                        fig = cached_figure("bar", {
+                                            "records": geography["by_state"][:10],
+                                            "x": "State",
+                                            "y": "Amount",
+                                            "title": "Contributions by Donor State"
+                                        }, build_bar_figure)
+                                        st.plotly_chart(fig, use_container_width=True)
+                                        st.dataframe(
+                                            pd.DataFrame(geography["by_county"][:10], columns=["County", "Amount"]),
+                                            use_container_width=True
+                                        )
+
+                                        with st.expander("In-state share for all members"):
+                                            if donor_geography.missing:
+                                                directory = member_directory()
+                                                names = ", ".join(directory.get(m, {}).get("name", m) for m in donor_geography.missing)
+                                                st.warning(f"Contributions could not be fetched for {len(donor_geography.missing)} "
+                                                           f"member(s), so they are not listed: {names}")
+                                            st.dataframe(pd.DataFrame(donor_geography.table()), use_container_width=True)
                                 else:
                                     st.warning("No contribution data available")
 
@@ -1292,7 +4927,7 @@ def main():
 
                             # Analyze correlation between contributions and voting patterns
                             with st.spinner("Analyzing correlation..."):
-                                correlation = match_contributions_to_votes(candidate_id, member_id, fetch_congressional_data())
+                                correlation = match_contributions_to_votes(candidate_id, member_id, fetch_dataset())
 
                                 if correlation["status"] == "success":
                                     # Display overall correlation
@@ -1306,36 +4941,26 @@ def main():
                                     st.subheader("Correlation by Policy Area")
 
                                     # Prepare data for visualization
-                                    policy_data = []
-                                    for policy, data in correlation["interest_alignment"].items():
-                                        if data["total_contributions"] > 0:
-                                            policy_data.append({
-                                                "Policy Area": policy.capitalize(),
-                                                "Alignment": data["alignment_percentage"],
-                                                "Contributions": data["total_contributions"],
-                                                "Size": np.log1p(data["total_contributions"])  # Log scale for better visualization
-                                            })
-
-                                    policy_corr_df = pd.DataFrame(policy_data)
-
-                                    if not policy_corr_df.empty:
-                                        # Create bubble chart
-                                        fig = px.scatter(
-                                            policy_corr_df,
-                                            x="Contributions",
-                                            y="Alignment",
-                                            size="Size",
-                                            color="Policy Area",
-                                            hover_name="Policy Area",
-                                            size_max=60,
-                                            title="Contribution Amount vs. Voting Alignment by Policy Area"
-                                        )
+                                    policy_data = correlation_chart_records(correlation)
 
-                                        fig.update_layout(
-                                            xaxis_title="Contribution Amount ($)",
-                                            yaxis_title="Conservative Voting Alignment (%)"
-                                        )
+                                    # Optionally plot every member's policy areas on the same chart
+                                    show_all_members = st.checkbox(
+                                        "Compare with all members",
+                                        key="correlation_all_members"
+                                    )
+                                    if show_all_members:
+                                        policy_data = []
+                                        dataset = fetch_dataset()
+                                        for other in fetch_candidate_data().get("results", []):
+                                            other_correlation = match_contributions_to_votes(
+                                                other["candidate_id"], other["bioguide_id"], dataset
+                                            )
+                                            if other_correlation["status"] == "success":
+                                                policy_data.extend(correlation_chart_records(other_correlation, other["name"]))
 
+                                    if policy_data:
+                                        # Create bubble chart
+                                        fig = cached_figure("correlation", policy_data, build_correlation_figure)
                                         st.plotly_chart(fig, use_container_width=True)
 
                                         # Display detailed breakdown
@@ -1355,6 +4980,12 @@ def main():
                                         st.info("No policy-specific contribution data available for analysis")
                                 else:
                                     st.warning("Unable to analyze correlation between contributions and voting patterns")
+
+                        with tab5:
+                            render_date_range_tab(member_id, candidate_id)
+
+                        # Stream the narrative last, once every tab has been drawn
+                        render_narrative(narrative_placeholder, member_id, alignment_data, score_index.version)
                 else:
                     st.warning("No candidates found matching your search and filter criteria")
             else:
@@ -1371,5 +5002,31 @@ def main():
             st.write(details["description"])
             st.markdown("---")
 
+    # Display upstream fetch, request coalescing and rate limiter metrics
+    with st.sidebar.expander("Fetch Metrics"):
+        fetch_stats = get_single_flight().snapshot()
+        if fetch_stats:
+            st.dataframe(pd.DataFrame.from_dict(fetch_stats, orient="index"), use_container_width=True)
+        else:
+            st.caption("No upstream fetches yet")
+        st.dataframe(pd.DataFrame.from_dict(get_request_scheduler().snapshot(), orient="index"),
+                     use_container_width=True)
+        st.json(memory_stats())
+        st.json(warmer.status())
+
+    record_session_memory(session_objects)
+
 if __name__ == "__main__":
-    main()
+    # python resist.py export-snapshot PATH writes an offline snapshot bundle
+    if len(sys.argv) == 3 and sys.argv[1] == "export-snapshot":
+        summary = export_snapshot(sys.argv[2])
+        print(json.dumps(summary, indent=2))
+        sys.exit(0 if summary["status"] == "success" else 1)
+    # python resist.py export-shard DIR [CONGRESS] adds a Congress to a shard directory
+    elif len(sys.argv) in (3, 4) and sys.argv[1] == "export-shard":
+        congress_number = int(sys.argv[3]) if len(sys.argv) == 4 else SAMPLE_CONGRESS
+        summary = export_shard(sys.argv[2], congress_number)
+        print(json.dumps(summary, indent=2))
+        sys.exit(0 if summary["status"] == "success" else 1)
+    else:
+        main()
@@ -0,0 +1,199 @@
+"""Streaming parser for House Clerk and Senate roll-call vote XML
+
+Each roll call is one XML document. Files are read incrementally with iterparse,
+so memory stays flat however many legislators a file lists, and vote codes are
+written straight into a members x roll-calls int8 matrix. A directory is split
+across worker processes that fill their columns of a shared-memory matrix.
+
+Lives outside resist.py so worker processes can import it by name.
+"""
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context, shared_memory
+from xml.etree.ElementTree import iterparse
+
+import numpy as np
+
+# Same codes as the vote matrix in resist.py; "Not Voting" leaves the cell empty
+VOTE_NONE = 0
+VOTE_YES = 1
+VOTE_NO = 2
+VOTE_OTHER = 3
+VOTE_CAST_CODES = {
+    "yea": VOTE_YES, "aye": VOTE_YES, "yes": VOTE_YES,
+    "nay": VOTE_NO, "no": VOTE_NO,
+    "not voting": VOTE_NONE
+}
+
+# Roll calls per task handed to a worker process
+CHUNK_SIZE = 64
+
+def bill_id_from_legis_num(legis_num):
+    """Normalize "H R 1", "H.R. 1" or "S. J. Res. 7" to the app's bill_id form ("hr1", "sjres7")"""
+    return re.sub(r"[^a-z0-9]", "", (legis_num or "").lower())
+
+def parse_vote_date(text):
+    """ISO date of a House ("3-Jan-2023") or Senate ("January 3, 2023, 12:44 PM") vote"""
+    text = (text or "").strip()
+    for fmt in ("%d-%b-%Y", "%B %d, %Y, %I:%M %p", "%B %d, %Y"):
+        try:
+            return datetime.strptime(text, fmt).date().isoformat()
+        except ValueError:
+            continue
+    return ""
+
+def load_legislator_ids(path):
+    """Map Senate LIS ids to bioguide ids from a congress-legislators JSON file"""
+    with open(path, encoding="utf-8") as f:
+        legislators = json.load(f)
+    return {
+        person["id"]["lis"]: person["id"]["bioguide"]
+        for person in legislators
+        if person.get("id", {}).get("lis") and person["id"].get("bioguide")
+    }
+
+def parse_rollcall(path, member_rows, column, id_map=None):
+    """Parse one roll-call file, writing each legislator's vote code into column
+
+    member_rows maps bioguide_id to matrix row. House files identify legislators by
+    bioguide id directly; Senate files use LIS ids, translated through id_map.
+    Returns the roll call's metadata with counts of recorded and unmatched votes.
+    """
+    id_map = id_map or {}
+    meta = {"file": os.path.basename(path), "chamber": "", "congress": 0, "session": "",
+            "number": 0, "date": "", "bill_id": "", "question": "", "recorded": 0, "unmatched": 0}
+    senate_document = {}
+    member_id = cast = container = None
+
+    for event, elem in iterparse(path, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            if tag in ("vote-data", "members"):
+                container = elem
+            continue
+        text = (elem.text or "").strip()
+
+        # House Clerk: <recorded-vote><legislator name-id="A000370" .../><vote>Yea</vote></recorded-vote>
+        # Senate: <member><vote_cast>Yea</vote_cast><lis_member_id>S354</lis_member_id></member>
+        if tag == "legislator":
+            member_id = elem.get("name-id")
+        elif tag in ("vote", "vote_cast"):
+            cast = text
+        elif tag == "lis_member_id":
+            member_id = id_map.get(text)
+        elif tag in ("recorded-vote", "member"):
+            row = member_rows.get(member_id)
+            if row is None:
+                meta["unmatched"] += 1
+            else:
+                column[row] = VOTE_CAST_CODES.get(cast.lower(), VOTE_OTHER) if cast else VOTE_NONE
+                meta["recorded"] += 1
+            member_id = cast = None
+            # Drop parsed records so memory stays flat
+            elem.clear()
+            if container is not None:
+                container.clear()
+
+        # Roll-call metadata, which precedes the votes in both formats
+        elif tag == "chamber":
+            meta["chamber"] = "house" if "house" in text.lower() else text.lower()
+        elif tag == "congress":
+            meta["congress"] = int(text) if text.isdigit() else 0
+        elif tag == "session":
+            meta["session"] = text
+        elif tag in ("rollcall-num", "vote_number"):
+            meta["number"] = int(text) if text.isdigit() else 0
+        elif tag in ("action-date", "vote_date"):
+            meta["date"] = parse_vote_date(text)
+        elif tag == "legis-num":
+            meta["bill_id"] = bill_id_from_legis_num(text)
+        elif tag in ("vote-question", "vote_question_text"):
+            meta["question"] = text
+        elif tag in ("document_type", "document_number"):
+            senate_document[tag] = text
+        elif tag == "roll_call_vote":
+            meta["chamber"] = "senate"
+
+    if not meta["bill_id"] and senate_document:
+        meta["bill_id"] = bill_id_from_legis_num(
+            senate_document.get("document_type", "") + senate_document.get("document_number", "")
+        )
+    return meta
+
+def _parse_chunk(shm_name, shape, paths, first_column, member_rows, id_map):
+    """Worker task: parse a run of files into their columns of the shared matrix"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        matrix = np.ndarray(shape, dtype=np.int8, buffer=shm.buf)
+        results = []
+        for offset, path in enumerate(paths):
+            meta = parse_rollcall(path, member_rows, matrix[:, first_column + offset], id_map)
+            meta["column"] = first_column + offset
+            results.append(meta)
+        del matrix
+        return results
+    finally:
+        shm.close()
+
+def rollcall_files(directory):
+    """Roll-call XML files in a directory, in name order"""
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.lower().endswith(".xml")
+    )
+
+def parse_rollcall_directory(directory, member_ids, id_map=None, workers=None):
+    """Parse every roll-call file in a directory into a members x roll-calls matrix
+
+    Columns follow file name order; the returned metadata gives each column's chamber,
+    number, date and bill. Files are split across worker processes when there is
+    more than a chunk of them.
+    """
+    paths = rollcall_files(directory)
+    member_rows = {member_id: i for i, member_id in enumerate(member_ids)}
+    shape = (len(member_ids), len(paths))
+    workers = max(1, min(workers or os.cpu_count() or 1, -(-len(paths) // CHUNK_SIZE)))
+
+    if workers == 1:
+        matrix = np.zeros(shape, dtype=np.int8)
+        rollcalls = []
+        for col, path in enumerate(paths):
+            meta = parse_rollcall(path, member_rows, matrix[:, col], id_map)
+            meta["column"] = col
+            rollcalls.append(meta)
+        return {"member_ids": list(member_ids), "rollcalls": rollcalls, "matrix": matrix}
+
+    shm = shared_memory.SharedMemory(create=True, size=max(1, shape[0] * shape[1]))
+    try:
+        shared = np.ndarray(shape, dtype=np.int8, buffer=shm.buf)
+        shared[:] = VOTE_NONE
+        # Spawn rather than fork: the app that calls this runs server and cache threads
+        with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn")) as pool:
+            futures = [
+                pool.submit(_parse_chunk, shm.name, shape, paths[start:start + CHUNK_SIZE],
+                            start, member_rows, id_map or {})
+                for start in range(0, len(paths), CHUNK_SIZE)
+            ]
+            rollcalls = [meta for future in futures for meta in future.result()]
+        matrix = shared.copy()
+        del shared
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return {"member_ids": list(member_ids), "rollcalls": rollcalls, "matrix": matrix}
+
+def latest_rollcall_columns(rollcalls):
+    """Column of the most recent roll call on each bill in each chamber, e.g. final passage
+
+    Keyed by (chamber, bill_id): a bill voted on in both chambers keeps a column for
+    each, so members of the chamber that voted first don't lose their vote on it.
+    """
+    columns = {}
+    for meta in sorted(rollcalls, key=lambda m: (m["date"], m["number"])):
+        if meta["bill_id"]:
+            columns[(meta["chamber"], meta["bill_id"])] = meta["column"]
+    return columns
@@ -0,0 +1,11 @@
+import os
+import sys
+import warnings
+
+# Tests import the app modules from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+warnings.filterwarnings("ignore")
+from streamlit import config, logger
+config.set_option("logger.level", "error")  # Bare-mode cache warnings are expected outside Streamlit
+logger.set_log_level("error")
@@ -0,0 +1,42 @@
+import pytest
+
+import resist
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    resist.get_fetch_cache.clear()
+    resist.get_analysis_cache.clear()
+    yield
+    resist.get_fetch_cache.clear()
+    resist.get_analysis_cache.clear()
+
+def evict_fetches():
+    """Drop every fetch result, as budget eviction would, so the next fetch reloads it"""
+    resist.get_fetch_cache.clear()
+
+def test_analyses_survive_refetch_of_unchanged_data():
+    dataset = resist.fetch_dataset()
+    pattern = resist.analyze_voting_pattern("R000600", dataset)
+    match = resist.match_contributions_to_votes("H0TX01123", "R000600", dataset)
+    alignment = resist.calculate_policy_alignment("R000600", dataset)
+
+    evict_fetches()
+    assert resist.analyze_voting_pattern("R000600", dataset) is pattern
+    assert resist.match_contributions_to_votes("H0TX01123", "R000600", dataset) is match
+    assert resist.calculate_policy_alignment("R000600", dataset) is alignment
+
+def test_changed_votes_are_analyzed_again(monkeypatch):
+    dataset = resist.fetch_dataset()
+    pattern = resist.analyze_voting_pattern("R000600", dataset)
+
+    load = resist.load_member_votes
+
+    def flipped(member_id, congress_number=resist.SAMPLE_CONGRESS):
+        result = load(member_id, congress_number)
+        return dict(result, votes={bill_id: "no" for bill_id in result["votes"]})
+
+    monkeypatch.setattr(resist, "load_member_votes", flipped)
+    evict_fetches()
+    changed = resist.analyze_voting_pattern("R000600", dataset)
+    assert changed is not pattern
+    assert changed["conservative_aligned_votes"] != pattern["conservative_aligned_votes"]
@@ -0,0 +1,59 @@
+import http.client
+import threading
+
+import pytest
+
+import api
+
+@pytest.mark.parametrize("header, expected", [
+    ('"v1-abc"', True),
+    ('"v0-xyz", "v1-abc"', True),
+    ('W/"v1-abc"', True),
+    ("*", True),
+    ('"v1-abcd"', False),
+    ('"v1-ab"', False),
+    ("", False),
+])
+def test_etag_matches(header, expected):
+    assert api.etag_matches(header, '"v1-abc"') is expected
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip", True),
+    ("gzip, deflate, br", True),
+    ("gzip;q=0", False),
+    ("gzip; q=0.0, deflate", False),
+    ("deflate, gzip;q=0.5", True),
+    ("*", True),
+    ("*;q=0", False),
+    ("*, gzip;q=0", False),
+    ("identity", False),
+    ("", False),
+])
+def test_accepts_gzip(header, expected):
+    assert api.accepts_gzip(header) is expected
+
+@pytest.fixture
+def server():
+    server = api.make_server(port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def get(server, path, headers):
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=10)
+    connection.request("GET", path, headers=headers)
+    response = connection.getresponse()
+    response.read()
+    connection.close()
+    return response
+
+def test_conditional_and_compressed_responses(server):
+    first = get(server, "/delegations", {"Accept-Encoding": "gzip"})
+    etag = first.getheader("ETag")
+    assert first.status == 200 and first.getheader("Content-Encoding") == "gzip"
+
+    assert get(server, "/delegations", {"If-None-Match": f'"other", {etag}'}).status == 304
+    assert get(server, "/delegations", {"If-None-Match": "*"}).status == 304
+    assert get(server, "/delegations", {"If-None-Match": etag[:-2] + '"'}).status == 200
+    assert get(server, "/delegations", {"Accept-Encoding": "gzip;q=0"}).getheader("Content-Encoding") is None
@@ -0,0 +1,57 @@
+import math
+from collections import Counter
+
+import pytest
+
+import resist
+
+BILLS = [
+    {"bill_id": "hr1-118", "title": "Energy Pipeline Permits", "description": "Speeds up permits for pipelines and refineries."},
+    {"bill_id": "hr2-118", "title": "Border Security", "description": "Funds asylum processing and border patrols."},
+    {"bill_id": "hr3-118", "title": "Clean Energy Credits", "description": "Tax credits for solar and wind energy."},
+    {"bill_id": "hr4-118", "title": "Hospital Funding", "description": "Grants for rural hospitals and clinics."},
+]
+
+def bm25(query, bills):
+    """Scores by the textbook BM25 formula, computed bill by bill"""
+    documents = []
+    for bill in bills:
+        counts = Counter(resist.search_terms(bill["title"]) * resist.BM25_TITLE_WEIGHT)
+        counts.update(resist.search_terms(bill["description"]))
+        documents.append(counts)
+    avg_length = sum(sum(d.values()) for d in documents) / len(documents)
+    scores = {}
+    for bill, counts in zip(bills, documents):
+        score = 0.0
+        for term in set(resist.search_terms(query)):
+            matching = sum(1 for d in documents if term in d)
+            if not counts[term]:
+                continue
+            idf = math.log(1 + (len(documents) - matching + 0.5) / (matching + 0.5))
+            norm = resist.BM25_K1 * (1 - resist.BM25_B + resist.BM25_B * sum(counts.values()) / avg_length)
+            score += idf * counts[term] * (resist.BM25_K1 + 1) / (counts[term] + norm)
+        if score:
+            scores[bill["bill_id"]] = score
+    return scores
+
+@pytest.fixture
+def index():
+    return resist.BillSearchIndex.build(BILLS)
+
+@pytest.mark.parametrize("query", ["energy", "pipeline permits", "hospitals", "energy border", "the of and"])
+def test_scores_match_reference_bm25(index, query):
+    results = index.search(query)
+    assert dict(results) == pytest.approx(bm25(query, BILLS), rel=1e-5)
+    assert [score for _, score in results] == sorted((score for _, score in results), reverse=True)
+
+def test_plurals_match_singulars(index):
+    assert [bill_id for bill_id, _ in index.search("pipeline")] == ["hr1-118"]
+    assert [bill_id for bill_id, _ in index.search("hospitals")] == ["hr4-118"]
+
+def test_top_k_keeps_the_best(index):
+    assert index.search("energy border asylum", k=1) == index.search("energy border asylum")[:1]
+
+def test_saved_index_searches_the_same(index, tmp_path):
+    path = str(tmp_path / "index.npz")
+    index.save(path)
+    assert resist.BillSearchIndex.load(path).search("clean energy credits") == index.search("clean energy credits")
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+import resist
+
+@pytest.fixture
+def votes():
+    rng = np.random.default_rng(3)
+    bills = [
+        {"bill_id": f"hr{i}-118", "policy_alignment": ["conservative", "progressive"][i % 2],
+         "categories": [resist.POLICY_AREA_KEYS[i % len(resist.POLICY_AREA_KEYS)]]}
+        for i in range(60)
+    ]
+    dataset = resist.DatasetHandle(bills)
+    matrix = rng.choice([resist.VOTE_NONE, resist.VOTE_CODES["yes"], resist.VOTE_CODES["no"]],
+                        size=(5, len(bills)), p=[0.1, 0.5, 0.4]).astype(np.int8)
+    return dataset, matrix
+
+def test_overall_interval_matches_a_per_replicate_loop(votes):
+    dataset, matrix = votes
+    intervals = resist.bootstrap_alignment_intervals(matrix, dataset, replicates=200, seed=11)
+
+    # The overall column is resampled first, so the same seed draws the same roll calls
+    signs, _ = dataset.alignment_arrays
+    voted = matrix != resist.VOTE_NONE
+    conservative = resist.conservative_vote_mask(matrix, signs)
+    draws = np.random.default_rng(11).integers(0, len(dataset), size=(200, len(dataset)))
+    for member in range(len(matrix)):
+        rates = [conservative[member, draw].sum() / voted[member, draw].sum() * 100 for draw in draws]
+        low, high = np.percentile(rates, [2.5, 97.5])
+        assert intervals["low"][member, 0] == pytest.approx(low)
+        assert intervals["high"][member, 0] == pytest.approx(high)
+
+def test_intervals_bracket_the_scores(votes):
+    dataset, matrix = votes
+    intervals = resist.bootstrap_alignment_intervals(matrix, dataset, replicates=500)
+    scores = resist.score_vote_matrix(matrix, dataset)
+    point = np.column_stack([scores["overall"], scores["category_scores"]])
+    assert (intervals["low"] <= point + 1e-9).all() and (point <= intervals["high"] + 1e-9).all()
+
+def test_same_seed_gives_same_intervals(votes):
+    dataset, matrix = votes
+    first = resist.bootstrap_alignment_intervals(matrix, dataset, seed=5)
+    second = resist.bootstrap_alignment_intervals(matrix, dataset, seed=5)
+    assert np.array_equal(first["low"], second["low"]) and np.array_equal(first["high"], second["high"])
@@ -0,0 +1,24 @@
+import pytest
+
+import resist
+
+@pytest.fixture
+def candidates():
+    return resist.fetch_candidate_data()["results"]
+
+def test_each_candidate_gets_votes_and_contributions(candidates):
+    votes, contributions = resist.fetch_comparison_data(candidates)
+    assert set(votes) == {c["bioguide_id"] for c in candidates}
+    assert set(contributions) == {c["candidate_id"] for c in candidates}
+    assert all(result["status"] == "success" for result in [*votes.values(), *contributions.values()])
+
+def test_comparison_matches_single_member_analysis(candidates):
+    dataset = resist.fetch_dataset()
+    comparison = resist.compare_members(candidates, dataset)
+    assert [row["Name"] for row in comparison["table"]] == [c["name"] for c in candidates]
+
+    for candidate, row in zip(candidates, comparison["table"]):
+        alignment = resist.calculate_policy_alignment(candidate["bioguide_id"], dataset)
+        assert row["Overall Alignment"] == pytest.approx(alignment["overall_score"], abs=0.05)
+        donations = resist.donor_area_totals(resist.fetch_candidate_contributions(candidate["candidate_id"])["results"])
+        assert row["Total Donations"] == pytest.approx(sum(donations.values()))
@@ -0,0 +1,30 @@
+import pytest
+
+import resist
+
+RECORDS = [
+    {"contributor_name": "Alice", "contributor_employer": "Oil Co", "contributor_state": "TX", "contributor_zip": "75001",
+     "contribution_receipt_date": "2023-05-15", "committee_id": "C1", "sub_id": "1", "contribution_receipt_amount": 500.0},
+    {"contributor_name": "Bob", "contributor_employer": None, "contributor_state": "CA", "contributor_zip": "90001",
+     "contribution_receipt_date": "2023-06-01", "committee_id": "C1", "sub_id": "2", "contribution_receipt_amount": 250.0},
+    {"contributor_name": "Alice", "contributor_employer": "Hospital", "contributor_state": "TX", "contributor_zip": "75001",
+     "contribution_receipt_date": "2023-07-04", "committee_id": "C1", "sub_id": "3", "contribution_receipt_amount": 100.0},
+]
+
+@pytest.fixture
+def columns():
+    return resist.ContributionColumns.encode(RECORDS)
+
+def test_indexing_matches_iteration(columns):
+    records = list(columns)
+    assert [columns[i] for i in range(len(columns))] == records
+    assert columns[-1] == records[-1]
+    assert columns[1:] == records[1:]
+    assert columns[1]["contributor_employer"] is None
+    with pytest.raises(IndexError):
+        columns[len(columns)]
+
+def test_donor_area_totals_agree_for_lists_and_columns(columns):
+    from_list = resist.donor_area_totals(RECORDS)
+    assert resist.donor_area_totals(columns) == pytest.approx(from_list)
+    assert sum(from_list.values()) == pytest.approx(850.0)
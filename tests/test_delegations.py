@@ -0,0 +1,44 @@
+import pytest
+
+import resist
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    resist.get_fetch_cache.clear()
+    resist.get_delegation_cache.clear()
+    yield
+    resist.get_fetch_cache.clear()
+    resist.get_delegation_cache.clear()
+
+def test_party_totals_cover_every_member():
+    aggregates = resist.get_delegation_aggregates()
+    assert aggregates.missing == []
+    rows = {row["Party"]: row for row in aggregates.table("Party")}
+    assert rows["DEM"]["Members"] == 2 and rows["REP"]["Members"] == 2
+    assert resist.get_delegation_aggregates() is aggregates
+
+def test_failed_contribution_fetch_is_reported(monkeypatch):
+    load = resist.load_candidate_contributions
+
+    def failing(candidate_id, congress_number=resist.SAMPLE_CONGRESS):
+        if candidate_id == "H0TX01123":
+            raise RuntimeError("FEC unavailable")
+        return load(candidate_id, congress_number)
+
+    monkeypatch.setattr(resist, "load_candidate_contributions", failing)
+    aggregates = resist.get_delegation_aggregates()
+    assert aggregates.missing == ["R000600"]
+
+    # Once the fetch succeeds the donations change, and so does the cache key
+    monkeypatch.setattr(resist, "load_candidate_contributions", load)
+    refreshed = resist.get_delegation_aggregates()
+    assert refreshed is not aggregates and refreshed.missing == []
+    totals = {row["Party"]: row["Total Donations"] for row in refreshed.table("Party")}
+    assert totals["REP"] > {row["Party"]: row["Total Donations"] for row in aggregates.table("Party")}["REP"]
+
+def test_fetch_version_tracks_content():
+    first = resist.fetch_candidate_contributions("H0TX01123")
+    resist.get_fetch_cache.clear()
+    again = resist.fetch_candidate_contributions("H0TX01123")
+    assert first["version"] == again["version"]
+    assert first["version"] != resist.fetch_candidate_contributions("H0CA12456")["version"]
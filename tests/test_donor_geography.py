@@ -0,0 +1,45 @@
+import pytest
+
+import resist
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    resist.get_fetch_cache.clear()
+    yield
+    resist.get_fetch_cache.clear()
+
+def test_shares_add_up_for_every_member():
+    builder = resist.DonorGeographyBuilder()
+    builder.build()
+    geography = builder.geography
+    assert geography.missing == []
+    for member_id in geography.member_ids:
+        member = geography.member(member_id)
+        assert member["in_state"] <= member["total"]
+        assert sum(amount for _, amount in member["by_state"]) == pytest.approx(member["total"])
+
+def test_failed_fetch_is_missing_and_rebuilt(monkeypatch):
+    load = resist.load_candidate_contributions
+
+    def failing(candidate_id, congress_number=resist.SAMPLE_CONGRESS):
+        if candidate_id == "H0TX01123":
+            raise RuntimeError("FEC unavailable")
+        return load(candidate_id, congress_number)
+
+    monkeypatch.setattr(resist, "load_candidate_contributions", failing)
+    builder = resist.DonorGeographyBuilder()
+    builder.build()
+    partial = builder.geography
+    assert partial.missing == ["R000600"] and partial.member("R000600") is None
+
+    # Unchanged versions keep the build; a successful refetch replaces it
+    builder.build()
+    assert builder.geography is partial
+    monkeypatch.setattr(resist, "load_candidate_contributions", load)
+    builder.build()
+    assert builder.geography.missing == [] and builder.geography.member("R000600") is not None
+
+def test_readers_get_none_until_the_first_build():
+    builder = resist.DonorGeographyBuilder()
+    builder.building = True  # A build is already running
+    assert builder.get() is None
@@ -0,0 +1,56 @@
+import resist
+
+def donations(count):
+    return [{"contributor_name": f"Donor {i}", "contributor_employer": "Bank", "contribution_receipt_amount": float(i)}
+            for i in range(count)]
+
+def test_estimate_size_counts_sketch_buffers():
+    sketches = resist.ContributionSketches()
+    sketches.ingest(donations(5))
+    registers = sum(sketch.registers.nbytes for sketch in sketches.donors.values())
+    assert resist.estimate_size(sketches) > registers
+
+def test_estimate_size_counts_dataset_memos():
+    dataset = resist.DatasetHandle([{"bill_id": f"hr{i}-118", "vote_date": "2023-01-01"} for i in range(500)])
+    before = resist.estimate_size(dataset)
+    dataset.bill_index
+    assert resist.estimate_size(dataset) > before
+
+def blob(size):
+    return lambda: {"payload": "x" * size, "status": "success"}
+
+def test_entries_stay_within_the_memory_budget():
+    cache = resist.FetchCache(memory_budget=20_000)
+    for i in range(10):
+        cache.fetch("fec", ("fetch_test", i), blob(4_000))
+    stats = cache.snapshot()
+    assert stats["bytes"] <= 20_000 and stats["evictions"] > 0
+    assert stats["bytes"] == sum(entry["size"] for entry in cache.entries.values())
+
+def test_evicts_the_least_used_of_the_oldest_entries():
+    cache = resist.FetchCache(memory_budget=10_000)
+    cache.fetch("fec", ("fetch_test", "popular"), blob(4_000))
+    for _ in range(3):
+        cache.fetch("fec", ("fetch_test", "popular"), blob(4_000))
+    cache.fetch("fec", ("fetch_test", "once"), blob(4_000))
+    cache.fetch("fec", ("fetch_test", "new"), blob(4_000))
+    assert list(cache.entries) == [("fetch_test", "popular"), ("fetch_test", "new")]
+
+def test_oversize_value_is_served_but_not_cached():
+    cache = resist.FetchCache(memory_budget=1_000)
+    assert cache.fetch("fec", ("fetch_test", "big"), blob(5_000))["status"] == "success"
+    assert not cache.entries and cache.snapshot()["oversize"] == 1
+
+def test_session_memory_drops_idle_sessions(monkeypatch):
+    tracker = resist.SessionMemoryTracker(idle_timeout=60)
+    tracker.record("session-a", {"rows": list(range(1000))})
+    tracker.record("session-b", {"rows": []})
+    snapshot = tracker.snapshot()
+    assert snapshot["sessions"] == 2
+    assert snapshot["largest"][0]["bytes"] == snapshot["bytes"] - snapshot["largest"][1]["bytes"]
+    assert snapshot["largest"][0]["bytes"] > snapshot["largest"][1]["bytes"]
+
+    now = resist.time.time()
+    monkeypatch.setattr(resist.time, "time", lambda: now + 120)
+    tracker.record("session-b", {"rows": []})
+    assert tracker.snapshot()["sessions"] == 1
@@ -0,0 +1,26 @@
+import pytest
+
+import resist
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    resist.get_figure_cache.clear()
+    yield
+    resist.get_figure_cache.clear()
+
+def bar(count):
+    return {"records": [[f"S{i}", float(i)] for i in range(count)], "x": "State", "y": "Amount", "title": "Totals"}
+
+def test_hits_return_the_cached_figure():
+    figure = resist.cached_figure("bar", bar(10), resist.build_bar_figure)
+    assert resist.cached_figure("bar", bar(10), resist.build_bar_figure) is figure
+    assert resist.get_figure_cache()["bytes"] > 0
+
+def test_evicts_oldest_figures_over_byte_budget(monkeypatch):
+    figure = resist.build_bar_figure(bar(50))
+    size = resist.estimate_size([figure._data, figure._layout])
+    monkeypatch.setattr(resist, "FIGURE_CACHE_MAX_BYTES", int(size * 2.5))
+    for title in ["A", "B", "C"]:
+        resist.cached_figure("bar", dict(bar(50), title=title), resist.build_bar_figure)
+    cache = resist.get_figure_cache()
+    assert len(cache["specs"]) == 2 and cache["bytes"] <= resist.FIGURE_CACHE_MAX_BYTES
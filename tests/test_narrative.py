@@ -0,0 +1,108 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import resist
+
+class FakeModel:
+    """Local stand-in for genai.GenerativeModel that streams fixed chunks
+
+    Each chunk arrives `delay` seconds after the previous one; with `fail` set the
+    stream raises after its chunks.
+    """
+
+    def __init__(self, chunks, delay=0.0, fail=False):
+        self.chunks = chunks
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+
+    async def generate_content_async(self, prompt, stream=True):
+        self.calls += 1
+        return self._stream()
+
+    async def _stream(self):
+        for text in self.chunks:
+            await asyncio.sleep(self.delay)
+            yield SimpleNamespace(text=text)
+        if self.fail:
+            raise RuntimeError("model error")
+
+def generator(tmp_path, model, timeout=1.0, generation_limit=10.0):
+    return resist.NarrativeGenerator(model, cache_dir=str(tmp_path), timeout=timeout,
+                                     generation_limit=generation_limit)
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+def test_streams_growing_text_and_caches_it(tmp_path):
+    model = FakeModel(["Alpha ", "beta ", "gamma"], delay=0.01)
+    narratives = generator(tmp_path, model)
+
+    assert list(narratives.stream("key", "prompt", "fallback")) == ["Alpha ", "Alpha beta ", "Alpha beta gamma"]
+    assert wait_for(lambda: narratives.cached("key") == "Alpha beta gamma")
+
+    # Served from the persistent cache, by a new generator too
+    assert list(generator(tmp_path, model).stream("key", "prompt", "fallback")) == ["Alpha beta gamma"]
+    assert model.calls == 1
+
+def test_timeout_restarts_with_each_chunk(tmp_path):
+    # Takes well over the timeout in total, but no gap between chunks exceeds it
+    model = FakeModel([f"{i} " for i in range(8)], delay=0.1)
+    narratives = generator(tmp_path, model, timeout=0.4)
+
+    assert list(narratives.stream("key", "prompt", "fallback"))[-1] == "0 1 2 3 4 5 6 7 "
+
+def test_stalled_generation_falls_back_and_is_cached_later(tmp_path):
+    model = FakeModel(["late"], delay=0.5)
+    narratives = generator(tmp_path, model, timeout=0.1)
+
+    started = time.monotonic()
+    assert list(narratives.stream("key", "prompt", "fallback")) == ["fallback"]
+    assert time.monotonic() - started < 0.4
+    assert wait_for(lambda: narratives.cached("key") == "late")
+
+def test_failed_generation_falls_back_without_caching(tmp_path):
+    narratives = generator(tmp_path, FakeModel(["partial"], fail=True))
+
+    assert list(narratives.stream("key", "prompt", "fallback"))[-1] == "fallback"
+    assert narratives.cached("key") is None
+
+def test_generation_limit_abandons_slow_streams(tmp_path):
+    narratives = generator(tmp_path, FakeModel(["a", "b", "c"], delay=0.1), timeout=1.0, generation_limit=0.15)
+
+    assert list(narratives.stream("key", "prompt", "fallback"))[-1] == "fallback"
+    assert narratives.cached("key") is None
+
+def test_concurrent_requests_share_one_generation(tmp_path):
+    model = FakeModel(["shared ", "text"], delay=0.05)
+    narratives = generator(tmp_path, model)
+    results = []
+
+    def read():
+        results.append(list(narratives.stream("key", "prompt", "fallback"))[-1])
+
+    threads = [threading.Thread(target=read) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["shared text"] * 5
+    assert model.calls == 1
+
+def test_failed_cache_write_still_finishes_the_stream(tmp_path, monkeypatch):
+    narratives = generator(tmp_path, FakeModel(["whole ", "story"], delay=0.01), timeout=0.5)
+
+    def full_disk(key, narrative):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(narratives, "_store", full_disk)
+    started = time.monotonic()
+    assert list(narratives.stream("key", "prompt", "fallback"))[-1] == "whole story"
+    assert time.monotonic() - started < 0.4
+    assert wait_for(lambda: not narratives._flights)
@@ -0,0 +1,83 @@
+import os
+
+import numpy as np
+import pytest
+
+import resist
+import rollcall
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+ROLLCALL_DIR = os.path.join(FIXTURES, "rollcall")
+MEMBER_IDS = ["R000600", "D000622", "R000605", "D000623"]
+
+@pytest.fixture
+def id_map():
+    return rollcall.load_legislator_ids(os.path.join(FIXTURES, "legislators.json"))
+
+def parse(id_map, workers=1):
+    return rollcall.parse_rollcall_directory(ROLLCALL_DIR, MEMBER_IDS, id_map, workers=workers)
+
+def test_load_legislator_ids_skips_members_without_lis_id(id_map):
+    assert id_map == {"S100": "R000605", "S101": "D000623"}
+
+def test_bill_id_and_date_normalization():
+    assert rollcall.bill_id_from_legis_num("H R 1") == "hr1"
+    assert rollcall.bill_id_from_legis_num("S. J. Res. 7") == "sjres7"
+    assert rollcall.parse_vote_date("3-Jan-2023") == "2023-01-03"
+    assert rollcall.parse_vote_date("April 20, 2023, 11:45 AM") == "2023-04-20"
+    assert rollcall.parse_vote_date("") == ""
+
+def test_parse_house_rollcall():
+    column = np.zeros(2, dtype=np.int8)
+    meta = rollcall.parse_rollcall(os.path.join(ROLLCALL_DIR, "house-2023-042.xml"),
+                                   {"R000600": 0, "D000622": 1}, column)
+    assert meta["chamber"] == "house"
+    assert (meta["congress"], meta["number"], meta["date"]) == (118, 42, "2023-03-30")
+    assert meta["bill_id"] == "hr1"
+    assert meta["question"] == "On Passage"
+    assert (meta["recorded"], meta["unmatched"]) == (2, 1)
+    assert column.tolist() == [rollcall.VOTE_YES, rollcall.VOTE_NO]
+
+def test_parse_senate_rollcall_translates_lis_ids(id_map):
+    column = np.zeros(2, dtype=np.int8)
+    meta = rollcall.parse_rollcall(os.path.join(ROLLCALL_DIR, "senate-2023-100.xml"),
+                                   {"R000605": 0, "D000623": 1}, column, id_map)
+    assert meta["chamber"] == "senate"
+    assert (meta["number"], meta["date"], meta["bill_id"]) == (100, "2023-04-20", "hr1")
+    assert column.tolist() == [rollcall.VOTE_YES, rollcall.VOTE_OTHER]
+
+def test_not_voting_leaves_cell_empty(id_map):
+    parsed = parse(id_map)
+    column = next(m["column"] for m in parsed["rollcalls"] if m["number"] == 43)
+    assert parsed["matrix"][:, column].tolist() == [rollcall.VOTE_YES, rollcall.VOTE_NONE, 0, 0]
+
+def test_worker_pool_matches_single_process(id_map, monkeypatch):
+    serial = parse(id_map)
+    # One file per task so the four fixtures are spread across worker processes
+    monkeypatch.setattr(rollcall, "CHUNK_SIZE", 1)
+    pooled = parse(id_map, workers=2)
+    assert np.array_equal(pooled["matrix"], serial["matrix"])
+    assert pooled["rollcalls"] == serial["rollcalls"]
+    assert [m["column"] for m in pooled["rollcalls"]] == [0, 1, 2, 3]
+
+def test_latest_rollcall_columns_keeps_each_chamber(id_map):
+    parsed = parse(id_map)
+    columns = rollcall.latest_rollcall_columns(parsed["rollcalls"])
+    by_file = {m["file"]: m["column"] for m in parsed["rollcalls"]}
+    assert columns == {
+        ("house", "hr1"): by_file["house-2023-042.xml"],  # Passage, after the motion to recommit
+        ("house", "hr2"): by_file["house-2023-043.xml"],
+        ("senate", "hr1"): by_file["senate-2023-100.xml"]
+    }
+
+def test_member_votes_cover_both_chambers(id_map):
+    parsed = parse(id_map)
+    parsed["member_rows"] = {member_id: i for i, member_id in enumerate(parsed["member_ids"])}
+    parsed["bill_columns"] = {118: rollcall.latest_rollcall_columns(parsed["rollcalls"])}
+
+    assert resist.rollcall_member_votes(parsed, "R000600", 118)["votes"] == {"hr1": "yes", "hr2": "yes"}
+    assert resist.rollcall_member_votes(parsed, "D000622", 118)["votes"] == {"hr1": "no"}
+    assert resist.rollcall_member_votes(parsed, "R000605", 118)["votes"] == {"hr1": "yes"}
+    assert resist.rollcall_member_votes(parsed, "D000623", 118)["votes"] == {"hr1": "other"}
+    assert resist.rollcall_member_votes(parsed, "Z000000", 118)["status"] == "error"
+    assert resist.rollcall_member_votes(parsed, "R000600", 117)["status"] == "error"
@@ -0,0 +1,146 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+import resist
+
+class LimitedHandler(BaseHTTPRequestHandler):
+    """Stub API allowing `limit` requests per `window` seconds, answering 429 with Retry-After beyond that"""
+    protocol_version = "HTTP/1.1"
+    limit = 3
+    window = 1
+    report_remaining = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        now = time.monotonic()
+        with server.lock:
+            server.sent = [t for t in server.sent if now - t < self.window]
+            allowed = len(server.sent) < self.limit
+            if allowed:
+                server.sent.append(now)
+            server.received += 1
+            remaining = self.limit - len(server.sent)
+
+        body = b'{"ok": true}' if allowed else b'{"error": "rate limited"}'
+        self.send_response(200 if allowed else 429)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if self.report_remaining:
+            self.send_header("X-RateLimit-Remaining", str(remaining))
+        if not allowed:
+            self.send_header("Retry-After", str(self.window))
+        self.end_headers()
+        self.wfile.write(body)
+
+@pytest.fixture
+def stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), LimitedHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.sent = []
+    server.received = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server, f"http://127.0.0.1:{server.server_port}/"
+    server.shutdown()
+    server.server_close()
+
+def test_bucket_paces_requests_within_the_stub_limit(stub, monkeypatch):
+    server, url = stub
+    monkeypatch.setattr(LimitedHandler, "report_remaining", False)
+    # One request every 0.4 seconds stays under the stub's 3 per second, so nothing is rejected
+    scheduler = resist.RequestScheduler({"stub": (2.5 * 3600, 1)})
+    started = time.monotonic()
+    statuses = [scheduler.request("stub", url).status_code for _ in range(6)]
+
+    assert statuses == [200] * 6
+    assert time.monotonic() - started >= 1.9
+    assert scheduler.snapshot()["stub"]["throttled"] == 0
+
+def test_retry_after_is_honored(stub, monkeypatch):
+    server, url = stub
+    monkeypatch.setattr(LimitedHandler, "report_remaining", False)
+    # The bucket allows more than the stub does; the 429s have to slow it down
+    scheduler = resist.RequestScheduler({"stub": (100 * 3600, 10)})
+    statuses = [scheduler.request("stub", url, priority=resist.PRIORITY_BATCH).status_code for _ in range(5)]
+
+    assert statuses == [200] * 5
+    stats = scheduler.snapshot()["stub"]
+    assert stats["throttled"] >= 1 and stats["retried"] == stats["throttled"]
+    assert server.received == 5 + stats["throttled"]
+
+def test_remaining_header_limits_burst(stub):
+    server, url = stub
+    scheduler = resist.RequestScheduler({"stub": (100 * 3600, 10)})
+    for _ in range(3):
+        scheduler.request("stub", url)
+
+    # The stub reported no quota left, so the bucket holds further requests back instead of sending them
+    with pytest.raises(resist.RateLimitTimeout):
+        scheduler.acquire("stub", timeout=0.2)
+    assert server.received == 3
+
+def test_interactive_requests_time_out_instead_of_queueing(stub, monkeypatch):
+    server, url = stub
+    monkeypatch.setitem(resist.RATE_LIMIT_WAIT, resist.PRIORITY_INTERACTIVE, 0.2)
+    scheduler = resist.RequestScheduler({"stub": (36, 1)})  # One token per 100 seconds
+    scheduler.request("stub", url)
+
+    started = time.monotonic()
+    with pytest.raises(resist.RateLimitTimeout):
+        scheduler.request("stub", url)
+    assert time.monotonic() - started < 1
+    assert scheduler.snapshot()["stub"]["waiting"] == 0
+
+def test_interactive_requests_go_before_queued_batch_requests():
+    scheduler = resist.RequestScheduler({"stub": (10 * 3600, 1)})
+    scheduler.acquire("stub")  # Spend the burst so the next requests queue
+    order = []
+
+    def take(priority, label):
+        scheduler.acquire("stub", priority)
+        order.append(label)
+
+    batch = [threading.Thread(target=take, args=(resist.PRIORITY_BATCH, f"batch{i}")) for i in range(2)]
+    for thread in batch:
+        thread.start()
+    time.sleep(0.02)
+    interactive = threading.Thread(target=take, args=(resist.PRIORITY_INTERACTIVE, "interactive"))
+    interactive.start()
+    for thread in batch + [interactive]:
+        thread.join()
+
+    assert order[0] == "interactive"
+
+def test_fetch_cache_turns_rate_limit_timeouts_into_errors():
+    cache = resist.FetchCache()
+
+    def loader():
+        raise resist.RateLimitTimeout("No fec rate limit token within 10s")
+
+    result = cache.fetch("fec", ("rate_limited",), loader, empty={"results": []})
+    assert result["status"] == "error" and result["results"] == []
+    assert cache.snapshot()["rate_limited"] == 1
+    # Waiting on the local limiter is not an upstream failure
+    assert cache.breakers["fec"].failures == 0
+
+def test_worker_threads_keep_the_request_priority(monkeypatch):
+    seen = []
+
+    def record(key, congress_number=resist.SAMPLE_CONGRESS):
+        seen.append(resist.request_priority_var.get())
+        return {"status": "success", "votes": {}, "results": []}
+
+    monkeypatch.setattr(resist, "fetch_member_votes", record)
+    monkeypatch.setattr(resist, "fetch_candidate_contributions", record)
+    candidates = [{"bioguide_id": f"M{i}", "candidate_id": f"C{i}"} for i in range(3)]
+    with resist.request_priority(resist.PRIORITY_BATCH):
+        resist.fetch_comparison_data(candidates)
+
+    assert seen == [resist.PRIORITY_BATCH] * 6
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+import resist
+
+@pytest.fixture
+def index():
+    rng = np.random.default_rng(7)
+    count = 200
+    scores = {
+        "overall": rng.uniform(0, 100, count).round(1),
+        "category_scores": rng.uniform(0, 100, (count, len(resist.POLICY_AREA_KEYS))).round(1),
+    }
+    return resist.ScoreIndex([f"M{i:03d}" for i in range(count)], scores)
+
+@pytest.mark.parametrize("low, high", [(0, 100), (25, 75), (50, 50), (80, 20), (99.9, 100)])
+def test_range_matches_a_scan(index, low, high):
+    for area, values in index.columns.items():
+        expected = {member_id for member_id, value in zip(index.member_ids, values) if low <= value <= high}
+        assert index.range(area, low, high) == expected
+
+def test_range_includes_both_bounds(index):
+    value = float(index.columns["overall"][0])
+    assert "M000" in index.range("overall", value, value)
+
+def test_top_k_orders_by_score(index):
+    values = index.columns["economy"]
+    top = index.top_k("economy", 5)
+    assert [score for _, score in top] == sorted(values, reverse=True)[:5]
+    bottom = index.top_k("economy", 5, most_aligned=False)
+    assert [score for _, score in bottom] == sorted(values)[:5]
+    assert index.top_k("economy", 0) == []
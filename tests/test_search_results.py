@@ -0,0 +1,19 @@
+import resist
+
+def test_pending_rows_show_scoring():
+    row = resist.search_result_row({"name": "Jane Doe", "bioguide_id": "R000600", "candidate_id": "H0TX01123"})
+    assert row["Conservative Alignment"] == "Scoring..." and row["alignment_data"] is None
+
+def test_batches_cover_every_candidate_once(monkeypatch):
+    monkeypatch.setattr(resist, "SEARCH_BATCH_SIZE", 2)
+    candidates = resist.fetch_candidate_data()["results"] + [{"name": "Unknown", "bioguide_id": "X000000"}]
+    dataset = resist.fetch_dataset()
+    batches = list(resist.score_search_candidates(candidates, dataset, resist.get_score_index()))
+
+    assert len(batches) == 3
+    rows = dict(pair for batch in batches for pair in batch)
+    assert sorted(rows) == list(range(len(candidates)))
+    assert rows[len(candidates) - 1] is None
+    for position, candidate in enumerate(candidates[:-1]):
+        expected = resist.calculate_policy_alignment(candidate["bioguide_id"], dataset)["overall_score"]
+        assert rows[position]["Conservative Alignment"] == f"{expected:.1f}%"
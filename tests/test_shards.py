@@ -0,0 +1,63 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+import resist
+
+@pytest.fixture(scope="module")
+def shard_dir(tmp_path_factory):
+    directory = str(tmp_path_factory.mktemp("shards"))
+    assert resist.export_shard(directory)["status"] == "success"
+    return directory
+
+def test_manifest_lists_each_shards_members(shard_dir):
+    with open(os.path.join(shard_dir, resist.SHARD_MANIFEST), encoding="utf-8") as f:
+        manifest = json.load(f)
+    members = set(resist.fetch_all_member_votes())
+    assert set(manifest[str(resist.SAMPLE_CONGRESS)]["members"]) == members
+
+    store = resist.ShardStore(shard_dir)
+    assert store.congresses() == [resist.SAMPLE_CONGRESS]
+    assert store.congresses("R000600") == [resist.SAMPLE_CONGRESS]
+    assert store.congresses("X000000") == []
+
+def test_shard_round_trips_votes_and_contributions(shard_dir):
+    shard = resist.ShardStore(shard_dir).shard(resist.SAMPLE_CONGRESS)
+    assert shard.member_votes("R000600")["votes"] == resist.fetch_member_votes("R000600")["votes"]
+    fetched = resist.fetch_candidate_contributions("H0TX01123")["results"]
+    amounts = [r["contribution_receipt_amount"] for r in shard.contributions("H0TX01123")["results"]]
+    assert amounts == [r["contribution_receipt_amount"] for r in fetched]
+
+def test_concurrent_opens_share_one_bundle(shard_dir):
+    store = resist.ShardStore(shard_dir)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        bundles = list(pool.map(store.shard, [resist.SAMPLE_CONGRESS] * 8))
+    assert all(bundle is bundles[0] for bundle in bundles)
+    assert store.load([resist.SAMPLE_CONGRESS, 117]) == {resist.SAMPLE_CONGRESS: bundles[0]}
+    assert store.snapshot()["loaded"] == [resist.SAMPLE_CONGRESS]
+
+def test_career_matches_the_congress_score(shard_dir, monkeypatch):
+    store = resist.ShardStore(shard_dir)
+    monkeypatch.setattr(resist, "get_shard_store", lambda: store)
+    career = resist.member_career("R000600")
+    alignment = resist.calculate_policy_alignment("R000600", resist.fetch_dataset())
+    assert [entry["congress"] for entry in career["trend"]] == [resist.SAMPLE_CONGRESS]
+    assert career["career_overall"] == pytest.approx(alignment["overall_score"])
+    assert career["total_votes"] == career["trend"][0]["votes"]
+    assert len(career["votes"]) == len(career["bills"]) == len(resist.fetch_dataset())
+    assert resist.member_career("X000000")["status"] == "error"
+
+def test_congress_without_data_is_not_exported(tmp_path):
+    assert resist.export_shard(str(tmp_path), 101)["status"] == "error"
+    assert not os.path.exists(resist.shard_path(str(tmp_path), 101))
+
+def test_chunked_array_indexes_across_chunks():
+    chunked = resist.ChunkedArray([np.arange(3), np.arange(3, 3), np.arange(3, 7)])
+    assert len(chunked) == 7
+    assert [chunked[i] for i in range(7)] == list(range(7))
+    assert chunked[-1] == 6
+    with pytest.raises(IndexError):
+        chunked[7]
@@ -0,0 +1,45 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import resist
+
+def concurrent_calls(flight, key, fn, count=8):
+    """Start count calls for key together, releasing fn once all of them are waiting on it"""
+    release = threading.Event()
+
+    def gated():
+        release.wait(5)
+        return fn()
+
+    with ThreadPoolExecutor(max_workers=count) as pool:
+        futures = [pool.submit(flight.do, key, gated) for _ in range(count)]
+        while flight.snapshot().get(key[0], {}).get("calls", 0) < count:
+            time.sleep(0.001)
+        release.set()
+        return [future.exception() or future.result() for future in futures]
+
+def test_concurrent_calls_share_one_execution():
+    flight = resist.SingleFlight()
+    executions = []
+    results = concurrent_calls(flight, ("fetch", "A"), lambda: executions.append(1) or {"value": 1})
+    assert len(executions) == 1
+    assert all(result is results[0] for result in results)
+    assert flight.snapshot()["fetch"] == {"calls": 8, "executions": 1, "coalesced": 7}
+
+def test_waiters_get_the_leaders_error():
+    def failing():
+        raise RuntimeError("upstream down")
+
+    results = concurrent_calls(resist.SingleFlight(), ("fetch", "B"), failing)
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+def test_later_calls_run_again():
+    flight = resist.SingleFlight()
+    assert flight.do(("fetch", "C"), lambda: 1) == 1
+    assert flight.do(("fetch", "C"), lambda: 2) == 2
+    with pytest.raises(ValueError):
+        flight.do(("fetch", "C"), lambda: int("x"))
+    assert flight.snapshot()["fetch"]["executions"] == 3
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+import resist
+
+def hashes(start, stop):
+    return resist.donor_hashes([f"DONOR {i}|EMPLOYER" for i in range(start, stop)])
+
+def rank_error(sketch, values, qs):
+    """Largest gap between each requested quantile and the true rank of the value returned"""
+    ordered = np.sort(values)
+    ranks = np.searchsorted(ordered, sketch.quantiles(qs), side="right") / len(ordered)
+    return float(np.max(np.abs(ranks - np.asarray(qs))))
+
+@pytest.mark.parametrize("count", [500, 20_000, 200_000])
+def test_hll_count_within_five_percent(count):
+    sketch = resist.HyperLogLog()
+    sketch.add_hashes(hashes(0, count))
+    sketch.add_hashes(hashes(0, count // 2))  # Repeats don't count again
+    assert sketch.count() == pytest.approx(count, rel=0.05)
+
+def test_hll_merge_counts_the_union():
+    left, right, union = resist.HyperLogLog(), resist.HyperLogLog(), resist.HyperLogLog()
+    left.add_hashes(hashes(0, 30_000))
+    right.add_hashes(hashes(20_000, 50_000))
+    union.add_hashes(hashes(0, 50_000))
+    assert left.merge(right).count() == union.count()
+
+def test_kll_quantiles_within_rank_bound():
+    values = np.random.default_rng(1).lognormal(5, 1.5, 200_000)
+    sketch = resist.KLLSketch()
+    for batch in np.array_split(values, 50):
+        sketch.update(batch)
+    qs = [0.01, 0.25, 0.5, 0.75, 0.95, 0.99]
+    assert rank_error(sketch, values, qs) < 0.02
+    assert sketch.n == len(values) and sketch.max == values.max()
+    assert sum(len(items) for items in sketch.levels) < 3 * resist.KLL_K
+
+def test_kll_merge_keeps_the_rank_bound():
+    rng = np.random.default_rng(2)
+    first, second = rng.uniform(0, 100, 80_000), rng.exponential(50, 120_000)
+    left, right = resist.KLLSketch(seed=1), resist.KLLSketch(seed=2)
+    left.update(first)
+    right.update(second)
+    merged = left.merge(right)
+    assert merged.n == 200_000
+    assert rank_error(merged, np.concatenate([first, second]), [0.1, 0.5, 0.9]) < 0.02
+
+def contributions(amounts):
+    return [{"contributor_name": f"Donor {i % 40}", "contributor_employer": ["Oil Co", "Hospital", None][i % 3],
+             "contribution_receipt_amount": amount} for i, amount in enumerate(amounts)]
+
+def test_outlier_flag_marks_unusually_large_contributions():
+    regular = resist.ContributionSketches()
+    regular.ingest(contributions([100.0 + i % 50 for i in range(300)]))
+    assert not regular.summary()[0]["has_outliers"]
+
+    flagged = resist.ContributionSketches()
+    flagged.ingest(contributions([100.0 + i % 50 for i in range(300)] + [50_000.0]))
+    row = flagged.summary()[0]
+    assert row["area"] == "all" and row["has_outliers"] and row["largest"] == 50_000.0
+
+def test_sketches_match_exact_totals_and_merge_like_one_batch():
+    records = contributions(np.random.default_rng(3).uniform(5, 2_000, 900).round(2).tolist())
+    whole = resist.ContributionSketches()
+    whole.ingest(records)
+    assert whole.area_totals() == pytest.approx(resist.donor_area_totals(records))
+    assert whole.summary()[0]["distinct_donors"] == 120  # 40 names x 3 employers
+
+    halves = resist.ContributionSketches()
+    halves.ingest(records[:400])
+    other = resist.ContributionSketches()
+    other.ingest(resist.ContributionColumns.encode(records[400:]))
+    halves.merge(other)
+    assert halves.area_totals() == pytest.approx(whole.area_totals())
+    assert [row["distinct_donors"] for row in halves.summary()] == [row["distinct_donors"] for row in whole.summary()]
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+import resist
+
+@pytest.fixture(scope="module")
+def bundle(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("snapshot") / "congress-118.snap")
+    result = resist.export_snapshot(path)
+    assert result["status"] == "success"
+    return resist.SnapshotBundle(path)
+
+def test_votes_round_trip(bundle):
+    for member_id in bundle.member_rows:
+        assert bundle.member_votes(member_id)["votes"] == resist.fetch_member_votes(member_id)["votes"]
+    assert bundle.member_votes("X000000")["status"] == "error"
+
+def test_contributions_round_trip(bundle):
+    for candidate_id in bundle.candidate_rows:
+        fetched = list(resist.fetch_candidate_contributions(candidate_id)["results"])
+        loaded = bundle.contributions(candidate_id)["results"]
+        for field in ["contributor_name", "contribution_receipt_amount", "contributor_state", "contributor_zip"]:
+            assert [r[field] for r in loaded] == [r[field] for r in fetched]
+        assert [r["contribution_receipt_date"] for r in loaded] == [r["contribution_receipt_date"][:10] for r in fetched]
+        assert bundle.donor_area_totals(candidate_id) == pytest.approx(resist.donor_area_totals(fetched))
+
+def test_scores_round_trip(bundle):
+    loaded, computed = bundle.score_index(), resist.get_score_index()
+    assert bundle.dataset_version == computed.version
+    assert list(loaded.member_ids) == list(computed.member_ids)
+    for area in loaded.columns:
+        assert np.allclose(loaded.columns[area], computed.columns[area])
+        assert loaded.range(area, 40, 80) == computed.range(area, 40, 80)
+    member_id = loaded.member_ids[0]
+    assert loaded.interval(member_id) == pytest.approx(computed.interval(member_id))
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "not-a-bundle.snap"
+    path.write_bytes(b"\0" * 128)
+    with pytest.raises(ValueError):
+        resist.SnapshotBundle(str(path))
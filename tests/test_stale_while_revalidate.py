@@ -0,0 +1,92 @@
+import time
+
+import pytest
+
+import resist
+
+class Loader:
+    """Upstream stand-in returning an incrementing value, or raising while `fail` is set"""
+
+    def __init__(self):
+        self.calls = 0
+        self.fail = False
+
+    def __call__(self):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("upstream down")
+        return {"value": self.calls, "status": "success"}
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+def test_stale_entry_is_served_while_refreshing():
+    cache = resist.FetchCache(ttl=0.05)
+    loader = Loader()
+    key = ("fetch_test", "swr")
+    assert cache.fetch("fec", key, loader)["value"] == 1
+    time.sleep(0.06)
+
+    stale = cache.fetch("fec", key, loader)
+    assert stale["value"] == 1 and stale["stale"]
+    wait_for(lambda: cache.snapshot()["refreshes"] == 1)
+    fresh = cache.fetch("fec", key, loader)
+    assert fresh["value"] == 2 and not fresh["stale"]
+
+def test_failed_refresh_keeps_serving_the_last_value():
+    cache = resist.FetchCache(ttl=0.05)
+    loader = Loader()
+    key = ("fetch_test", "keep")
+    cache.fetch("fec", key, loader)
+    loader.fail = True
+    time.sleep(0.06)
+
+    assert cache.fetch("fec", key, loader)["value"] == 1
+    wait_for(lambda: cache.snapshot()["refresh_failures"] == 1)
+    assert cache.fetch("fec", key, loader)["value"] == 1
+
+def test_miss_reports_unavailable_upstream():
+    cache = resist.FetchCache()
+    loader = Loader()
+    loader.fail = True
+    result = cache.fetch("fec", ("fetch_test", "miss"), loader, empty={"results": []})
+    assert result["status"] == "error" and result["results"] == []
+    assert cache.snapshot()["unavailable"] == 1
+
+def test_breaker_opens_then_probes_with_one_call():
+    breaker = resist.CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    loader = Loader()
+    loader.fail = True
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            breaker.call(loader)
+    assert breaker.state == "open"
+    with pytest.raises(resist.CircuitOpenError):
+        breaker.call(loader)
+    assert loader.calls == 2
+
+    time.sleep(0.06)
+    loader.fail = False
+    assert breaker.call(loader)["status"] == "success"
+    assert breaker.state == "closed"
+
+def test_half_open_breaker_lets_one_trial_through():
+    breaker = resist.CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow() and breaker.state == "half-open"
+    assert not breaker.allow()
+
+def test_failed_probe_reopens_the_breaker():
+    breaker = resist.CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    loader = Loader()
+    loader.fail = True
+    with pytest.raises(RuntimeError):
+        breaker.call(loader)
+    time.sleep(0.06)
+    with pytest.raises(RuntimeError):
+        breaker.call(loader)
+    assert breaker.state == "open"
@@ -0,0 +1,59 @@
+import pytest
+
+import resist
+
+def contribution(date, amount, employer=None):
+    return {"contributor_name": "Donor", "contributor_employer": employer,
+            "contribution_receipt_date": date, "contribution_receipt_amount": amount}
+
+@pytest.fixture
+def votes():
+    dataset = resist.fetch_dataset()
+    member_ids, matrix = resist.build_vote_matrix(resist.fetch_all_member_votes(), dataset)
+    return dataset, member_ids, matrix
+
+def test_timestamped_receipts_count_on_their_day(votes):
+    index = resist.TimeIndex(*votes, {"C1": [
+        contribution("2023-05-14", 10.0),
+        contribution("2023-05-15T00:00:00", 20.0),
+        contribution("2023-05-15T18:30:00", 30.0),
+        contribution("2023-05-16", 40.0),
+    ]})
+    window = index.contribution_totals("C1", "2023-05-15", "2023-05-15")
+    assert window["count"] == 2 and window["total"] == 50.0
+
+def test_area_totals_match_donor_area_totals(votes):
+    records = [contribution("2023-01-02", 100.0, "Oil Co"), contribution("2023-02-03", 60.0, "Hospital"),
+               contribution(None, 5.0)]
+    index = resist.TimeIndex(*votes, {"C1": records, "C2": resist.ContributionColumns.encode(records)})
+    expected = resist.donor_area_totals(records)
+    for candidate_id in ("C1", "C2"):
+        totals = index.contribution_totals(candidate_id)
+        assert totals["count"] == 3
+        assert totals["by_area"] == pytest.approx(expected)
+
+@pytest.fixture
+def fresh_caches():
+    resist.get_fetch_cache.clear()
+    resist.get_time_index_cache.clear()
+    yield
+    resist.get_fetch_cache.clear()
+    resist.get_time_index_cache.clear()
+
+def test_failed_fetch_is_rebuilt_on_next_call(monkeypatch, fresh_caches):
+    load = resist.load_candidate_contributions
+
+    def failing(candidate_id, congress_number=resist.SAMPLE_CONGRESS):
+        if candidate_id == "H0TX01123":
+            raise RuntimeError("FEC unavailable")
+        return load(candidate_id, congress_number)
+
+    monkeypatch.setattr(resist, "load_candidate_contributions", failing)
+    partial = resist.get_time_index()
+    assert partial.missing == ["H0TX01123"]
+    assert partial.contribution_totals("H0TX01123")["status"] == "error"
+    assert resist.get_time_index() is partial
+
+    monkeypatch.setattr(resist, "load_candidate_contributions", load)
+    rebuilt = resist.get_time_index()
+    assert rebuilt.missing == [] and rebuilt.contribution_totals("H0TX01123")["count"] > 0
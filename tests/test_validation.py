@@ -0,0 +1,72 @@
+import time
+
+import resist
+
+def record(sub_id, **fields):
+    return dict({"contributor_name": "Donor", "contribution_receipt_amount": 100.0,
+                 "contribution_receipt_date": "2023-05-15", "memo_code": None, "committee_id": "C1",
+                 "transaction_id": None, "file_number": 1, "sub_id": sub_id}, **fields)
+
+def test_schema_checks_and_rejects_summary():
+    records = [
+        record("1"),
+        record("2", contribution_receipt_amount="abc"),
+        record("3", contribution_receipt_date="2023-13-40"),
+        record("4", contributor_name="  "),
+        record("5", contribution_receipt_amount=-25.0),
+        record("6", memo_code="X"),
+        record("1"),
+    ]
+    kept, rejects = resist.validate_contributions(records)
+    assert [r["sub_id"] for r in kept] == ["1"]
+    assert {reason: summary["count"] for reason, summary in rejects.items()} == {
+        "invalid_amount": 1, "invalid_date": 1, "missing_contributor": 1, "refund": 1, "memo": 1, "duplicate": 1
+    }
+    assert rejects["refund"]["amount"] == -25.0
+
+def test_amendment_supersedes_earlier_filing():
+    kept, rejects = resist.validate_contributions([
+        record("1", transaction_id="T1", file_number=1, contribution_receipt_amount=100.0),
+        record("2", transaction_id="T1", file_number=2, contribution_receipt_amount=120.0),
+    ])
+    assert [r["sub_id"] for r in kept] == ["2"]
+    assert rejects == {"superseded": {"count": 1, "amount": 100.0}}
+
+def test_amendment_to_memo_still_supersedes_original():
+    kept, rejects = resist.validate_contributions([
+        record("1", transaction_id="T1", file_number=1),
+        record("2", transaction_id="T1", file_number=2, memo_code="X"),
+    ])
+    assert kept == []
+    assert set(rejects) == {"memo", "superseded"}
+
+def test_records_missing_fields_are_validated():
+    kept, rejects = resist.validate_contributions([
+        {"contributor_name": "A", "contribution_receipt_amount": 5, "contribution_receipt_date": "2023-01-01"},
+        {"contributor_name": "B", "contribution_receipt_amount": 5},
+    ])
+    assert [r["contributor_name"] for r in kept] == ["A"]
+    assert rejects["invalid_date"]["count"] == 1
+
+def test_columns_validate_like_records():
+    records = [record(str(i), transaction_id=f"T{i % 3}", file_number=1 + i % 2, memo_code="X" if i == 4 else None)
+               for i in range(8)] + [record("1")]
+    kept, rejects = resist.validate_contributions(records)
+    columns, column_rejects = resist.validate_contributions(resist.ContributionColumns.encode(records))
+    assert column_rejects == rejects
+    assert [r["sub_id"] for r in columns] == [r["sub_id"] for r in kept]
+    assert not set(columns.fields) & set(resist.CONTRIBUTION_FILING_FIELDS)
+
+def test_validation_throughput_on_columns():
+    rows = 200_000
+    columns = resist.ContributionColumns.encode([
+        record(str(i), contributor_name=f"Donor {i % 5000}", committee_id=f"C{i % 400}", transaction_id=f"T{i}",
+               file_number=1 + i % 400, memo_code="X" if i % 50 == 0 else None)
+        for i in range(rows)
+    ])
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        resist.validate_contributions(columns)
+        best = min(best, time.perf_counter() - start)
+    assert rows / best > 1_000_000
@@ -0,0 +1,39 @@
+import pytest
+
+import resist
+
+TARGETS = [("R000600", "H0TX01123"), ("D000622", "H0CA12456"), ("R000605", "H0ME02789"), ("D000623", "H0AZ01012")]
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    resist.get_fetch_cache.clear()
+    resist.get_analysis_cache.clear()
+    yield
+    resist.get_fetch_cache.clear()
+    resist.get_analysis_cache.clear()
+
+def warm(targets, **kwargs):
+    warmer = resist.CacheWarmer(targets, **kwargs)
+    warmer.run()
+    return warmer.status()
+
+def test_ready_after_warming_targets():
+    status = warm(TARGETS)
+    assert status["ready"] and status["warmed"] == 4 and status["failed"] == 0
+
+def test_not_ready_when_every_target_fails(monkeypatch):
+    def unavailable(candidate_id, congress_number=resist.SAMPLE_CONGRESS):
+        return {"results": [], "status": "error", "message": "FEC unavailable"}
+
+    monkeypatch.setattr(resist, "load_candidate_contributions", unavailable)
+    status = warm(TARGETS)
+    assert status["failed"] == 4 and status["warmed"] == 0
+    assert not status["ready"]
+
+def test_failures_above_threshold_withhold_readiness():
+    targets = TARGETS[:1] + [("X000000", "X0XX00000")] * 3
+    assert not warm(targets, max_failure_ratio=0.5)["ready"]
+    assert warm(targets, max_failure_ratio=0.75)["ready"]
+
+def test_ready_without_targets():
+    assert warm([])["ready"]